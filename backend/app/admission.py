@@ -0,0 +1,114 @@
+"""
+Global admission control: a cap on requests served at once.
+
+Up to ADMISSION_MAX_CONCURRENCY requests run; up to ADMISSION_MAX_QUEUE
+more wait for a slot, for at most ADMISSION_QUEUE_TIMEOUT seconds. Anything
+beyond that is answered 503 with Retry-After straight away, before routing,
+so an overload sheds work instead of piling up memory and latency for
+everyone. Long-lived streams are exempt: they hold a connection, not a
+worker's CPU.
+"""
+
+import asyncio
+import os
+
+from dotenv import load_dotenv
+
+from app import metrics
+from app.serialization import ORJSONResponse
+
+load_dotenv()
+
+# 0 turns admission control off
+ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "256"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "512"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "5"))
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+
+# Path suffixes that bypass admission (SSE streams, health and scrapes)
+EXEMPT_PATHS = ("/interns/events", "/metrics", "/get_init")
+
+admission_active = metrics.registry.gauge(
+    "admission_active", "Requests holding an admission slot"
+)
+admission_queued = metrics.registry.gauge(
+    "admission_queued", "Requests waiting for an admission slot"
+)
+admission_rejected = metrics.registry.counter(
+    "admission_rejected_total", "Requests shed by admission control", ("reason",)
+)
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware enforcing the concurrency and queue limits"""
+
+    def __init__(
+        self,
+        app,
+        max_concurrency: int = ADMISSION_MAX_CONCURRENCY,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT,
+    ):
+        self.app = app
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters = []
+
+    async def _acquire(self) -> str:
+        """Take a slot; returns an empty string, or why the request is shed"""
+        if self.active < self.max_concurrency and not self._waiters:
+            self.active += 1
+            return ""
+        if len(self._waiters) >= self.max_queue:
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        admission_queued.inc()
+        try:
+            # _release hands its slot straight to the waiter
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+            return ""
+        except asyncio.TimeoutError:
+            # The slot may have arrived together with the timeout
+            return "" if waiter.done() else "timeout"
+        except asyncio.CancelledError:
+            # The client went away while queued; pass on a slot it was given
+            if waiter.done():
+                self._release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            admission_queued.dec()
+
+    def _release(self):
+        while self._waiters:
+            waiter = self._waiters.pop(0)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].endswith(EXEMPT_PATHS):
+            return await self.app(scope, receive, send)
+
+        reason = await self._acquire()
+        if reason:
+            admission_rejected.inc(reason)
+            response = ORJSONResponse(
+                {"detail": "Server busy, please retry"},
+                status_code=503,
+                headers={"Retry-After": str(ADMISSION_RETRY_AFTER)},
+            )
+            return await response(scope, receive, send)
+
+        admission_active.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission_active.dec()
+            self._release()
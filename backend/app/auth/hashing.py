@@ -1,6 +1,35 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from dotenv import load_dotenv
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app import metrics
+
+load_dotenv()
+
+# bcrypt cost factor. Raising it makes passlib flag existing hashes as
+# needing an update, and they are rehashed on the user's next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# bcrypt runs in a dedicated pool so a login burst can't starve the event
+# loop. "thread" is enough because bcrypt releases the GIL; "process" keeps
+# hashing fully out of the API process.
+HASH_POOL_KIND = os.getenv("HASH_POOL_KIND", "thread")
+HASH_POOL_SIZE = int(os.getenv("HASH_POOL_SIZE", str(os.cpu_count() or 1)))
+# Jobs admitted at once (running + queued); anything beyond is rejected
+HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", str(HASH_POOL_SIZE * 4)))
+# Seconds sent in Retry-After when the pool is saturated
+HASH_RETRY_AFTER = int(os.getenv("HASH_RETRY_AFTER", "1"))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+)
+
+
+class HashingPoolBusy(Exception):
+    """Raised when the bcrypt pool has no admission slots left"""
 
 
 def hash_password(password: str) -> str:
@@ -9,3 +38,83 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    """Return (valid, new_hash); new_hash is set when the stored hash is outdated"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+_executor = None
+_admission = asyncio.Semaphore(HASH_MAX_PENDING)
+
+
+def configure_hash_pool(
+    pool_size: int = None, kind: str = None, max_pending: int = None
+):
+    """Replace the bcrypt pool, e.g. from benchmarks or tests"""
+    global HASH_POOL_SIZE, HASH_POOL_KIND, HASH_MAX_PENDING, _admission
+    shutdown_hash_pool()
+    HASH_POOL_SIZE = pool_size or HASH_POOL_SIZE
+    HASH_POOL_KIND = kind or HASH_POOL_KIND
+    HASH_MAX_PENDING = max_pending if max_pending is not None else HASH_POOL_SIZE * 4
+    _admission = asyncio.Semaphore(HASH_MAX_PENDING)
+
+
+def shutdown_hash_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        if HASH_POOL_KIND == "process":
+            _executor = ProcessPoolExecutor(max_workers=HASH_POOL_SIZE)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=HASH_POOL_SIZE, thread_name_prefix="bcrypt"
+            )
+    return _executor
+
+
+bcrypt_duration = metrics.registry.histogram(
+    "bcrypt_duration_seconds",
+    "bcrypt hash/verify time including pool queueing",
+    ("operation",),
+)
+bcrypt_pending = metrics.registry.gauge(
+    "bcrypt_pending", "bcrypt jobs admitted to the pool (running + queued)"
+)
+bcrypt_rejected = metrics.registry.counter(
+    "bcrypt_rejected_total",
+    "bcrypt jobs refused because the pool was saturated",
+    ("operation",),
+)
+
+
+async def _run_in_pool(operation: str, func, *args):
+    if _admission.locked():
+        bcrypt_rejected.inc(operation)
+        raise HashingPoolBusy()
+    async with _admission:
+        bcrypt_pending.inc()
+        try:
+            with bcrypt_duration.time(operation):
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(_get_executor(), func, *args)
+        finally:
+            bcrypt_pending.dec()
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_pool("hash", hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    """Verify in the bcrypt pool; returns (valid, new_hash) like verify_and_update"""
+    return await _run_in_pool(
+        "verify", verify_and_update_password, plain_password, hashed_password
+    )
@@ -1,16 +1,102 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from fastapi import Depends, HTTPException
+import hashlib
 import jwt
 import os
+import time
 from dotenv import load_dotenv
 from fastapi.security import OAuth2PasswordBearer
 
+from app import metrics
+from app.database.cache import session_cache
+from app.database.storage import storage
+
 load_dotenv()
 
 SECRET_KEY = os.getenv("JWT_SECRET")
 ALGORITHM = "HS256"
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/1.0/login")
 
+# Verified tokens kept in memory so polling endpoints skip decode + HMAC
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+
+class TokenCache:
+    """Bounded LRU of verified JWT claims, keyed by the token's SHA-256 digest.
+
+    Entries expire with the token's own `exp`, so an expired token is never
+    served from the cache. Revocation is not decided here: get_current_user
+    checks the claims against the user's session counter (see SessionCache).
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        key = self.digest(token)
+        entry = self._entries.get(key)
+        if entry is None or entry["exp"] <= time.time():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, token: str, payload: dict):
+        if self.max_size <= 0 or "exp" not in payload:
+            return
+        key = self.digest(token)
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, token: str):
+        self._entries.pop(self.digest(token), None)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+
+jwt_decode_duration = metrics.registry.histogram(
+    "jwt_decode_duration_seconds",
+    "JWT signature check and decode on token cache misses",
+)
+token_cache_lookups = metrics.registry.gauge(
+    "jwt_token_cache_lookups", "Token cache lookups since start", ("result",)
+)
+token_cache_size = metrics.registry.gauge("jwt_token_cache_size", "Tokens in the cache")
+
+
+@metrics.registry.on_collect
+def _collect_token_cache_stats():
+    stats = token_cache.stats()
+    token_cache_lookups.set(stats["hits"], "hit")
+    token_cache_lookups.set(stats["misses"], "miss")
+    token_cache_size.set(stats["size"])
+
 
 def create_access_token(data: dict, expires_delta: timedelta = timedelta(minutes=30)):
     to_encode = data.copy()
@@ -19,11 +105,58 @@ def create_access_token(data: dict, expires_delta: timedelta = timedelta(minutes
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+def sessions_key(email: str) -> str:
+    """Version key counting a user's logouts; tokens carry the value they
+    were issued under (`ver`) and are refused once it has moved on"""
+    return f"sessions:{email}"
+
+
+async def session_version(email: str) -> int:
+    """The user's session counter as stored (uncached)"""
+    return await storage.versions.get(sessions_key(email))
+
+
+async def create_session_token(email: str) -> str:
+    """Access token bound to the user's current session counter"""
+    version = await session_version(email)
+    await session_cache.set(email, version)
+    return create_access_token({"sub": email, "ver": version})
+
+
+def decode_access_token(token: str) -> dict:
+    """Verified claims for a token, from the cache when possible"""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload["sub"]
+        with jwt_decode_duration.time():
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
+
+    token_cache.put(token, payload)
+    return payload
+
+
+async def revoke_sessions(token: str):
+    """Logout: refuse this token and every other one issued to its user so
+    far. The counter is in storage, so every worker and replica agrees once
+    its session cache entry is refreshed."""
+    try:
+        payload = decode_access_token(token)
+    except HTTPException:
+        return
+    email = payload["sub"]
+    await storage.versions.bump([sessions_key(email)])
+    await session_cache.set(email, await session_version(email))
+    token_cache.invalidate(token)
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    payload = decode_access_token(token)
+    if payload.get("ver", 0) < await session_cache.get(payload["sub"], session_version):
+        raise HTTPException(status_code=401, detail="Token revoked")
+    return payload["sub"]
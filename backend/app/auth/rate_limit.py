@@ -0,0 +1,163 @@
+"""
+Token-bucket rate limiting for the credential endpoints.
+
+/api/login and /api/register each cost a bcrypt hash or verify, so they are
+the cheapest way to exhaust the API. `limit_credential_attempts` runs as a
+dependency before the handler: every attempt takes a token from the
+client IP's bucket and from the submitted email's bucket, and an empty
+bucket is answered with 429 before any bcrypt work is queued.
+"""
+
+import hmac
+import math
+import os
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, Request
+
+from app import metrics
+
+load_dotenv()
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# Attempts allowed in a burst, and refilled per minute, per client IP
+RATE_LIMIT_IP_BURST = int(os.getenv("RATE_LIMIT_IP_BURST", "20"))
+RATE_LIMIT_IP_PER_MINUTE = float(os.getenv("RATE_LIMIT_IP_PER_MINUTE", "20"))
+# The same per email, to slow down guessing one account from many IPs
+RATE_LIMIT_EMAIL_BURST = int(os.getenv("RATE_LIMIT_EMAIL_BURST", "5"))
+RATE_LIMIT_EMAIL_PER_MINUTE = float(os.getenv("RATE_LIMIT_EMAIL_PER_MINUTE", "5"))
+# Proxies in front of the API that append to X-Forwarded-For (0 = use the
+# socket peer, which is right only when clients connect directly)
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+# Shared with the Next.js server, which sends it as X-Proxy-Secret. When set,
+# TRUSTED_PROXY_HOPS only applies to requests carrying it; the rest reached
+# the API some other way (e.g. the ALB's public /fastapi path) and count
+# DIRECT_PROXY_HOPS instead, so a forged chain cannot pick the bucket
+PROXY_SECRET = os.getenv("PROXY_SECRET")
+DIRECT_PROXY_HOPS = int(os.getenv("DIRECT_PROXY_HOPS", "0"))
+RATE_LIMIT_STORE_SIZE = int(os.getenv("RATE_LIMIT_STORE_SIZE", "100000"))
+
+rate_limited = metrics.registry.counter(
+    "rate_limited_total", "Credential attempts refused by the rate limiter", ("scope",)
+)
+
+
+class RateLimitStore:
+    """Bucket state behind RateLimiter.
+
+    The default keeps buckets in process, so each worker enforces the limits
+    on its own. A shared store (Redis, ...) makes them apply across workers
+    and replicas; it must do the refill-and-take of `take` atomically, e.g.
+    in a Lua script.
+    """
+
+    async def take(self, key: str, burst: int, per_second: float, now: float):
+        """Take one token; returns 0 when allowed, else seconds until one is available"""
+        raise NotImplementedError
+
+
+class LocalRateLimitStore(RateLimitStore):
+    """Buckets in a bounded in-process LRU; the least recently used are
+    forgotten first, which only ever lets an idle client start full again"""
+
+    def __init__(self, max_size: int = RATE_LIMIT_STORE_SIZE):
+        self.max_size = max_size
+        self._buckets = OrderedDict()
+
+    async def take(self, key: str, burst: int, per_second: float, now: float):
+        tokens, updated = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * per_second)
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            allowed = True
+        else:
+            self._buckets[key] = (tokens, now)
+            allowed = False
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_size:
+            self._buckets.popitem(last=False)
+        return 0 if allowed else (1 - tokens) / per_second
+
+    def clear(self):
+        self._buckets.clear()
+
+
+class RateLimiter:
+    """One token bucket per key, e.g. per IP: `burst` attempts at once,
+    refilled at `per_minute`"""
+
+    def __init__(
+        self, scope: str, burst: int, per_minute: float, store: RateLimitStore
+    ):
+        self.scope = scope
+        self.burst = burst
+        self.per_second = per_minute / 60
+        self.store = store
+
+    async def check(self, key: str):
+        """Take a token for `key` or raise 429 with Retry-After"""
+        retry_after = await self.store.take(
+            f"{self.scope}:{key}", self.burst, self.per_second, time.monotonic()
+        )
+        if retry_after:
+            rate_limited.inc(self.scope)
+            raise HTTPException(
+                status_code=429,
+                detail="Too many attempts, please retry later",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+
+store = LocalRateLimitStore()
+ip_limiter = RateLimiter("ip", RATE_LIMIT_IP_BURST, RATE_LIMIT_IP_PER_MINUTE, store)
+email_limiter = RateLimiter(
+    "email", RATE_LIMIT_EMAIL_BURST, RATE_LIMIT_EMAIL_PER_MINUTE, store
+)
+
+
+def use_store(new_store: RateLimitStore):
+    """Point both limiters at another store, e.g. a shared one"""
+    global store
+    store = ip_limiter.store = email_limiter.store = new_store
+
+
+def proxy_hops(request: Request) -> int:
+    """Trusted X-Forwarded-For entries on this request's path"""
+    if not PROXY_SECRET:
+        return TRUSTED_PROXY_HOPS
+    secret = request.headers.get("x-proxy-secret", "")
+    if hmac.compare_digest(secret.encode(), PROXY_SECRET.encode()):
+        return TRUSTED_PROXY_HOPS
+    return DIRECT_PROXY_HOPS
+
+
+def client_ip(request: Request) -> str:
+    """The client address, taken from X-Forwarded-For behind trusted proxies"""
+    hops = proxy_hops(request)
+    if hops:
+        forwarded = [
+            hop.strip()
+            for header in request.headers.getlist("x-forwarded-for")
+            for hop in header.split(",")
+        ]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.client.host if request.client else "unknown"
+
+
+async def limit_credential_attempts(request: Request):
+    """Dependency for /login and /register"""
+    if not RATE_LIMIT_ENABLED:
+        return
+    await ip_limiter.check(client_ip(request))
+
+    # The body is parsed (and cached on the request) by FastAPI already;
+    # invalid bodies are left to the endpoint's own validation
+    try:
+        email = (await request.json()).get("email")
+    except (ValueError, AttributeError):
+        email = None
+    if isinstance(email, str):
+        await email_limiter.check(email.strip().lower())
@@ -1,85 +1,121 @@
-from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends, Request
-from app.models.user import UserRegister, UserLogin
+from datetime import date, datetime
+from typing import List, Optional, Union
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from app.models.user import (
+    BulkApprovalUpdate,
+    DailyTimeRecordOut,
+    InternRecordOut,
+    InternWithRecords,
+    Message,
+    UserLogin,
+    UserOut,
+    UserRegister,
+    stored_fields,
+)
+from app.database.base import RecordExists, rollup_keys
+from app.database.batching import CLOCK_IN_BATCHING, clock_in_batcher
+from app.database.storage import storage
+from app.database.cache import profile_cache, read_cache
+from app.events import event_bus
+from app.http_cache import INTERNS, bump, check_etag, records_key
+from app.auth.hashing import (
+    HASH_RETRY_AFTER,
+    HashingPoolBusy,
+    hash_password_async,
+    verify_password_async,
+)
+from app.auth.jwt_handler import create_session_token, revoke_sessions
+from app.auth.rate_limit import limit_credential_attempts
+from app.auth.jwt_handler import get_current_user, oauth2_scheme
 
-# DynamoDB imports (commented out)
-# from app.database.dynamodb import table_main, table_record
-# from boto3.dynamodb.conditions import Key, Attr
-# from decimal import Decimal
+router = APIRouter()
 
-# MongoDB imports
-from app.database.mongodb import users_collection, records_collection
-from app.auth.hashing import hash_password, verify_password
-from app.auth.jwt_handler import create_access_token
-from app.auth.jwt_handler import get_current_user
 
-router = APIRouter()
+def hashing_busy() -> HTTPException:
+    """503 for when the bcrypt pool has no admission slots left"""
+    return HTTPException(
+        status_code=503,
+        detail="Server busy, please retry",
+        headers={"Retry-After": str(HASH_RETRY_AFTER)},
+    )
+
+
+# Upper bound for the `limit` query parameter of paginated endpoints
+MAX_PAGE_SIZE = 1000
+
+# What each view reads, taken from its response model, so storage returns
+# only those fields (and never the password hash)
+RECORD_FIELDS = stored_fields(DailyTimeRecordOut)
+INTERN_FIELDS = stored_fields(UserOut)
+INTERN_RECORD_FIELDS = stored_fields(InternRecordOut)
+
+
+def paginate(items: list, limit: Optional[int], key: str, response: Response):
+    """Trim a `limit + 1` result to one page and expose the keyset cursor.
 
+    The cursor for the next page goes in the `X-Next-Cursor` header so the
+    response body stays a plain list.
+    """
+    if limit and len(items) > limit:
+        items = items[:limit]
+        response.headers["X-Next-Cursor"] = items[-1][key]
+    return items
 
-@router.post("/register")
-def register_user(user: UserRegister):
-    # DynamoDB code (commented out)
-    # response = table_main.get_item(Key={"intern_id": user.email})
-    # if "Item" in response:
-    #     raise HTTPException(status_code=400, detail="User already exists")
-    #
-    # table_main.put_item(
-    #     Item={
-    #         "intern_id": user.email,
-    #         "name": user.name,
-    #         "surname": user.surname,
-    #         "role": user.role,
-    #         "password": hash_password(user.password),
-    #         "approval": user.approval,
-    #     }
-    # )
-    # return {"message": "User registered successfully"}
-
-    # MongoDB code
-    existing_user = users_collection.find_one({"email": user.email})
-    if existing_user:
+
+@router.post("/register", dependencies=[Depends(limit_credential_attempts)])
+async def register_user(user: UserRegister):
+    if await storage.users.exists(user.email):
         raise HTTPException(status_code=400, detail="User already exists")
 
+    try:
+        password_hash = await hash_password_async(user.password)
+    except HashingPoolBusy:
+        raise hashing_busy()
+
     user_data = {
         "email": user.email,
         "name": user.name,
         "surname": user.surname,
         "role": user.role,
-        "password": hash_password(user.password),
+        "password": password_hash,
         "approval": user.approval,
         "created_at": datetime.utcnow(),
     }
 
-    result = users_collection.insert_one(user_data)
+    inserted_id = await storage.users.insert(user_data)
+    await profile_cache.invalidate(user.email)
+    read_cache.invalidate()
+    await bump(INTERNS)
     return {
         "message": "User registered successfully",
-        "user_id": str(result.inserted_id),
+        "user_id": str(inserted_id),
     }
 
 
-@router.post("/login")
-def login_user(user: UserLogin):
-    # DynamoDB code (commented out)
-    # response = table_main.get_item(Key={"intern_id": user.email})
-    # if "Item" not in response:
-    #     raise HTTPException(status_code=400, detail="Invalid email or password")
-    #
-    # stored_user = response["Item"]
-    # if not verify_password(user.password, stored_user["password"]):
-    #     raise HTTPException(status_code=400, detail="Invalid email or password")
-    #
-    # token = create_access_token({"sub": user.email})
-    # return {"access_token": token, "token_type": "bearer", "role": stored_user["role"], "approval": stored_user["approval"]}
-
-    # MongoDB code
-    stored_user = users_collection.find_one({"email": user.email})
+@router.post("/login", dependencies=[Depends(limit_credential_attempts)])
+async def login_user(user: UserLogin):
+    # Not from the profile cache: login needs the hash, which is never
+    # cached, and the current approval, which another replica may have
+    # just changed. The bcrypt verify dwarfs this read anyway.
+    stored_user = await storage.users.find_by_email(user.email)
     if not stored_user:
         raise HTTPException(status_code=400, detail="Invalid email or password")
 
-    if not verify_password(user.password, stored_user["password"]):
+    try:
+        valid, new_hash = await verify_password_async(
+            user.password, stored_user["password"]
+        )
+    except HashingPoolBusy:
+        raise hashing_busy()
+
+    if not valid:
         raise HTTPException(status_code=400, detail="Invalid email or password")
 
-    token = create_access_token({"sub": user.email})
+    # Transparently upgrade hashes made with an older bcrypt cost factor
+    if new_hash:
+        await storage.users.set_password(user.email, new_hash)
+
+    token = await create_session_token(user.email)
     return {
         "access_token": token,
         "token_type": "bearer",
@@ -88,332 +124,263 @@ def login_user(user: UserLogin):
     }
 
 
-@router.get("/user")
-def get_user_details(user: dict = Depends(get_current_user)):
-    # DynamoDB code (commented out)
-    # email = user
-    # response = table_main.get_item(Key={"intern_id": email})
-    # user_data = response.get("Item")
-    #
-    # if not user_data:
-    #     raise HTTPException(status_code=404, detail="User not found")
-    #
-    # user_data.pop("password", None)
-    # return user_data
-
-    # MongoDB code
+@router.post("/logout")
+async def logout_user(token: str = Depends(oauth2_scheme)):
+    await revoke_sessions(token)
+    return {"message": "Logged out successfully"}
+
+
+@router.get("/user", response_model=UserOut, response_model_exclude_unset=True)
+async def get_user_details(user: dict = Depends(get_current_user)):
     email = user
-    user_data = users_collection.find_one({"email": email})
+    user_data = await profile_cache.get(email, storage.users.find_by_email)
 
     if not user_data:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # Convert ObjectId to string and remove password
-    user_data["_id"] = str(user_data["_id"])
-    user_data.pop("password", None)
-
+    # UserOut stringifies the ObjectId and leaves out the password hash
     return user_data
 
 
 @router.post("/dtr/clock_in")
-def clock_in(intern_id: dict = Depends(get_current_user)):
-    # DynamoDB code (commented out)
-    # date = datetime.now().strftime("%Y-%m-%d")
-    #
-    # existing_record = table_record.get_item(
-    #     Key={
-    #         "intern_id": intern_id,
-    #         "date": date
-    #     }
-    # )
-    #
-    # if "Item" in existing_record and "clock_in" in existing_record["Item"]:
-    #     raise HTTPException(status_code=400, detail="You have already clocked in today.")
-    #
-    # table_record.put_item(
-    #     Item={
-    #         "intern_id": intern_id,
-    #         "date": date,
-    #         "clock_in": datetime.utcnow().isoformat(),
-    #         "status": "Active"
-    #     }
-    # )
-    # return {"message": "Clocked in successfully"}
-
-    # MongoDB code
+async def clock_in(intern_id: dict = Depends(get_current_user)):
     date = datetime.now().strftime("%Y-%m-%d")
 
-    existing_record = records_collection.find_one(
-        {"intern_id": intern_id, "date": date}
-    )
-
-    if existing_record and existing_record.get("clock_in"):
+    # start_day is atomic, so a concurrent or repeated clock-in gets
+    # RecordExists instead of racing a find + insert. In batched mode the
+    # write joins the next bulk write and its own result comes back here;
+    # the batch bumps the ETag versions for all its clock-ins at once.
+    try:
+        if CLOCK_IN_BATCHING:
+            record = await clock_in_batcher.submit((intern_id, date, datetime.utcnow()))
+        else:
+            record = await storage.records.start_day(intern_id, date, datetime.utcnow())
+            await bump(INTERNS, records_key(intern_id))
+    except RecordExists:
         raise HTTPException(
             status_code=400, detail="You have already clocked in today."
         )
 
-    record_data = {
-        "intern_id": intern_id,
-        "date": date,
-        "clock_in": datetime.utcnow(),
-        "status": "Active",
-        "created_at": datetime.utcnow(),
-    }
+    read_cache.invalidate()
+    event_bus.publish(
+        "clock_in",
+        {"intern_id": intern_id, "date": date, "clock_in": record["clock_in"]},
+    )
+    return {"message": "Clocked in successfully", "record_id": str(record["_id"])}
+
 
-    result = records_collection.insert_one(record_data)
-    return {"message": "Clocked in successfully", "record_id": str(result.inserted_id)}
-
-
-@router.post("/dtr/check_clock_in&out")
-def check_clock_in(intern_id: dict = Depends(get_current_user)):
-    # DynamoDB code (commented out)
-    # date = datetime.now().strftime("%Y-%m-%d")
-    #
-    # existing_record = table_record.get_item(
-    #     Key={
-    #         "intern_id": intern_id,
-    #         "date": date
-    #     }
-    # )
-    # if "Item" in existing_record:
-    #     return HTTPException(status_code=400, detail=existing_record["Item"])
-    #
-    # return {"message": "You can clock in."}
-
-    # MongoDB code
+@router.post(
+    "/dtr/check_clock_in&out",
+    response_model=Union[DailyTimeRecordOut, Message],
+    response_model_exclude_unset=True,
+)
+async def check_clock_in(intern_id: dict = Depends(get_current_user)):
     date = datetime.now().strftime("%Y-%m-%d")
 
-    existing_record = records_collection.find_one(
-        {"intern_id": intern_id, "date": date}
+    existing_record = await storage.records.find_for_day(
+        intern_id, date, fields=RECORD_FIELDS
     )
 
     if existing_record:
-        # Convert ObjectId to string for JSON serialization
-        existing_record["_id"] = str(existing_record["_id"])
         return existing_record
 
     return {"message": "You can clock in."}
 
 
 @router.post("/dtr/clock_out")
-def clock_out(intern_id: dict = Depends(get_current_user)):
-    # DynamoDB code (commented out)
-    # date = datetime.now().strftime("%Y-%m-%d")
-    # response = table_record.get_item(Key={"intern_id": intern_id, "date": date})
-    # dtr = response.get("Item")
-    #
-    # existing_record = table_record.get_item(
-    #     Key={
-    #         "intern_id": intern_id,
-    #         "date": date
-    #     }
-    # )
-    #
-    # if not dtr:
-    #     raise HTTPException(status_code=404, detail="No clock-in record found")
-    #
-    # if "Item" in existing_record and "clock_out" in existing_record["Item"]:
-    #     raise HTTPException(status_code=400, detail="You have already clocked out today.")
-    #
-    # try:
-    #     clock_in_time = datetime.fromisoformat(str(dtr["clock_in"]))
-    # except ValueError:
-    #     raise HTTPException(status_code=500, detail="Invalid clock-in time format")
-    #
-    # total_hours = (datetime.utcnow() - datetime.fromisoformat(dtr["clock_in"])).total_seconds() / 3600
-    #
-    # total_hours = float(round((datetime.utcnow() - clock_in_time).total_seconds() / 3600, 2))
-    #
-    # table_record.update_item(
-    #     Key={"intern_id": intern_id, "date": date},
-    #     UpdateExpression="SET clock_out = :clock_out, total_work_hours = :total_hours, #status = :status",
-    #     ExpressionAttributeNames={
-    #         "#status": "status"
-    #     },
-    #     ExpressionAttributeValues={
-    #         ":clock_out": datetime.utcnow().isoformat(),
-    #         ":total_hours": Decimal(str(total_hours)),
-    #         ":status": "Completed"
-    #     }
-    # )
-    # return {"message": "Clocked out successfully", "total_hours": total_hours}
-
-    # MongoDB code
+async def clock_out(intern_id: dict = Depends(get_current_user)):
     date = datetime.now().strftime("%Y-%m-%d")
-    dtr = records_collection.find_one({"intern_id": intern_id, "date": date})
+    dtr = await storage.records.finish_day(intern_id, date, datetime.utcnow())
 
     if not dtr:
-        raise HTTPException(status_code=404, detail="No clock-in record found")
-
-    if dtr.get("clock_out"):
-        raise HTTPException(
-            status_code=400, detail="You have already clocked out today."
+        # Nothing was closed; only this failure path needs a second read
+        existing_record = await storage.records.find_for_day(
+            intern_id, date, fields=["clock_out"]
         )
+        if existing_record and existing_record.get("clock_out"):
+            raise HTTPException(
+                status_code=400, detail="You have already clocked out today."
+            )
+        raise HTTPException(status_code=404, detail="No clock-in record found")
 
-    clock_in_time = dtr["clock_in"]
-    total_hours = float(
-        round((datetime.utcnow() - clock_in_time).total_seconds() / 3600, 2)
-    )
-
-    records_collection.update_one(
-        {"intern_id": intern_id, "date": date},
+    await storage.rollups.add_day(intern_id, date, dtr["total_work_hours"])
+    read_cache.invalidate()
+    await bump(INTERNS, records_key(intern_id))
+    event_bus.publish(
+        "clock_out",
         {
-            "$set": {
-                "clock_out": datetime.utcnow(),
-                "total_work_hours": total_hours,
-                "status": "Completed",
-            }
+            "intern_id": intern_id,
+            "date": date,
+            "clock_out": dtr["clock_out"],
+            "total_hours": dtr["total_work_hours"],
         },
     )
-    return {"message": "Clocked out successfully", "total_hours": total_hours}
-
-
-@router.get("/dtr/record")
-def get_dtr(intern_id: dict = Depends(get_current_user)):
-    # DynamoDB code (commented out)
-    # response = table_record.query(
-    #     KeyConditionExpression=Key("intern_id").eq(intern_id)
-    # )
-    # return response.get("Items")
-
-    # MongoDB code
-    records = list(records_collection.find({"intern_id": intern_id}))
-
-    # Convert ObjectIds to strings for JSON serialization
-    for record in records:
-        record["_id"] = str(record["_id"])
 
-    return records
+    return {
+        "message": "Clocked out successfully",
+        "total_hours": dtr["total_work_hours"],
+    }
 
 
-@router.get("/interns")
-def get_all_interns():
+@router.get("/dtr/summary")
+async def get_dtr_summary(
+    day: Optional[date] = Query(None, alias="date"),
+    intern_id: dict = Depends(get_current_user),
+):
+    """Total, weekly and monthly hours from the precomputed rollups"""
+    keys = rollup_keys((day or datetime.now().date()).isoformat())
+    rollups = await storage.rollups.for_intern(intern_id, keys)
+
+    summary = {"intern_id": intern_id}
+    for period, key in keys.items():
+        rollup = rollups.get(period, {})
+        summary[period] = {
+            "key": key,
+            "total_hours": round(rollup.get("total_hours", 0.0), 2),
+            "days": rollup.get("days", 0),
+        }
+    return summary
+
+
+@router.get(
+    "/dtr/record",
+    response_model=List[DailyTimeRecordOut],
+    response_model_exclude_unset=True,
+)
+async def get_dtr(
+    request: Request,
+    response: Response,
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to"),
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    intern_id: dict = Depends(get_current_user),
+):
+    # The token is checked first; an unchanged history is answered 304
+    await check_etag(request, response, records_key(intern_id), intern_id)
+    records = await storage.records.list_for_intern(
+        intern_id,
+        date_from=date_from,
+        date_to=date_to,
+        after=after,
+        limit=limit and limit + 1,
+        fields=RECORD_FIELDS,
+    )
+    return paginate(records, limit, "date", response)
+
+
+@router.get(
+    "/interns",
+    response_model=List[InternWithRecords],
+    response_model_exclude_unset=True,
+)
+async def get_all_interns(
+    request: Request,
+    response: Response,
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to"),
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+):
+    version = await check_etag(request, response, INTERNS)
     try:
-        # DynamoDB code (commented out)
-        # response = table_main.scan(FilterExpression=Attr("role").eq("Intern"))
-        # interns = response.get("Items", [])
-        #
-        # for intern in interns:
-        #     intern.pop("password", None)
-        #     response_time = table_record.scan(
-        #         FilterExpression=Attr("intern_id").eq(intern["intern_id"])
-        #     )
-        #     intern["records"] = response_time.get("Items", [])
-        #
-        # return interns
-
-        # MongoDB code
-        interns = list(users_collection.find({"role": "Intern"}))
-
-        for intern in interns:
-            intern["_id"] = str(intern["_id"])
-            intern.pop("password", None)
-
-            # Get records for this intern
-            records = list(records_collection.find({"intern_id": intern["email"]}))
-            for record in records:
-                record["_id"] = str(record["_id"])
-            intern["records"] = records
-
-        return interns
+        # The engine joins every intern with their records in one pass (a
+        # single $lookup on Mongo) and leaves out the password. Admins
+        # opening the dashboard together share one query; keying it on the
+        # version keeps a worker from serving a result older than its ETag.
+        interns = await read_cache.get(
+            ("interns", version, date_from, date_to, after, limit),
+            lambda: storage.users.list_with_records(
+                "Intern",
+                date_from=date_from,
+                date_to=date_to,
+                after=after,
+                limit=limit and limit + 1,
+                fields=INTERN_FIELDS,
+                record_fields=INTERN_RECORD_FIELDS,
+            ),
+        )
+        return paginate(interns, limit, "email", response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/interns/active_today")
-def get_active_interns_today():
+@router.get(
+    "/interns/active_today",
+    response_model=List[InternWithRecords],
+    response_model_exclude_unset=True,
+)
+async def get_active_interns_today(request: Request, response: Response):
+    today_date = datetime.now().strftime("%Y-%m-%d")
+    version = await check_etag(request, response, INTERNS, today_date)
     try:
-        # DynamoDB code (commented out)
-        # today_date = datetime.now().strftime("%Y-%m-%d")
-        #
-        # response = table_main.scan(FilterExpression=Attr("role").eq("Intern"))
-        # interns = response.get("Items", [])
-        # active_interns = []
-        #
-        # for intern in interns:
-        #     intern.pop("password", None)
-        #     response_time = table_record.scan(
-        #         FilterExpression=Attr("intern_id").eq(intern["intern_id"]) &
-        #         Attr("date").eq(today_date) &
-        #         Attr("status").eq("Active")
-        #     )
-        #     records = response_time.get("Items", [])
-        #
-        #     if records:
-        #         intern["records"] = records
-        #         active_interns.append(intern)
-        #
-        # return active_interns
-
-        # MongoDB code
-        today_date = datetime.now().strftime("%Y-%m-%d")
-
-        interns = list(users_collection.find({"role": "Intern"}))
-        active_interns = []
-
-        for intern in interns:
-            intern["_id"] = str(intern["_id"])
-            intern.pop("password", None)
-
-            # Get active records for today
-            records = list(
-                records_collection.find(
-                    {
-                        "intern_id": intern["email"],
-                        "date": today_date,
-                        "status": "Active",
-                    }
-                )
-            )
+        return await read_cache.get(
+            ("active_today", version, today_date),
+            lambda: load_active_interns(today_date),
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-            for record in records:
-                record["_id"] = str(record["_id"])
 
-            if records:
-                intern["records"] = records
-                active_interns.append(intern)
+async def load_active_interns(date: str) -> list:
+    # Start from the day's active records and join their interns in one batch
+    records = await storage.records.list_active_for_day(
+        date, fields=["intern_id", *INTERN_RECORD_FIELDS]
+    )
+    records_by_intern = {}
+    for record in records:
+        records_by_intern.setdefault(record["intern_id"], []).append(record)
 
-        return active_interns
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    interns = await storage.users.list_by_emails(
+        list(records_by_intern), role="Intern", fields=INTERN_FIELDS
+    )
+    for intern in interns:
+        intern["records"] = records_by_intern[intern["email"]]
+    return interns
 
 
 @router.patch("/interns/update_approval")
 async def update_approval(request: Request):
     try:
-        # DynamoDB code (commented out)
-        # data = await request.json()
-        # intern_id = data.get("intern_id")
-        # approval = data.get("approval")
-        # response = table_main.get_item(Key={"intern_id": intern_id})
-        # if "Item" not in response:
-        #     raise HTTPException(status_code=404, detail="Intern not found")
-        #
-        # table_main.update_item(
-        #     Key={"intern_id": intern_id},
-        #     UpdateExpression="SET #approval = :approval",
-        #     ExpressionAttributeNames={
-        #         "#approval": "approval"
-        #     },
-        #     ExpressionAttributeValues={":approval": approval}
-        # )
-        #
-        # return {"message": "Approval status updated successfully"}
-
-        # MongoDB code
         data = await request.json()
         intern_id = data.get("intern_id")
         approval = data.get("approval")
 
-        user = users_collection.find_one({"email": intern_id})
-        if not user:
+        # set_approval reports a missing user itself, so the full user
+        # document (password hash included) is never read here
+        if not await storage.users.set_approval(intern_id, approval):
             raise HTTPException(status_code=404, detail="Intern not found")
-
-        users_collection.update_one(
-            {"email": intern_id}, {"$set": {"approval": approval}}
-        )
+        await profile_cache.invalidate(intern_id)
+        read_cache.invalidate()
+        await bump(INTERNS)
 
         return {"message": "Approval status updated successfully"}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.patch("/interns/update_approval/bulk")
+async def bulk_update_approval(payload: BulkApprovalUpdate):
+    # Later entries for the same intern win
+    approvals = {update.intern_id: update.approval for update in payload.updates}
+    updated = await storage.users.set_approvals(approvals)
+
+    for intern_id in updated:
+        await profile_cache.invalidate(intern_id)
+    if updated:
+        read_cache.invalidate()
+        await bump(INTERNS)
+
+    return {
+        "matched": len(updated),
+        "not_found": len(approvals) - len(updated),
+        "results": [
+            {
+                "intern_id": intern_id,
+                "approval": approval,
+                "status": "updated" if intern_id in updated else "not_found",
+            }
+            for intern_id, approval in approvals.items()
+        ],
+    }
@@ -0,0 +1,168 @@
+"""
+Response compression: brotli (when the Brotli package is installed) or gzip,
+whichever the client's Accept-Encoding prefers, brotli on a tie.
+
+Bodies under COMPRESSION_MINIMUM_SIZE go out as they are, as do responses
+that already carry a Content-Encoding and the SSE stream. Streamed
+responses (the exports) are compressed chunk by chunk and every chunk is
+flushed, so the client keeps receiving rows as they are produced instead
+of waiting for the compressor's buffer to fill.
+"""
+
+import os
+import zlib
+
+from dotenv import load_dotenv
+from starlette.datastructures import Headers, MutableHeaders
+
+from app import metrics
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+load_dotenv()
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+# Smaller bodies gain less than the headers and CPU cost
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+# 1 (fastest) to 9 (smallest)
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+# 0 (fastest) to 11 (smallest); 4-6 suits responses compressed per request
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+
+# Content types sent as they are (event streams must not sit in a buffer)
+EXCLUDED_CONTENT_TYPES = ("text/event-stream",)
+
+compression_bytes = metrics.registry.counter(
+    "http_compression_bytes_total",
+    "Response body bytes before (in) and after (out) compression",
+    ("encoding", "stage"),
+)
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        # wbits 31: zlib's deflate with a gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        )
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        output = self._compressor.process(data)
+        return output + (
+            self._compressor.finish() if final else self._compressor.flush()
+        )
+
+
+def choose_encoding(accept_encoding: str, available) -> str:
+    """The coding from `available` (in order of preference) with the highest
+    q-value in an Accept-Encoding header, or None to send the body as is"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        accepted[coding.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for coding in available:
+        weight = accepted.get(coding, accepted.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing response bodies, streamed or not"""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MINIMUM_SIZE,
+        gzip_level: int = COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compressors = {"gzip": lambda: GzipCompressor(gzip_level)}
+        if brotli is not None:
+            self.compressors = {
+                "br": lambda: BrotliCompressor(brotli_quality),
+                **self.compressors,
+            }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        encoding = choose_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.compressors
+        )
+        start = None
+        compressor = None
+        passthrough = False
+
+        def compress(body: bytes, final: bool) -> bytes:
+            compressed = compressor.compress(body, final)
+            compression_bytes.inc(encoding, "in", amount=len(body))
+            compression_bytes.inc(encoding, "out", amount=len(compressed))
+            return compressed
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows what to do
+                start = message
+                headers = Headers(raw=start["headers"])
+                passthrough = "content-encoding" in headers or headers.get(
+                    "content-type", ""
+                ).startswith(EXCLUDED_CONTENT_TYPES)
+                return
+            if message["type"] != "http.response.body":
+                return await send(message)
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is None:
+                # The rest of a streamed response
+                if not passthrough:
+                    message = {**message, "body": compress(body, final=not more_body)}
+                return await send(message)
+
+            response_start, start = start, None
+            if not passthrough and (
+                more_body or len(body) >= max(self.minimum_size, 1)
+            ):
+                headers = MutableHeaders(raw=list(response_start["headers"]))
+                headers.add_vary_header("Accept-Encoding")
+                if encoding is not None:
+                    compressor = self.compressors[encoding]()
+                    body = compress(body, final=not more_body)
+                    headers["Content-Encoding"] = encoding
+                    if more_body:
+                        del headers["Content-Length"]
+                    else:
+                        headers["Content-Length"] = str(len(body))
+                    message = {**message, "body": body}
+                response_start = {**response_start, "headers": headers.raw}
+            passthrough = compressor is None
+            await send(response_start)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,52 @@
+"""
+Move daily_time_records older than ARCHIVE_AFTER_DAYS into per-month
+archive collections, keeping the hot collection (and its indexes) down to
+recent months. Run it on a schedule, e.g. nightly; months already archived
+are skipped, and an interrupted run is finished by the next one:
+
+    python -m app.database.archive
+
+Reads stay transparent: the repositories only query an archive month when
+the requested dates reach back into it.
+"""
+
+import asyncio
+from datetime import date, timedelta
+
+from app.database.mongodb import (
+    ARCHIVE_AFTER_DAYS,
+    ARCHIVE_CATALOG_TTL,
+    ARCHIVE_COMPRESSOR,
+)
+from app.database.storage import storage
+
+
+def archive_boundary(today: date, after_days: int = ARCHIVE_AFTER_DAYS) -> str:
+    """First day of the month holding the horizon; every earlier month is archived"""
+    return (today - timedelta(days=after_days)).strftime("%Y-%m-01")
+
+
+async def archive_old_records(today: date = None) -> dict:
+    before = archive_boundary(today or date.today())
+    compressor = None if ARCHIVE_COMPRESSOR == "none" else ARCHIVE_COMPRESSOR
+    # Hold the hot copies until every process has re-read the catalog
+    return await storage.records.archive_before(
+        before, compressor=compressor, wait=ARCHIVE_CATALOG_TTL + 1
+    )
+
+
+async def main():
+    try:
+        moved = await archive_old_records()
+    except NotImplementedError as error:
+        print(error)
+        return
+    finally:
+        await storage.close()
+    for month, count in moved.items():
+        print(f"{month}: {count} records archived")
+    print(f"Archived {sum(moved.values())} records in {len(moved)} months")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
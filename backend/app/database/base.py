@@ -0,0 +1,217 @@
+from datetime import datetime
+
+
+class RecordExists(Exception):
+    """Raised by start_day when the intern already clocked in that day"""
+
+
+def rollup_keys(date: str) -> dict:
+    """Rollup bucket keys for a YYYY-MM-DD date: all-time, ISO week and month"""
+    day = datetime.strptime(date, "%Y-%m-%d")
+    year, week, _ = day.isocalendar()
+    return {
+        "total": "all",
+        "week": f"{year}-W{week:02d}",
+        "month": day.strftime("%Y-%m"),
+    }
+
+
+def round_hours(hours: float) -> float:
+    """Round half up to two places, the precision stored in total_work_hours"""
+    return int(hours * 100 + 0.5) / 100
+
+
+def project(document: dict, fields=None) -> dict:
+    """Copy of `document` limited to `fields` (all of it when None); `_id` is always kept"""
+    if fields is None:
+        return dict(document)
+    return {
+        field: value
+        for field, value in document.items()
+        if field == "_id" or field in fields
+    }
+
+
+class UserRepository:
+    """Storage interface for user documents.
+
+    Users are plain dicts with an `_id`, `email`, `name`, `surname`, `role`,
+    `password` (bcrypt hash), `approval` and `created_at`.
+
+    Listing methods take `fields`, the top-level fields the caller will
+    read, so engines fetch only those; `_id` is always returned and
+    engines may return key fields too.
+    """
+
+    async def find_by_email(self, email: str):
+        """The full user, password hash included (for login)"""
+        raise NotImplementedError
+
+    async def exists(self, email: str) -> bool:
+        """Whether a user has this email, answered from the email key/index alone"""
+        raise NotImplementedError
+
+    async def insert(self, user_data: dict):
+        """Store a new user and return its id"""
+        raise NotImplementedError
+
+    async def list_with_records(
+        self,
+        role: str,
+        date_from: str = None,
+        date_to: str = None,
+        after: str = None,
+        limit: int = None,
+        fields: list = None,
+        record_fields: list = None,
+    ):
+        """Users of a role ordered by email, without password, each with a
+        `records` list of their time records (optionally within a date range).
+
+        `after` is the last email of the previous page (keyset pagination).
+        `fields` and `record_fields` project the users and their records.
+        """
+        raise NotImplementedError
+
+    async def list_by_emails(self, emails: list, role: str = None, fields: list = None):
+        """Batch-fetch users by email, without their password hash"""
+        raise NotImplementedError
+
+    async def set_password(self, email: str, password_hash: str):
+        raise NotImplementedError
+
+    async def set_approval(self, email: str, approval: str) -> bool:
+        """Returns False when no such user exists"""
+        raise NotImplementedError
+
+    async def set_approvals(self, approvals: dict) -> set:
+        """Apply {email: approval} in bulk; returns the emails that exist"""
+        raise NotImplementedError
+
+
+class RecordRepository:
+    """Storage interface for daily time records, unique per (intern_id, date).
+
+    Read methods take `fields` like UserRepository's listing methods.
+    """
+
+    async def find_for_day(self, intern_id: str, date: str, fields: list = None):
+        raise NotImplementedError
+
+    async def start_day(self, intern_id: str, date: str, clock_in: datetime):
+        """Atomically open the day's record and return it.
+
+        Raises RecordExists if the intern already clocked in that day.
+        """
+        raise NotImplementedError
+
+    async def start_days(self, entries: list) -> list:
+        """start_day for many (intern_id, date, clock_in) entries at once.
+
+        Returns one result per entry, in order: the opened record, or the
+        exception for that entry (RecordExists if it was already clocked in).
+        Engines with a bulk write override this; the fallback opens them
+        one by one.
+        """
+        results = []
+        for intern_id, date, clock_in in entries:
+            try:
+                results.append(await self.start_day(intern_id, date, clock_in))
+            except RecordExists as error:
+                results.append(error)
+        return results
+
+    async def finish_day(self, intern_id: str, date: str, clock_out: datetime):
+        """Atomically close the day's open record and return it, with
+        `total_work_hours` set. Returns None when there is nothing to close.
+        """
+        raise NotImplementedError
+
+    async def list_active_for_day(self, date: str, fields: list = None):
+        """Records with status Active on a day"""
+        raise NotImplementedError
+
+    def iter_records(
+        self,
+        date_from: str = None,
+        date_to: str = None,
+        intern_id: str = None,
+        status: str = None,
+        batch_size: int = 1000,
+        fields: list = None,
+    ):
+        """Async iterable over all matching records, read from storage
+        `batch_size` at a time. Order is engine-specific."""
+        raise NotImplementedError
+
+    async def list_for_intern(
+        self,
+        intern_id: str,
+        date_from: str = None,
+        date_to: str = None,
+        after: str = None,
+        limit: int = None,
+        fields: list = None,
+    ):
+        """An intern's records ordered by date.
+
+        `after` is the last date of the previous page (keyset pagination).
+        """
+        raise NotImplementedError
+
+    async def archive_before(
+        self, before: str, compressor: str = None, wait: float = 0
+    ) -> dict:
+        """Move every record dated before `before` (the first day of a month)
+        into per-month archive storage; returns {YYYY-MM: records moved}.
+
+        Reads keep returning archived records, but only touch the archive
+        when the requested dates reach back before the boundary. `wait` is
+        how long to keep the hot copies after publishing the new boundary,
+        so other processes' cached catalogs catch up first.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support archival")
+
+
+class RollupRepository:
+    """Storage interface for per-intern hour totals by period (see rollup_keys)"""
+
+    async def add_day(self, intern_id: str, date: str, hours: float):
+        """Add one completed day to the intern's total, week and month buckets"""
+        raise NotImplementedError
+
+    async def for_intern(self, intern_id: str, keys: dict) -> dict:
+        """The intern's buckets for {period: key}, as {period: rollup}"""
+        raise NotImplementedError
+
+    async def replace_all(self, rollups: list):
+        raise NotImplementedError
+
+
+class VersionRepository:
+    """Storage interface for change counters, one per key, behind the ETags
+    of the cached reads (see app.http_cache)"""
+
+    async def get(self, key: str) -> int:
+        """The key's counter, read consistently; 0 until first bumped"""
+        raise NotImplementedError
+
+    async def bump(self, keys: list):
+        """Add one to each key's counter"""
+        raise NotImplementedError
+
+
+class StorageEngine:
+    """A users/records/rollups/versions repository set backed by one database"""
+
+    name = None
+    users: UserRepository
+    records: RecordRepository
+    rollups: RollupRepository
+    versions: VersionRepository
+
+    async def connect(self):
+        pass
+
+    async def close(self):
+        pass
@@ -0,0 +1,115 @@
+"""
+Write-behind batching for clock-ins.
+
+With CLOCK_IN_BATCHING on, clock_in hands its write to `clock_in_batcher`
+instead of writing straight away. Writes queue up in process and go to
+storage together once CLOCK_IN_BATCH_SIZE are waiting or
+CLOCK_IN_BATCH_WINDOW seconds after the first. Each caller still waits for
+its own result: the request is answered only after its batch was written,
+and a per-entry failure (RecordExists for a repeated clock-in) is raised to
+that caller alone.
+"""
+
+import asyncio
+import os
+
+from dotenv import load_dotenv
+
+from app import metrics
+from app.database.storage import storage
+from app.http_cache import INTERNS, bump, records_key
+
+load_dotenv()
+
+CLOCK_IN_BATCHING = os.getenv("CLOCK_IN_BATCHING", "false").lower() == "true"
+CLOCK_IN_BATCH_SIZE = int(os.getenv("CLOCK_IN_BATCH_SIZE", "100"))
+# Seconds the first write of a batch waits for others to join it
+CLOCK_IN_BATCH_WINDOW = float(os.getenv("CLOCK_IN_BATCH_WINDOW", "0.01"))
+
+batch_sizes = metrics.registry.histogram(
+    "write_batch_size",
+    "Entries per batched write",
+    ("batch",),
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+
+
+class WriteBatcher:
+    """Collects entries and writes them with `flush(entries)`, which returns
+    one result or exception per entry"""
+
+    def __init__(self, name: str, flush, max_size: int, window: float):
+        self.name = name
+        self.flush = flush
+        self.max_size = max_size
+        self.window = window
+        self._pending = []
+        self._timer = None
+        self._flushes = set()
+
+    async def submit(self, entry):
+        """Queue `entry` and wait for its result once the batch is written"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((entry, future))
+        if len(self._pending) >= self.max_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.window, self._start_flush
+            )
+
+        result = await future
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _start_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            # Keep a reference so the write is not garbage collected mid-flight
+            task = asyncio.ensure_future(self._write(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _write(self, batch: list):
+        batch_sizes.observe(len(batch), self.name)
+        try:
+            results = await self.flush([entry for entry, _ in batch])
+        except Exception as error:
+            # The whole write failed, so every caller in it gets the error
+            results = [error] * len(batch)
+        for (_, future), result in zip(batch, results):
+            # A caller that went away has already given up on its result
+            if not future.done():
+                future.set_result(result)
+
+    async def drain(self):
+        """Write whatever is queued and wait for writes in flight"""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes)
+
+
+async def start_days(entries: list) -> list:
+    """Write a batch of clock-ins, then bump the ETag versions they change
+    in one write"""
+    results = await storage.records.start_days(entries)
+    started = [
+        intern_id
+        for (intern_id, _, _), result in zip(entries, results)
+        if not isinstance(result, Exception)
+    ]
+    if started:
+        await bump(INTERNS, *map(records_key, started))
+    return results
+
+
+clock_in_batcher = WriteBatcher(
+    "clock_in",
+    start_days,
+    CLOCK_IN_BATCH_SIZE,
+    CLOCK_IN_BATCH_WINDOW,
+)
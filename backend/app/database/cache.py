@@ -0,0 +1,300 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+
+import bson
+from dotenv import load_dotenv
+
+from app import metrics
+
+load_dotenv()
+
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "10000"))
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "300"))
+# redis://host:port/db shares the profile cache between workers and
+# replicas; unset keeps it in each process
+PROFILE_CACHE_URL = os.getenv("PROFILE_CACHE_URL")
+# Seconds a user's session counter (logout revocation) is reused; with the
+# in-process default another worker may accept a logged-out token that long
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "5"))
+# Seconds a hot admin list result is reused; 0 keeps only the coalescing
+READ_CACHE_TTL = float(os.getenv("READ_CACHE_TTL", "2"))
+# Results kept at most; keys include query parameters anyone can vary
+READ_CACHE_SIZE = int(os.getenv("READ_CACHE_SIZE", "1000"))
+
+read_cache_lookups = metrics.registry.counter(
+    "read_cache_lookups_total",
+    "Coalesced admin reads by outcome (hit, miss, coalesced)",
+    ("result",),
+)
+
+
+class CacheBackend:
+    """Key/value store behind ProfileCache.
+
+    The default is an in-process LRU. Replicas that must stay coherent plug
+    in a shared store (Redis, memcached, ...) implementing these methods;
+    invalidations then reach every replica because they all read the same
+    store.
+    """
+
+    async def get(self, key: str):
+        raise NotImplementedError
+
+    async def set(self, key: str, value: dict, ttl: float):
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+    async def size(self) -> int:
+        raise NotImplementedError
+
+
+class RedisCacheBackend(CacheBackend):
+    """Entries in Redis (PROFILE_CACHE_URL), shared by every worker and
+    replica. `size` counts the whole Redis database, so give the cache a
+    database of its own."""
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str):
+        import redis.asyncio
+
+        return cls(redis.asyncio.from_url(url))
+
+    async def get(self, key: str):
+        data = await self.client.get(key)
+        return bson.decode(data) if data is not None else None
+
+    async def set(self, key: str, value: dict, ttl: float):
+        await self.client.set(key, bson.encode(value), px=max(int(ttl * 1000), 1))
+
+    async def delete(self, key: str):
+        await self.client.delete(key)
+
+    async def size(self) -> int:
+        return await self.client.dbsize()
+
+
+class LocalCacheBackend(CacheBackend):
+    """Bounded in-process LRU with per-entry expiry"""
+
+    def __init__(self, max_size: int = PROFILE_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+
+    async def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: dict, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    async def size(self) -> int:
+        return len(self)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class ProfileCache:
+    """Read-through cache of user profiles keyed by email.
+
+    The password hash is never cached: login reads the user from storage,
+    so it always checks the current hash and approval.
+    """
+
+    def __init__(self, backend: CacheBackend = None, ttl: float = PROFILE_CACHE_TTL):
+        self.backend = backend if backend is not None else LocalCacheBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(email: str) -> str:
+        return f"user:{email}"
+
+    async def get(self, email: str, loader):
+        """Cached profile, or `await loader(email)` on a miss; either way
+        without the password hash.
+
+        Returns a copy so callers can pop fields without touching the cache.
+        """
+        user = await self.backend.get(self.key(email))
+        if user is not None:
+            self.hits += 1
+            return dict(user)
+
+        self.misses += 1
+        user = await loader(email)
+        if user is None:
+            return None
+        user = {field: value for field, value in user.items() if field != "password"}
+        await self.backend.set(self.key(email), dict(user), self.ttl)
+        return user
+
+    async def invalidate(self, email: str):
+        await self.backend.delete(self.key(email))
+
+    def use_backend(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    async def stats(self) -> dict:
+        return {
+            "size": await self.backend.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio(),
+        }
+
+
+profile_cache = ProfileCache(
+    RedisCacheBackend.from_url(PROFILE_CACHE_URL) if PROFILE_CACHE_URL else None
+)
+
+
+class SessionCache:
+    """Read-through cache of each user's session counter (see
+    jwt_handler.sessions_key), so checking a token for revocation does not
+    cost a storage read per request.
+
+    It shares the profile cache's backend: with PROFILE_CACHE_URL every
+    replica sees a logout as soon as `set` stores the bumped counter, while
+    in-process entries elsewhere age out after `ttl` seconds.
+    """
+
+    def __init__(self, backend: CacheBackend = None, ttl: float = SESSION_CACHE_TTL):
+        self.backend = backend if backend is not None else LocalCacheBackend()
+        self.ttl = ttl
+
+    @staticmethod
+    def key(email: str) -> str:
+        return f"session:{email}"
+
+    async def get(self, email: str, loader) -> int:
+        """Cached counter, or `await loader(email)` on a miss"""
+        entry = await self.backend.get(self.key(email))
+        if entry is not None:
+            return entry["version"]
+        version = await loader(email)
+        await self.set(email, version)
+        return version
+
+    async def set(self, email: str, version: int):
+        await self.backend.set(self.key(email), {"version": version}, self.ttl)
+
+
+session_cache = SessionCache(profile_cache.backend)
+
+profile_cache_lookups = metrics.registry.gauge(
+    "profile_cache_lookups", "Profile cache lookups since start", ("result",)
+)
+profile_cache_hit_ratio = metrics.registry.gauge(
+    "profile_cache_hit_ratio", "Share of profile cache lookups that were hits"
+)
+profile_cache_size = metrics.registry.gauge(
+    "profile_cache_size", "Profiles in this process's cache (the local backend only)"
+)
+
+
+@metrics.registry.on_collect
+def _collect_profile_cache_stats():
+    profile_cache_lookups.set(profile_cache.hits, "hit")
+    profile_cache_lookups.set(profile_cache.misses, "miss")
+    profile_cache_hit_ratio.set(profile_cache.hit_ratio())
+    # A shared backend's size is a round trip away; it is in stats() instead
+    if isinstance(profile_cache.backend, LocalCacheBackend):
+        profile_cache_size.set(len(profile_cache.backend))
+
+
+class ReadCoalescer:
+    """Single-flight plus a short micro-cache for hot list reads.
+
+    Concurrent callers asking for the same key share one in-flight load
+    instead of each running the query, and the result is reused for `ttl`
+    seconds. Writes that change what the lists show call `invalidate()`.
+    The cache is per process, so another worker can serve a result up to
+    `ttl` seconds old. At most `max_size` results are kept, least recently
+    used first out, since callers can make up keys (page, range) at will.
+    """
+
+    def __init__(self, ttl: float = READ_CACHE_TTL, max_size: int = READ_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._generation = 0
+
+    async def get(self, key: tuple, loader):
+        """Cached or in-flight result for `key`, else `await loader()`.
+
+        The result is shared between callers and must not be mutated.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                read_cache_lookups.inc("hit")
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        flight = self._flights.get(key)
+        if flight is None:
+            read_cache_lookups.inc("miss")
+            flight = asyncio.ensure_future(self._load(key, loader))
+            self._flights[key] = flight
+        else:
+            read_cache_lookups.inc("coalesced")
+        # A caller that disconnects must not cancel the load for the others
+        return await asyncio.shield(flight)
+
+    async def _load(self, key: tuple, loader):
+        generation = self._generation
+        try:
+            value = await loader()
+        finally:
+            if self._flights.get(key) is asyncio.current_task():
+                del self._flights[key]
+        # A write during the load may have made the result stale already
+        if self.ttl > 0 and self.max_size > 0 and generation == self._generation:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self):
+        """Forget every cached result; loads already running are not reused"""
+        self._generation += 1
+        self._entries.clear()
+        self._flights.clear()
+
+
+read_cache = ReadCoalescer()
@@ -0,0 +1,527 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+
+from app.database import base
+from app.database.base import RecordExists, round_hours, rollup_keys
+from app.database.dynamodb import (
+    get_resource,
+    DYNAMODB_TABLE_Main,
+    DYNAMODB_TABLE_Record,
+    DYNAMODB_TABLE_Rollup,
+    DYNAMODB_TABLE_Version,
+    INDEX_ROLE,
+    INDEX_DATE_STATUS,
+)
+
+# DynamoDB caps BatchGetItem at 100 keys and TransactWriteItems at 100 items
+BATCH_LIMIT = 100
+DATETIME_FIELDS = ("clock_in", "clock_out", "created_at", "updated_at")
+
+
+def _to_item(document: dict) -> dict:
+    """Mongo-shaped document -> DynamoDB item (ISO datetimes, Decimal numbers)"""
+    item = {}
+    for field, value in document.items():
+        if field == "_id" or value is None:
+            continue
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, float):
+            value = Decimal(str(value))
+        item[field] = value
+    return item
+
+
+def _from_item(item: dict) -> dict:
+    document = {}
+    for field, value in item.items():
+        if isinstance(value, Decimal):
+            value = int(value) if field == "days" else float(value)
+        elif field in DATETIME_FIELDS and isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        document[field] = value
+    return document
+
+
+def _user_from_item(item: dict, with_password: bool = True) -> dict:
+    user = _from_item(item)
+    user["email"] = user.pop("intern_id")
+    user["_id"] = user["email"]
+    if not with_password:
+        user.pop("password", None)
+    return user
+
+
+def _record_from_item(item: dict) -> dict:
+    record = _from_item(item)
+    record["_id"] = f"{record['intern_id']}#{record['date']}"
+    return record
+
+
+def _projection(fields, key_attributes, renamed=("_id",)) -> dict:
+    """ProjectionExpression kwargs for document `fields`. Key attributes are
+    always read since `_id` (and a user's email) are built from them."""
+    if fields is None:
+        return {}
+    attributes = dict.fromkeys(key_attributes)
+    attributes.update(dict.fromkeys(field for field in fields if field not in renamed))
+    # Placeholders for every name, as many fields (date, status, name, ...) are reserved words
+    names = {f"#p{index}": attribute for index, attribute in enumerate(attributes)}
+    return {"ProjectionExpression": ", ".join(names), "ExpressionAttributeNames": names}
+
+
+def _user_projection(fields) -> dict:
+    return _projection(fields, ["intern_id"], renamed=("_id", "email", "password"))
+
+
+def _record_projection(fields) -> dict:
+    return _projection(fields, ["intern_id", "date"])
+
+
+def _condition_failed(error: ClientError) -> bool:
+    return error.response["Error"]["Code"] in (
+        "ConditionalCheckFailedException",
+        "TransactionCanceledException",
+    )
+
+
+class DynamoRepository:
+    """boto3 is blocking, so every call runs in a worker thread"""
+
+    def __init__(self, engine, table_name: str):
+        self.engine = engine
+        self.table_name = table_name
+
+    @property
+    def table(self):
+        return self.engine.resource.Table(self.table_name)
+
+    async def _call(self, method: str, **kwargs):
+        return await asyncio.to_thread(getattr(self.table, method), **kwargs)
+
+    async def _query_all(self, limit: int = None, **kwargs):
+        """Follow LastEvaluatedKey until `limit` items (or all) are read"""
+        items = []
+        while True:
+            if limit:
+                kwargs["Limit"] = limit - len(items)
+            response = await self._call("query", **kwargs)
+            items += response.get("Items", [])
+            if "LastEvaluatedKey" not in response or (limit and len(items) >= limit):
+                return items
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    async def _batch_get(self, keys: list, projection: dict = None) -> list:
+        items = []
+        for start in range(0, len(keys), BATCH_LIMIT):
+            request = {
+                self.table_name: {
+                    "Keys": keys[start : start + BATCH_LIMIT],
+                    **(projection or {}),
+                }
+            }
+            while request:
+                response = await asyncio.to_thread(
+                    self.engine.resource.batch_get_item, RequestItems=request
+                )
+                items += response["Responses"].get(self.table_name, [])
+                request = response.get("UnprocessedKeys")
+        return items
+
+    async def _transact_updates(self, updates: list):
+        """Apply Update dicts atomically, 100 per round trip. The resource's
+        client serializes plain Python values, as Table methods do."""
+        client = self.engine.resource.meta.client
+        for start in range(0, len(updates), BATCH_LIMIT):
+            await asyncio.to_thread(
+                client.transact_write_items,
+                TransactItems=[
+                    {"Update": {"TableName": self.table_name, **update}}
+                    for update in updates[start : start + BATCH_LIMIT]
+                ],
+            )
+
+
+class DynamoUserRepository(DynamoRepository, base.UserRepository):
+    """Users live in InternsTable keyed by intern_id (the email)"""
+
+    async def find_by_email(self, email: str):
+        response = await self._call("get_item", Key={"intern_id": email})
+        item = response.get("Item")
+        return _user_from_item(item) if item else None
+
+    async def exists(self, email: str) -> bool:
+        response = await self._call(
+            "get_item", Key={"intern_id": email}, ProjectionExpression="intern_id"
+        )
+        return "Item" in response
+
+    async def insert(self, user_data: dict):
+        item = _to_item(user_data)
+        item["intern_id"] = item.pop("email")
+        await self._call(
+            "put_item", Item=item, ConditionExpression="attribute_not_exists(intern_id)"
+        )
+        return item["intern_id"]
+
+    async def list_with_records(
+        self,
+        role: str,
+        date_from: str = None,
+        date_to: str = None,
+        after: str = None,
+        limit: int = None,
+        fields: list = None,
+        record_fields: list = None,
+    ):
+        condition = Key("role").eq(role)
+        if after:
+            condition = condition & Key("intern_id").gt(after)
+        items = await self._query_all(
+            limit=limit,
+            IndexName=INDEX_ROLE,
+            KeyConditionExpression=condition,
+            **_user_projection(fields),
+        )
+        users = [_user_from_item(item, with_password=False) for item in items]
+
+        # No joins in DynamoDB: one Query per intern on the records table key,
+        # issued concurrently
+        records = await asyncio.gather(
+            *(
+                self.engine.records.list_for_intern(
+                    user["email"],
+                    date_from=date_from,
+                    date_to=date_to,
+                    fields=record_fields,
+                )
+                for user in users
+            )
+        )
+        for user, user_records in zip(users, records):
+            user["records"] = user_records
+        return users
+
+    async def list_by_emails(self, emails: list, role: str = None, fields: list = None):
+        if fields is not None and role:
+            fields = [*fields, "role"]
+        items = await self._batch_get(
+            [{"intern_id": email} for email in dict.fromkeys(emails)],
+            _user_projection(fields),
+        )
+        users = [_user_from_item(item, with_password=False) for item in items]
+        return [user for user in users if not role or user.get("role") == role]
+
+    async def set_password(self, email: str, password_hash: str):
+        await self._set(email, "password", password_hash)
+
+    async def set_approval(self, email: str, approval: str) -> bool:
+        return await self._set(email, "approval", approval)
+
+    async def _set(self, email: str, field: str, value) -> bool:
+        try:
+            await self._call(
+                "update_item",
+                Key={"intern_id": email},
+                UpdateExpression="SET #field = :value",
+                ConditionExpression="attribute_exists(intern_id)",
+                ExpressionAttributeNames={"#field": field},
+                ExpressionAttributeValues={":value": value},
+            )
+        except ClientError as error:
+            if _condition_failed(error):
+                return False
+            raise
+        return True
+
+    async def set_approvals(self, approvals: dict) -> set:
+        existing = {
+            user["email"]
+            for user in await self.list_by_emails(list(approvals), fields=[])
+        }
+        await self._transact_updates(
+            [
+                {
+                    "Key": {"intern_id": email},
+                    "UpdateExpression": "SET #approval = :approval",
+                    "ExpressionAttributeNames": {"#approval": "approval"},
+                    "ExpressionAttributeValues": {":approval": approvals[email]},
+                }
+                for email in existing
+            ]
+        )
+        return existing
+
+
+class DynamoRecordRepository(DynamoRepository, base.RecordRepository):
+    """Records live in DailyTimeRecordsTable keyed by (intern_id, date)"""
+
+    async def find_for_day(self, intern_id: str, date: str, fields: list = None):
+        response = await self._call(
+            "get_item",
+            Key={"intern_id": intern_id, "date": date},
+            **_record_projection(fields),
+        )
+        item = response.get("Item")
+        return _record_from_item(item) if item else None
+
+    async def start_day(self, intern_id: str, date: str, clock_in: datetime):
+        try:
+            response = await self._call(
+                "update_item",
+                Key={"intern_id": intern_id, "date": date},
+                UpdateExpression=(
+                    "SET clock_in = :clock_in, #status = :status, "
+                    "created_at = if_not_exists(created_at, :clock_in)"
+                ),
+                ConditionExpression="attribute_not_exists(clock_in)",
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={
+                    ":clock_in": clock_in.isoformat(),
+                    ":status": "Active",
+                },
+                ReturnValues="ALL_NEW",
+            )
+        except ClientError as error:
+            if _condition_failed(error):
+                raise RecordExists()
+            raise
+        return _record_from_item(response["Attributes"])
+
+    async def finish_day(self, intern_id: str, date: str, clock_out: datetime):
+        # DynamoDB can't do date arithmetic in an update expression, so read
+        # clock_in first; the condition keeps the write atomic
+        record = await self.find_for_day(intern_id, date)
+        if not record or not record.get("clock_in") or record.get("clock_out"):
+            return None
+
+        total_hours = round_hours(
+            (clock_out - record["clock_in"]).total_seconds() / 3600
+        )
+        try:
+            response = await self._call(
+                "update_item",
+                Key={"intern_id": intern_id, "date": date},
+                UpdateExpression=(
+                    "SET clock_out = :clock_out, total_work_hours = :total_hours, "
+                    "#status = :status"
+                ),
+                ConditionExpression="attribute_exists(clock_in) AND attribute_not_exists(clock_out)",
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={
+                    ":clock_out": clock_out.isoformat(),
+                    ":total_hours": Decimal(str(total_hours)),
+                    ":status": "Completed",
+                },
+                ReturnValues="ALL_NEW",
+            )
+        except ClientError as error:
+            if _condition_failed(error):
+                return None
+            raise
+        return _record_from_item(response["Attributes"])
+
+    async def list_active_for_day(self, date: str, fields: list = None):
+        items = await self._query_all(
+            IndexName=INDEX_DATE_STATUS,
+            KeyConditionExpression=Key("date").eq(date) & Key("status").eq("Active"),
+            **_record_projection(fields),
+        )
+        return [_record_from_item(item) for item in items]
+
+    async def iter_records(
+        self,
+        date_from: str = None,
+        date_to: str = None,
+        intern_id: str = None,
+        status: str = None,
+        batch_size: int = 1000,
+        fields: list = None,
+    ):
+        filters = []
+        if status:
+            filters.append(Attr("status").eq(status))
+
+        if intern_id:
+            # One intern: Query the partition, dates come back in order
+            kwargs = {
+                "KeyConditionExpression": self._key_condition(
+                    intern_id, date_from, date_to
+                )
+            }
+            method = "query"
+        else:
+            # Whole table export: a paged Scan is the only option
+            if date_from:
+                filters.append(Attr("date").gte(date_from))
+            if date_to:
+                filters.append(Attr("date").lte(date_to))
+            kwargs = {}
+            method = "scan"
+
+        if filters:
+            condition = filters[0]
+            for extra in filters[1:]:
+                condition = condition & extra
+            kwargs["FilterExpression"] = condition
+        kwargs.update(_record_projection(fields))
+
+        while True:
+            response = await self._call(method, Limit=batch_size, **kwargs)
+            for item in response.get("Items", []):
+                yield _record_from_item(item)
+            if "LastEvaluatedKey" not in response:
+                return
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    @staticmethod
+    def _key_condition(intern_id: str, date_from: str = None, date_to: str = None):
+        condition = Key("intern_id").eq(intern_id)
+        if date_from and date_to:
+            return condition & Key("date").between(date_from, date_to)
+        if date_from:
+            return condition & Key("date").gte(date_from)
+        if date_to:
+            return condition & Key("date").lte(date_to)
+        return condition
+
+    async def list_for_intern(
+        self,
+        intern_id: str,
+        date_from: str = None,
+        date_to: str = None,
+        after: str = None,
+        limit: int = None,
+        fields: list = None,
+    ):
+        kwargs = {
+            "KeyConditionExpression": self._key_condition(
+                intern_id, date_from, date_to
+            ),
+            **_record_projection(fields),
+        }
+        if after:
+            # Native keyset pagination: resume right after (intern_id, after)
+            kwargs["ExclusiveStartKey"] = {"intern_id": intern_id, "date": after}
+        items = await self._query_all(limit=limit, **kwargs)
+        return [_record_from_item(item) for item in items]
+
+
+class DynamoRollupRepository(DynamoRepository, base.RollupRepository):
+    """Rollups live in DtrRollupsTable keyed by (intern_id, "period#key")"""
+
+    async def add_day(self, intern_id: str, date: str, hours: float):
+        now = datetime.utcnow().isoformat()
+        await self._transact_updates(
+            [
+                {
+                    "Key": {"intern_id": intern_id, "bucket": f"{period}#{key}"},
+                    "UpdateExpression": (
+                        "ADD total_hours :hours, #days :one "
+                        "SET #period = :period, #key = :key, updated_at = :now"
+                    ),
+                    # days, period and key are DynamoDB reserved words
+                    "ExpressionAttributeNames": {
+                        "#days": "days",
+                        "#period": "period",
+                        "#key": "key",
+                    },
+                    "ExpressionAttributeValues": {
+                        ":hours": Decimal(str(hours)),
+                        ":one": 1,
+                        ":period": period,
+                        ":key": key,
+                        ":now": now,
+                    },
+                }
+                for period, key in rollup_keys(date).items()
+            ]
+        )
+
+    async def for_intern(self, intern_id: str, keys: dict) -> dict:
+        items = await self._batch_get(
+            [
+                {"intern_id": intern_id, "bucket": f"{period}#{key}"}
+                for period, key in keys.items()
+            ]
+        )
+        rollups = {}
+        for item in items:
+            rollup = _from_item(item)
+            rollup.pop("bucket")
+            rollups[rollup["period"]] = rollup
+        return rollups
+
+    async def replace_all(self, rollups: list):
+        def replace():
+            table = self.table
+            scan = {
+                "ProjectionExpression": "intern_id, #bucket",
+                "ExpressionAttributeNames": {"#bucket": "bucket"},
+            }
+            with table.batch_writer() as batch:
+                while True:
+                    response = table.scan(**scan)
+                    for key in response.get("Items", []):
+                        batch.delete_item(Key=key)
+                    if "LastEvaluatedKey" not in response:
+                        break
+                    scan["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            with table.batch_writer() as batch:
+                for rollup in rollups:
+                    item = _to_item(rollup)
+                    item["bucket"] = f"{rollup['period']}#{rollup['key']}"
+                    batch.put_item(Item=item)
+
+        await asyncio.to_thread(replace)
+
+
+class DynamoVersionRepository(DynamoRepository, base.VersionRepository):
+    """Counters live in DtrVersionsTable keyed by version_key"""
+
+    async def get(self, key: str) -> int:
+        # Strongly consistent: an eventually consistent read could still
+        # match an ETag the last write has already invalidated
+        response = await self._call(
+            "get_item", Key={"version_key": key}, ConsistentRead=True
+        )
+        return int(response["Item"]["version"]) if "Item" in response else 0
+
+    async def bump(self, keys: list):
+        # One plain update per key: ADD is atomic on its own, and unlike a
+        # transaction it does not conflict with concurrent bumps of the same
+        # item (every clock-in bumps "interns")
+        await asyncio.gather(
+            *(
+                self._call(
+                    "update_item",
+                    Key={"version_key": key},
+                    UpdateExpression="ADD #version :one",
+                    ExpressionAttributeNames={"#version": "version"},
+                    ExpressionAttributeValues={":one": 1},
+                )
+                for key in keys
+            )
+        )
+
+
+class DynamoEngine(base.StorageEngine):
+    """DynamoDB storage on the tables from terraform/modules/dynamodb"""
+
+    name = "dynamodb"
+
+    def __init__(self, resource=None):
+        # Pass a boto3 resource to pin one (e.g. a test stand-in)
+        self._resource = resource
+        self.users = DynamoUserRepository(self, DYNAMODB_TABLE_Main)
+        self.records = DynamoRecordRepository(self, DYNAMODB_TABLE_Record)
+        self.rollups = DynamoRollupRepository(self, DYNAMODB_TABLE_Rollup)
+        self.versions = DynamoVersionRepository(self, DYNAMODB_TABLE_Version)
+
+    @property
+    def resource(self):
+        return self._resource if self._resource is not None else get_resource()
@@ -5,15 +5,95 @@ from dotenv import load_dotenv
 load_dotenv()
 
 AWS_REGION = os.getenv("AWS_REGION", "ap-southeast-2")
+# Point at DynamoDB Local or another emulator; unset for AWS
+DYNAMODB_ENDPOINT_URL = os.getenv("DYNAMODB_ENDPOINT_URL")
 DYNAMODB_TABLE_Main = "InternsTable"
 DYNAMODB_TABLE_Record = "DailyTimeRecordsTable"
+DYNAMODB_TABLE_Rollup = "DtrRollupsTable"
+DYNAMODB_TABLE_Version = "DtrVersionsTable"
 
-dynamodb = boto3.resource(
-    "dynamodb",
-    region_name=AWS_REGION,
-    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-)
+# Global secondary indexes
+INDEX_ROLE = "role-index"
+INDEX_DATE_STATUS = "date-status-index"
 
-table_main = dynamodb.Table(DYNAMODB_TABLE_Main)
-table_record = dynamodb.Table(DYNAMODB_TABLE_Record)
+dynamodb = None
+
+
+def get_resource():
+    """The process-wide boto3 DynamoDB resource, created on first use"""
+    global dynamodb
+    if dynamodb is None:
+        dynamodb = boto3.resource(
+            "dynamodb",
+            region_name=AWS_REGION,
+            endpoint_url=DYNAMODB_ENDPOINT_URL,
+            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+        )
+    return dynamodb
+
+
+def create_tables(resource=None):
+    """Create the tables and indexes (mirrors terraform/modules/dynamodb) for
+    DynamoDB Local and test stand-ins"""
+    resource = resource or get_resource()
+    resource.create_table(
+        TableName=DYNAMODB_TABLE_Main,
+        BillingMode="PAY_PER_REQUEST",
+        AttributeDefinitions=[
+            {"AttributeName": "intern_id", "AttributeType": "S"},
+            {"AttributeName": "role", "AttributeType": "S"},
+        ],
+        KeySchema=[{"AttributeName": "intern_id", "KeyType": "HASH"}],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": INDEX_ROLE,
+                "KeySchema": [
+                    {"AttributeName": "role", "KeyType": "HASH"},
+                    {"AttributeName": "intern_id", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+        ],
+    )
+    resource.create_table(
+        TableName=DYNAMODB_TABLE_Record,
+        BillingMode="PAY_PER_REQUEST",
+        AttributeDefinitions=[
+            {"AttributeName": "intern_id", "AttributeType": "S"},
+            {"AttributeName": "date", "AttributeType": "S"},
+            {"AttributeName": "status", "AttributeType": "S"},
+        ],
+        KeySchema=[
+            {"AttributeName": "intern_id", "KeyType": "HASH"},
+            {"AttributeName": "date", "KeyType": "RANGE"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": INDEX_DATE_STATUS,
+                "KeySchema": [
+                    {"AttributeName": "date", "KeyType": "HASH"},
+                    {"AttributeName": "status", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+        ],
+    )
+    resource.create_table(
+        TableName=DYNAMODB_TABLE_Rollup,
+        BillingMode="PAY_PER_REQUEST",
+        AttributeDefinitions=[
+            {"AttributeName": "intern_id", "AttributeType": "S"},
+            {"AttributeName": "bucket", "AttributeType": "S"},
+        ],
+        KeySchema=[
+            {"AttributeName": "intern_id", "KeyType": "HASH"},
+            {"AttributeName": "bucket", "KeyType": "RANGE"},
+        ],
+    )
+    resource.create_table(
+        TableName=DYNAMODB_TABLE_Version,
+        BillingMode="PAY_PER_REQUEST",
+        AttributeDefinitions=[{"AttributeName": "version_key", "AttributeType": "S"}],
+        KeySchema=[{"AttributeName": "version_key", "KeyType": "HASH"}],
+    )
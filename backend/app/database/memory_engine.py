@@ -0,0 +1,247 @@
+import uuid
+from datetime import datetime
+
+from app.database import base
+from app.database.base import RecordExists, project, round_hours, rollup_keys
+
+
+def _in_range(date: str, date_from: str = None, date_to: str = None) -> bool:
+    return (not date_from or date >= date_from) and (not date_to or date <= date_to)
+
+
+def _without_password(user: dict, fields: list = None) -> dict:
+    return {
+        field: value
+        for field, value in project(user, fields).items()
+        if field != "password"
+    }
+
+
+class MemoryUserRepository(base.UserRepository):
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def find_by_email(self, email: str):
+        user = self.engine.users_by_email.get(email)
+        return dict(user) if user else None
+
+    async def exists(self, email: str) -> bool:
+        return email in self.engine.users_by_email
+
+    async def insert(self, user_data: dict):
+        user = {"_id": uuid.uuid4().hex, **user_data}
+        self.engine.users_by_email[user["email"]] = user
+        return user["_id"]
+
+    async def list_with_records(
+        self,
+        role: str,
+        date_from: str = None,
+        date_to: str = None,
+        after: str = None,
+        limit: int = None,
+        fields: list = None,
+        record_fields: list = None,
+    ):
+        emails = sorted(
+            email
+            for email, user in self.engine.users_by_email.items()
+            if user.get("role") == role and (not after or email > after)
+        )
+        users = []
+        for email in emails[:limit] if limit else emails:
+            user = _without_password(self.engine.users_by_email[email], fields)
+            user["records"] = await self.engine.records.list_for_intern(
+                email, date_from=date_from, date_to=date_to, fields=record_fields
+            )
+            users.append(user)
+        return users
+
+    async def list_by_emails(self, emails: list, role: str = None, fields: list = None):
+        users = (self.engine.users_by_email.get(email) for email in emails)
+        return [
+            _without_password(user, fields)
+            for user in users
+            if user and (not role or user.get("role") == role)
+        ]
+
+    async def set_password(self, email: str, password_hash: str):
+        if email in self.engine.users_by_email:
+            self.engine.users_by_email[email]["password"] = password_hash
+
+    async def set_approval(self, email: str, approval: str) -> bool:
+        user = self.engine.users_by_email.get(email)
+        if user is None:
+            return False
+        user["approval"] = approval
+        return True
+
+    async def set_approvals(self, approvals: dict) -> set:
+        return {
+            email
+            for email, approval in approvals.items()
+            if await self.set_approval(email, approval)
+        }
+
+
+class MemoryRecordRepository(base.RecordRepository):
+    def __init__(self, engine):
+        self.engine = engine
+
+    def _store(self, record: dict):
+        self.engine.records_by_intern.setdefault(record["intern_id"], {})[
+            record["date"]
+        ] = record
+        self.engine.records_by_date.setdefault(record["date"], {})[
+            record["intern_id"]
+        ] = record
+
+    async def find_for_day(self, intern_id: str, date: str, fields: list = None):
+        record = self.engine.records_by_intern.get(intern_id, {}).get(date)
+        return project(record, fields) if record else None
+
+    async def start_day(self, intern_id: str, date: str, clock_in: datetime):
+        record = self.engine.records_by_intern.get(intern_id, {}).get(date)
+        if record is not None and record.get("clock_in"):
+            raise RecordExists()
+        if record is None:
+            record = {
+                "_id": uuid.uuid4().hex,
+                "intern_id": intern_id,
+                "date": date,
+                "created_at": clock_in,
+            }
+            self._store(record)
+        record.update({"clock_in": clock_in, "status": "Active"})
+        return dict(record)
+
+    async def finish_day(self, intern_id: str, date: str, clock_out: datetime):
+        record = self.engine.records_by_intern.get(intern_id, {}).get(date)
+        if record is None or not record.get("clock_in") or record.get("clock_out"):
+            return None
+        record.update(
+            {
+                "clock_out": clock_out,
+                "total_work_hours": round_hours(
+                    (clock_out - record["clock_in"]).total_seconds() / 3600
+                ),
+                "status": "Completed",
+            }
+        )
+        return dict(record)
+
+    async def list_active_for_day(self, date: str, fields: list = None):
+        return [
+            project(record, fields)
+            for record in self.engine.records_by_date.get(date, {}).values()
+            if record.get("status") == "Active"
+        ]
+
+    async def iter_records(
+        self,
+        date_from: str = None,
+        date_to: str = None,
+        intern_id: str = None,
+        status: str = None,
+        batch_size: int = 1000,
+        fields: list = None,
+    ):
+        intern_ids = [intern_id] if intern_id else sorted(self.engine.records_by_intern)
+        for current_intern in intern_ids:
+            records = self.engine.records_by_intern.get(current_intern, {})
+            for date in sorted(records):
+                record = records[date]
+                if _in_range(date, date_from, date_to) and (
+                    not status or record.get("status") == status
+                ):
+                    yield project(record, fields)
+
+    async def list_for_intern(
+        self,
+        intern_id: str,
+        date_from: str = None,
+        date_to: str = None,
+        after: str = None,
+        limit: int = None,
+        fields: list = None,
+    ):
+        records = self.engine.records_by_intern.get(intern_id, {})
+        dates = [
+            date
+            for date in sorted(records)
+            if _in_range(date, date_from, date_to) and (not after or date > after)
+        ]
+        return [
+            project(records[date], fields)
+            for date in (dates[:limit] if limit else dates)
+        ]
+
+
+class MemoryRollupRepository(base.RollupRepository):
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def add_day(self, intern_id: str, date: str, hours: float):
+        now = datetime.utcnow()
+        for period, key in rollup_keys(date).items():
+            rollup = self.engine.rollup_buckets.setdefault(
+                (intern_id, period, key),
+                {
+                    "intern_id": intern_id,
+                    "period": period,
+                    "key": key,
+                    "total_hours": 0.0,
+                    "days": 0,
+                },
+            )
+            rollup["total_hours"] += hours
+            rollup["days"] += 1
+            rollup["updated_at"] = now
+
+    async def for_intern(self, intern_id: str, keys: dict) -> dict:
+        rollups = {}
+        for period, key in keys.items():
+            rollup = self.engine.rollup_buckets.get((intern_id, period, key))
+            if rollup:
+                rollups[period] = dict(rollup)
+        return rollups
+
+    async def replace_all(self, rollups: list):
+        self.engine.rollup_buckets = {
+            (rollup["intern_id"], rollup["period"], rollup["key"]): dict(rollup)
+            for rollup in rollups
+        }
+
+
+class MemoryVersionRepository(base.VersionRepository):
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def get(self, key: str) -> int:
+        return self.engine.versions_by_key.get(key, 0)
+
+    async def bump(self, keys: list):
+        for key in keys:
+            self.engine.versions_by_key[key] = (
+                self.engine.versions_by_key.get(key, 0) + 1
+            )
+
+
+class MemoryEngine(base.StorageEngine):
+    """Process-local dict storage for tests, benchmarks and local development.
+
+    Data is lost on restart and is not shared between workers.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self.users_by_email = {}
+        self.records_by_intern = {}
+        self.records_by_date = {}
+        self.rollup_buckets = {}
+        self.versions_by_key = {}
+        self.users = MemoryUserRepository(self)
+        self.records = MemoryRecordRepository(self)
+        self.rollups = MemoryRollupRepository(self)
+        self.versions = MemoryVersionRepository(self)
@@ -0,0 +1,21 @@
+"""
+One-off index migration: create every index declared in
+app.database.mongodb.INDEXES. Safe to re-run; existing indexes are kept.
+
+    python -m app.database.migrate
+"""
+
+import asyncio
+
+from app.database import mongodb
+
+
+async def main():
+    created = await mongodb.create_indexes()
+    for collection_name, index_names in created.items():
+        print(f"{collection_name}: {', '.join(index_names)}")
+    await mongodb.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,624 @@
+import asyncio
+import time
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import (
+    BulkWriteError,
+    CollectionInvalid,
+    DuplicateKeyError,
+    OperationFailure,
+)
+
+from app.database import base, mongodb
+from app.database.base import RecordExists, rollup_keys
+from app.database.mongodb import (
+    COLLECTION_ARCHIVE_CATALOG,
+    COLLECTION_USERS,
+    COLLECTION_RECORDS,
+    COLLECTION_ROLLUPS,
+    COLLECTION_VERSIONS,
+)
+
+DUPLICATE_KEY = 11000
+
+
+def date_range_filter(date_from: str = None, date_to: str = None):
+    """Build a `date` condition from optional inclusive YYYY-MM-DD bounds"""
+    condition = {}
+    if date_from:
+        condition["$gte"] = date_from
+    if date_to:
+        condition["$lte"] = date_to
+    return condition or None
+
+
+def projection(fields=None, exclude=None):
+    """Find projection: only `fields` (plus `_id`) when given, else all but `exclude`"""
+    if fields is not None:
+        return dict.fromkeys(fields, 1)
+    return dict.fromkeys(exclude, 0) if exclude else None
+
+
+class MongoRepository:
+    """Base for the Mongo repositories; the collection is resolved on use so
+    building an engine never opens a connection"""
+
+    def __init__(self, engine, collection_name: str):
+        self.engine = engine
+        self.collection_name = collection_name
+
+    @property
+    def collection(self):
+        return self.engine.database[self.collection_name]
+
+
+class MongoUserRepository(MongoRepository, base.UserRepository):
+    """Async data access for the users collection"""
+
+    async def find_by_email(self, email: str):
+        return await self.collection.find_one({"email": email})
+
+    async def exists(self, email: str) -> bool:
+        # Covered by the unique email index: no document is fetched
+        return (
+            await self.collection.find_one({"email": email}, {"_id": 0, "email": 1})
+            is not None
+        )
+
+    async def insert(self, user_data: dict):
+        result = await self.collection.insert_one(user_data)
+        return result.inserted_id
+
+    async def list_with_records(
+        self,
+        role: str,
+        date_from: str = None,
+        date_to: str = None,
+        after: str = None,
+        limit: int = None,
+        fields: list = None,
+        record_fields: list = None,
+    ):
+        """Users of a role joined with their time records in a single aggregation.
+
+        Users are ordered by email; `after` is the last email of the previous
+        page (keyset pagination on the unique email index).
+        """
+        lookup = {
+            "from": COLLECTION_RECORDS,
+            "localField": "email",
+            "foreignField": "intern_id",
+            "as": "records",
+        }
+        date_range = date_range_filter(date_from, date_to)
+        if date_range:
+            lookup["pipeline"] = [{"$match": {"date": date_range}}]
+            if record_fields is not None:
+                lookup["pipeline"].append({"$project": projection(record_fields)})
+
+        match = {"role": role}
+        if after:
+            match["email"] = {"$gt": after}
+
+        pipeline = [{"$match": match}, {"$sort": {"email": 1}}]
+        if limit:
+            pipeline.append({"$limit": limit})
+        pipeline.append({"$lookup": lookup})
+        if record_fields is not None and not date_range:
+            # Trim the joined records before they leave the server
+            pipeline.append(
+                {
+                    "$set": {
+                        "records": {
+                            "$map": {
+                                "input": "$records",
+                                "as": "record",
+                                "in": {
+                                    field: f"$$record.{field}"
+                                    for field in ["_id", *record_fields]
+                                },
+                            }
+                        }
+                    }
+                }
+            )
+        user_projection = projection(fields, exclude=["password"])
+        if fields is not None:
+            user_projection["records"] = 1
+        pipeline.append({"$project": user_projection})
+        users = await self.collection.aggregate(pipeline).to_list(length=None)
+
+        archives = [
+            (collection, condition)
+            for collection, condition in await self.engine.records.sources(
+                date_from, date_to
+            )
+            if collection.name != COLLECTION_RECORDS
+        ]
+        if archives and users:
+            await self._add_archived_records(users, archives, record_fields)
+        return users
+
+    async def _add_archived_records(
+        self, users: list, archives: list, record_fields: list
+    ):
+        """Put the users' archived records ahead of the joined hot ones.
+
+        Archived days are all older than hot ones, so date order holds. A day
+        still in both places while archival runs is kept once (same _id).
+        """
+        fields = None if record_fields is None else ["intern_id", *record_fields]
+        archived = {}
+        for collection, condition in archives:
+            query = {"intern_id": {"$in": [user["email"] for user in users]}}
+            if condition:
+                query["date"] = condition
+            async for record in collection.find(query, projection(fields)).sort(
+                "date", 1
+            ):
+                intern_id = (
+                    record["intern_id"] if fields is None else record.pop("intern_id")
+                )
+                archived.setdefault(intern_id, []).append(record)
+
+        for user in users:
+            records = archived.get(user["email"])
+            if records:
+                ids = {record["_id"] for record in records}
+                user["records"] = records + [
+                    record for record in user["records"] if record["_id"] not in ids
+                ]
+
+    async def list_by_emails(self, emails: list, role: str = None, fields: list = None):
+        """Batch-fetch users by email, without their password hash"""
+        query = {"email": {"$in": emails}}
+        if role:
+            query["role"] = role
+        return await self.collection.find(
+            query, projection(fields, exclude=["password"])
+        ).to_list(length=None)
+
+    async def set_password(self, email: str, password_hash: str):
+        await self.collection.update_one(
+            {"email": email}, {"$set": {"password": password_hash}}
+        )
+
+    async def set_approval(self, email: str, approval: str) -> bool:
+        result = await self.collection.update_one(
+            {"email": email}, {"$set": {"approval": approval}}
+        )
+        return result.matched_count > 0
+
+    async def set_approvals(self, approvals: dict) -> set:
+        """Apply {email: approval} in one bulk_write; returns the emails that exist.
+
+        bulk_write only reports totals, so existing emails are resolved with
+        one $in query first to give per-item results.
+        """
+        existing = {
+            user["email"]
+            async for user in self.collection.find(
+                # Covered by the unique email index
+                {"email": {"$in": list(approvals)}},
+                {"_id": 0, "email": 1},
+            )
+        }
+        operations = [
+            UpdateOne({"email": email}, {"$set": {"approval": approvals[email]}})
+            for email in existing
+        ]
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+        return existing
+
+
+class MongoRecordRepository(MongoRepository, base.RecordRepository):
+    """Async data access for daily_time_records and its monthly archives.
+
+    Records dated before the catalog's `before` boundary live in one
+    collection per month (see archive_before). Reads consult the catalog
+    and only query the archive months their date range overlaps.
+    """
+
+    def __init__(self, engine, collection_name: str):
+        super().__init__(engine, collection_name)
+        self._catalog = None
+        self._catalog_expires = 0.0
+
+    def archive(self, month: str):
+        return self.engine.database[mongodb.archive_collection_name(month)]
+
+    async def archive_catalog(self) -> dict:
+        """{"before": first date kept hot (None before any archival), "months": archived
+        YYYY-MM}, re-read at most every ARCHIVE_CATALOG_TTL seconds"""
+        now = time.monotonic()
+        if self._catalog is None or now >= self._catalog_expires:
+            catalog = await self.engine.database[COLLECTION_ARCHIVE_CATALOG].find_one(
+                {"_id": "archive"}
+            )
+            self._catalog = {
+                "before": catalog["before"] if catalog else None,
+                "months": sorted(catalog["months"]) if catalog else [],
+            }
+            self._catalog_expires = now + mongodb.ARCHIVE_CATALOG_TTL
+        return self._catalog
+
+    async def sources(self, date_from: str = None, date_to: str = None) -> list:
+        """(collection, date condition) pairs that hold a date range, oldest first"""
+        catalog = await self.archive_catalog()
+        before = catalog["before"]
+        if not before:
+            return [(self.collection, date_range_filter(date_from, date_to))]
+
+        sources = []
+        if not date_from or date_from < before:
+            sources += [
+                (self.archive(month), date_range_filter(date_from, date_to))
+                for month in catalog["months"]
+                if (not date_to or f"{month}-01" <= date_to)
+                and (not date_from or date_from <= f"{month}-31")
+            ]
+        if not date_to or date_to >= before:
+            # Archived days are read from the archive even while their hot
+            # copies wait to be deleted
+            sources.append(
+                (
+                    self.collection,
+                    date_range_filter(max(date_from or before, before), date_to),
+                )
+            )
+        return sources
+
+    async def source_for_day(self, date: str):
+        catalog = await self.archive_catalog()
+        if (
+            catalog["before"]
+            and date < catalog["before"]
+            and date[:7] in catalog["months"]
+        ):
+            return self.archive(date[:7])
+        return self.collection
+
+    async def find_for_day(self, intern_id: str, date: str, fields: list = None):
+        collection = await self.source_for_day(date)
+        return await collection.find_one(
+            {"intern_id": intern_id, "date": date}, projection(fields)
+        )
+
+    async def start_day(self, intern_id: str, date: str, clock_in):
+        """Open the day's record in one round trip and return it.
+
+        Raises RecordExists if the intern already clocked in that day: the
+        upsert then collides with the (intern_id, date) unique index.
+        """
+        try:
+            return await self.collection.find_one_and_update(
+                {"intern_id": intern_id, "date": date, "clock_in": None},
+                {
+                    "$set": {"clock_in": clock_in, "status": "Active"},
+                    "$setOnInsert": {"created_at": clock_in},
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            raise RecordExists()
+
+    async def start_days(self, entries: list) -> list:
+        """All the upserts of start_day in one unordered bulk_write.
+
+        Entries that hit the (intern_id, date) unique index come back as
+        RecordExists without failing the rest of the batch.
+        """
+        # Ids are picked here so each inserted record is known without a read
+        ids = [ObjectId() for _ in entries]
+        operations = [
+            UpdateOne(
+                {"intern_id": intern_id, "date": date, "clock_in": None},
+                {
+                    "$set": {"clock_in": clock_in, "status": "Active"},
+                    "$setOnInsert": {"_id": _id, "created_at": clock_in},
+                },
+                upsert=True,
+            )
+            for _id, (intern_id, date, clock_in) in zip(ids, entries)
+        ]
+        try:
+            result = await self.collection.bulk_write(operations, ordered=False)
+            result = result.bulk_api_result
+        except BulkWriteError as error:
+            result = error.details
+
+        # Each failed entry gets its own error; the rest of the batch stands
+        failed = {
+            error["index"]: (
+                RecordExists()
+                if error["code"] == DUPLICATE_KEY
+                else OperationFailure(error["errmsg"], error["code"], error)
+            )
+            for error in result.get("writeErrors", ())
+        }
+        inserted = {upserted["_id"] for upserted in result.get("upserted", ())}
+
+        results = []
+        for index, (_id, (intern_id, date, clock_in)) in enumerate(zip(ids, entries)):
+            if index in failed:
+                results.append(failed[index])
+            elif _id in inserted:
+                results.append(
+                    {
+                        "_id": _id,
+                        "intern_id": intern_id,
+                        "date": date,
+                        "clock_in": clock_in,
+                        "status": "Active",
+                        "created_at": clock_in,
+                    }
+                )
+            else:
+                # An existing record without clock_in was updated in place
+                results.append(
+                    await self.collection.find_one(
+                        {"intern_id": intern_id, "date": date}
+                    )
+                )
+        return results
+
+    async def finish_day(self, intern_id: str, date: str, clock_out):
+        """Close the day's open record in one round trip and return it.
+
+        total_work_hours is computed server-side from the stored clock_in.
+        Returns None when there is no open record to close.
+        """
+        hours = {"$divide": [{"$subtract": [clock_out, "$clock_in"]}, 3600000]}
+        # Round half up to two places
+        rounded_hours = {
+            "$divide": [{"$trunc": {"$add": [{"$multiply": [hours, 100]}, 0.5]}}, 100]
+        }
+        return await self.collection.find_one_and_update(
+            {
+                "intern_id": intern_id,
+                "date": date,
+                "clock_in": {"$ne": None},
+                "clock_out": None,
+            },
+            [
+                {
+                    "$set": {
+                        "clock_out": clock_out,
+                        "total_work_hours": rounded_hours,
+                        "status": "Completed",
+                    }
+                }
+            ],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def list_active_for_day(self, date: str, fields: list = None):
+        """Records still clocked in on a day, served by the (date, status) index"""
+        collection = await self.source_for_day(date)
+        return await collection.find(
+            {"date": date, "status": "Active"}, projection(fields)
+        ).to_list(length=None)
+
+    async def iter_records(
+        self,
+        date_from: str = None,
+        date_to: str = None,
+        intern_id: str = None,
+        status: str = None,
+        batch_size: int = 1000,
+        fields: list = None,
+    ):
+        """All matching records, fetched from the server in batches: the
+        archive months the range needs first, then the hot collection, each
+        sorted by (intern_id, date)"""
+        for collection, date_range in await self.sources(date_from, date_to):
+            query = {}
+            if date_range:
+                query["date"] = date_range
+            if intern_id:
+                query["intern_id"] = intern_id
+            if status:
+                query["status"] = status
+
+            cursor = (
+                collection.find(query, projection(fields))
+                .sort([("intern_id", 1), ("date", 1)])
+                .batch_size(batch_size)
+            )
+            async for record in cursor:
+                yield record
+
+    async def list_for_intern(
+        self,
+        intern_id: str,
+        date_from: str = None,
+        date_to: str = None,
+        after: str = None,
+        limit: int = None,
+        fields: list = None,
+    ):
+        """An intern's records ordered by date, walked with the (intern_id, date) index.
+
+        `after` is the last date of the previous page (keyset pagination).
+        Archive months are read oldest first and the walk stops as soon as
+        the page is full.
+        """
+        records = []
+        for collection, date_range in await self.sources(date_from, date_to):
+            query = {"intern_id": intern_id}
+            date_condition = dict(date_range or {})
+            if after:
+                date_condition["$gt"] = after
+            if date_condition:
+                query["date"] = date_condition
+
+            cursor = collection.find(query, projection(fields)).sort("date", 1)
+            if limit:
+                cursor = cursor.limit(limit - len(records))
+            records += await cursor.to_list(length=None)
+            if limit and len(records) >= limit:
+                break
+        return records
+
+    async def archive_before(
+        self, before: str, compressor: str = None, wait: float = 0
+    ) -> dict:
+        """Move records dated before `before` into daily_time_records_YYYY_MM
+        collections, compressed with `compressor` (zstd, zlib, snappy) if set.
+
+        Safe to re-run after a failure: copies are idempotent and the hot
+        records are only deleted once every month is copied and the new
+        boundary is published.
+        """
+        if not before.endswith("-01"):
+            raise ValueError("The archive boundary must be the first day of a month")
+
+        dates = await self.collection.distinct("date", {"date": {"$lt": before}})
+        months = sorted({date[:7] for date in dates})
+        moved = {}
+        for month in months:
+            archive = await self._create_archive(month, compressor)
+            moved[month] = await self._copy_month(month, archive)
+
+        await self.engine.database[COLLECTION_ARCHIVE_CATALOG].update_one(
+            {"_id": "archive"},
+            {"$max": {"before": before}, "$addToSet": {"months": {"$each": months}}},
+            upsert=True,
+        )
+        self._catalog = None
+        # Other processes read the hot copies until their catalog expires
+        await asyncio.sleep(wait)
+        await self.collection.delete_many({"date": {"$lt": before}})
+        return moved
+
+    async def _create_archive(self, month: str, compressor: str = None):
+        database = self.engine.database
+        name = mongodb.archive_collection_name(month)
+        if compressor and not await database.list_collection_names(
+            filter={"name": name}
+        ):
+            try:
+                # Compression is set when the collection is created
+                await database.create_collection(
+                    name,
+                    storageEngine={
+                        "wiredTiger": {"configString": f"block_compressor={compressor}"}
+                    },
+                )
+            except CollectionInvalid:
+                pass
+        archive = database[name]
+        await archive.create_index(
+            [("intern_id", ASCENDING), ("date", ASCENDING)], unique=True
+        )
+        return archive
+
+    async def _copy_month(self, month: str, archive, batch_size: int = 1000) -> int:
+        """Copy a month's hot records (with their _id) into its archive"""
+        copied, batch = 0, []
+        cursor = self.collection.find(
+            {"date": {"$gte": f"{month}-01", "$lte": f"{month}-31"}}
+        ).batch_size(batch_size)
+        async for record in cursor:
+            batch.append(record)
+            if len(batch) == batch_size:
+                copied += await self._insert_archived(archive, batch)
+                batch = []
+        if batch:
+            copied += await self._insert_archived(archive, batch)
+        return copied
+
+    @staticmethod
+    async def _insert_archived(archive, records: list) -> int:
+        try:
+            await archive.insert_many(records, ordered=False)
+        except BulkWriteError as error:
+            # Records already copied by an earlier, interrupted run
+            if any(e["code"] != DUPLICATE_KEY for e in error.details["writeErrors"]):
+                raise
+        return len(records)
+
+
+class MongoRollupRepository(MongoRepository, base.RollupRepository):
+    """Per-intern hour totals by period, kept in step with clock_out"""
+
+    async def add_day(self, intern_id: str, date: str, hours: float):
+        """Add one completed day to the intern's total, week and month buckets"""
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"intern_id": intern_id, "period": period, "key": key},
+                {
+                    "$inc": {"total_hours": hours, "days": 1},
+                    "$set": {"updated_at": now},
+                },
+                upsert=True,
+            )
+            for period, key in rollup_keys(date).items()
+        ]
+        await self.collection.bulk_write(operations, ordered=False)
+
+    async def for_intern(self, intern_id: str, keys: dict) -> dict:
+        """The intern's buckets for the given {period: key}, in one query"""
+        rollups = {}
+        async for rollup in self.collection.find(
+            {"intern_id": intern_id, "key": {"$in": list(keys.values())}}
+        ):
+            if keys.get(rollup["period"]) == rollup["key"]:
+                rollups[rollup["period"]] = rollup
+        return rollups
+
+    async def replace_all(self, rollups: list):
+        await self.collection.delete_many({})
+        if rollups:
+            await self.collection.insert_many(rollups)
+
+
+class MongoVersionRepository(MongoRepository, base.VersionRepository):
+    """Async data access for the dtr_versions collection, keyed by _id"""
+
+    async def get(self, key: str) -> int:
+        version = await self.collection.find_one({"_id": key})
+        return version["version"] if version else 0
+
+    async def bump(self, keys: list):
+        await self.collection.bulk_write(
+            [
+                UpdateOne({"_id": key}, {"$inc": {"version": 1}}, upsert=True)
+                for key in keys
+            ],
+            ordered=False,
+        )
+
+
+class MongoEngine(base.StorageEngine):
+    """MongoDB storage through Motor"""
+
+    name = "mongodb"
+
+    def __init__(self, database=None):
+        # Pass a database to pin one (e.g. a test stand-in); by default the
+        # process-wide Motor client from app.database.mongodb is used
+        self._database = database
+        self.users = MongoUserRepository(self, COLLECTION_USERS)
+        self.records = MongoRecordRepository(self, COLLECTION_RECORDS)
+        self.rollups = MongoRollupRepository(self, COLLECTION_ROLLUPS)
+        self.versions = MongoVersionRepository(self, COLLECTION_VERSIONS)
+
+    @property
+    def database(self):
+        if self._database is not None:
+            return self._database
+        return mongodb.get_database()
+
+    async def connect(self):
+        if self._database is None:
+            await mongodb.connect()
+
+    async def close(self):
+        if self._database is None:
+            await mongodb.close()
@@ -1,9 +1,16 @@
+import asyncio
+import logging
 import os
-from pymongo import MongoClient
+from pymongo import ASCENDING, IndexModel, MongoClient, monitoring
+from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 
+from app import metrics
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # MongoDB configuration
 MONGODB_URL = os.getenv(
     "MONGODB_URL",
@@ -11,32 +18,209 @@ MONGODB_URL = os.getenv(
 )
 DATABASE_NAME = os.getenv("DATABASE_NAME", "demo_app")
 
+# Connection pool settings
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+MONGODB_MAX_IDLE_TIME_MS = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "60000"))
+MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(
+    os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000")
+)
+MONGODB_CONNECT_TIMEOUT_MS = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000"))
+MONGODB_SOCKET_TIMEOUT_MS = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "30000"))
+MONGODB_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+
+# Create missing indexes in the background at startup. Turn off when indexes
+# are managed with `python -m app.database.migrate` instead.
+MONGODB_ENSURE_INDEXES = os.getenv("MONGODB_ENSURE_INDEXES", "true").lower() == "true"
+
 # Collections
 COLLECTION_USERS = "users"
 COLLECTION_RECORDS = "daily_time_records"
+COLLECTION_ROLLUPS = "dtr_rollups"
+# Change counters behind the read endpoints' ETags, one document per key
+COLLECTION_VERSIONS = "dtr_versions"
+# Which months of daily_time_records were moved to archive collections
+COLLECTION_ARCHIVE_CATALOG = "dtr_archive_catalog"
 
-# Initialize MongoDB client
-client = MongoClient(MONGODB_URL)
-db = client[DATABASE_NAME]
+# Archival (python -m app.database.archive): records older than this many
+# days move, a whole month at a time, to daily_time_records_YYYY_MM
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+# WiredTiger block compressor for archive collections (zstd, zlib, snappy, none)
+ARCHIVE_COMPRESSOR = os.getenv("ARCHIVE_COMPRESSOR", "zstd")
+# Seconds each process reuses the archive catalog before re-reading it
+ARCHIVE_CATALOG_TTL = float(os.getenv("ARCHIVE_CATALOG_TTL", "30"))
+
+
+def archive_collection_name(month: str) -> str:
+    """Archive collection for a YYYY-MM month"""
+    return f"{COLLECTION_RECORDS}_{month.replace('-', '_')}"
+
+
+# Indexes per collection
+INDEXES = {
+    COLLECTION_USERS: [
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("role", ASCENDING)]),
+    ],
+    COLLECTION_RECORDS: [
+        IndexModel([("intern_id", ASCENDING), ("date", ASCENDING)], unique=True),
+        IndexModel([("intern_id", ASCENDING)]),
+        IndexModel([("date", ASCENDING)]),
+        IndexModel([("status", ASCENDING)]),
+        IndexModel([("date", ASCENDING), ("status", ASCENDING)]),
+    ],
+    COLLECTION_ROLLUPS: [
+        IndexModel(
+            [("intern_id", ASCENDING), ("period", ASCENDING), ("key", ASCENDING)],
+            unique=True,
+        ),
+    ],
+}
+
+# The Motor client is created per process, by the app lifespan (after any
+# fork) or lazily on first use, never at import time.
+client = None
+_index_task = None
+
+
+mongodb_command_duration = metrics.registry.histogram(
+    "mongodb_command_duration_seconds", "MongoDB command round-trip time", ("command",)
+)
+mongodb_command_failures = metrics.registry.counter(
+    "mongodb_command_failures_total",
+    "MongoDB commands that returned an error",
+    ("command",),
+)
+mongodb_pool_connections = metrics.registry.gauge(
+    "mongodb_pool_connections", "Pooled MongoDB connections by state", ("state",)
+)
+mongodb_pool_checkout_duration = metrics.registry.histogram(
+    "mongodb_pool_checkout_duration_seconds", "Time waiting for a pooled connection"
+)
+mongodb_pool_checkout_failures = metrics.registry.counter(
+    "mongodb_pool_checkout_failures_total",
+    "Connection checkouts that failed",
+    ("reason",),
+)
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Times every command the driver sends; runs on the driver's threads"""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        mongodb_command_duration.observe(
+            event.duration_micros / 1e6, event.command_name
+        )
+
+    def failed(self, event):
+        mongodb_command_duration.observe(
+            event.duration_micros / 1e6, event.command_name
+        )
+        mongodb_command_failures.inc(event.command_name)
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Open and checked-out connection counts, and checkout wait time"""
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        mongodb_pool_connections.inc("open")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        mongodb_pool_connections.dec("open")
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        mongodb_pool_checkout_duration.observe(event.duration)
+        mongodb_pool_checkout_failures.inc(event.reason)
+
+    def connection_checked_out(self, event):
+        mongodb_pool_checkout_duration.observe(event.duration)
+        mongodb_pool_connections.inc("checked_out")
+
+    def connection_checked_in(self, event):
+        mongodb_pool_connections.dec("checked_out")
+
+
+def client_options() -> dict:
+    options = {
+        "maxPoolSize": MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGODB_MAX_IDLE_TIME_MS,
+        "serverSelectionTimeoutMS": MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGODB_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": MONGODB_SOCKET_TIMEOUT_MS,
+        "waitQueueTimeoutMS": MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+    }
+    if metrics.METRICS_ENABLED:
+        options["event_listeners"] = [CommandMetrics(), PoolMetrics()]
+    return options
+
+
+def get_client():
+    global client
+    if client is None:
+        client = AsyncIOMotorClient(MONGODB_URL, **client_options())
+    return client
+
+
+def get_database():
+    return get_client()[DATABASE_NAME]
+
+
+def get_sync_database(name: str = None):
+    """Blocking PyMongo handle for scripts and benchmarks, not request handlers"""
+    return MongoClient(MONGODB_URL, **client_options())[name or DATABASE_NAME]
+
+
+async def create_indexes(db=None):
+    """Create necessary indexes for the collections (idempotent)"""
+    db = db if db is not None else get_database()
+    created = {}
+    for collection_name, indexes in INDEXES.items():
+        created[collection_name] = await db[collection_name].create_indexes(indexes)
+    return created
 
-# Collections
-users_collection = db[COLLECTION_USERS]
-records_collection = db[COLLECTION_RECORDS]
 
+async def _ensure_indexes():
+    try:
+        await create_indexes()
+    except Exception:
+        logger.exception("Creating MongoDB indexes failed")
 
-# Create indexes for better performance
-def create_indexes():
-    """Create necessary indexes for the collections"""
-    # Users collection indexes
-    users_collection.create_index("email", unique=True)
-    users_collection.create_index("role")
 
-    # Records collection indexes
-    records_collection.create_index([("intern_id", 1), ("date", 1)], unique=True)
-    records_collection.create_index("intern_id")
-    records_collection.create_index("date")
-    records_collection.create_index("status")
+async def connect():
+    """Open this process's client; index creation runs in the background"""
+    global _index_task
+    get_client()
+    if MONGODB_ENSURE_INDEXES:
+        _index_task = asyncio.create_task(_ensure_indexes())
 
 
-# Initialize indexes when module is imported
-create_indexes()
+async def close():
+    global client, _index_task
+    if _index_task is not None:
+        _index_task.cancel()
+        _index_task = None
+    if client is not None:
+        client.close()
+        client = None
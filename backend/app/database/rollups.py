@@ -0,0 +1,46 @@
+"""
+Rebuild the dtr_rollups collection from daily_time_records.
+
+clock_out keeps the rollups current; run this once to backfill existing
+history, or to repair drift:
+
+    python -m app.database.rollups
+"""
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+
+from app.database.base import rollup_keys
+from app.database.storage import storage
+
+
+async def rebuild_rollups() -> int:
+    """Recompute every rollup from completed records; returns the bucket count"""
+    totals = defaultdict(lambda: {"total_hours": 0.0, "days": 0})
+
+    async for record in storage.records.iter_records(status="Completed"):
+        for period, key in rollup_keys(record["date"]).items():
+            bucket = totals[(record["intern_id"], period, key)]
+            bucket["total_hours"] += record.get("total_work_hours") or 0.0
+            bucket["days"] += 1
+
+    now = datetime.utcnow()
+    await storage.rollups.replace_all(
+        [
+            {
+                "intern_id": intern_id,
+                "period": period,
+                "key": key,
+                "updated_at": now,
+                **bucket,
+            }
+            for (intern_id, period, key), bucket in totals.items()
+        ]
+    )
+    return len(totals)
+
+
+if __name__ == "__main__":
+    count = asyncio.run(rebuild_rollups())
+    print(f"Rebuilt {count} rollup buckets")
@@ -0,0 +1,72 @@
+import os
+
+from dotenv import load_dotenv
+
+from app.database.base import StorageEngine
+from app.database.dynamo_engine import DynamoEngine
+from app.database.memory_engine import MemoryEngine
+from app.database.mongo_engine import MongoEngine
+
+load_dotenv()
+
+# mongodb | dynamodb | memory
+STORAGE_ENGINE = os.getenv("STORAGE_ENGINE", "mongodb")
+
+ENGINES = {
+    MongoEngine.name: MongoEngine,
+    DynamoEngine.name: DynamoEngine,
+    MemoryEngine.name: MemoryEngine,
+}
+
+
+def create_engine(name: str = STORAGE_ENGINE) -> StorageEngine:
+    try:
+        return ENGINES[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown STORAGE_ENGINE {name!r}, expected one of {', '.join(ENGINES)}"
+        )
+
+
+class Storage:
+    """The active storage engine. Handlers go through `storage.users`,
+    `storage.records`, `storage.rollups` and `storage.versions` so the
+    engine can be swapped by config (or by tests with `storage.use(...)`)."""
+
+    def __init__(self):
+        self.engine = None
+
+    def use(self, engine: StorageEngine) -> StorageEngine:
+        self.engine = engine
+        return engine
+
+    def _engine(self) -> StorageEngine:
+        if self.engine is None:
+            self.engine = create_engine()
+        return self.engine
+
+    @property
+    def users(self):
+        return self._engine().users
+
+    @property
+    def records(self):
+        return self._engine().records
+
+    @property
+    def rollups(self):
+        return self._engine().rollups
+
+    @property
+    def versions(self):
+        return self._engine().versions
+
+    async def connect(self):
+        await self._engine().connect()
+
+    async def close(self):
+        if self.engine is not None:
+            await self.engine.close()
+
+
+storage = Storage()
@@ -0,0 +1,87 @@
+"""
+In-process event bus for live dashboard updates.
+
+clock_in/clock_out publish here and every subscriber (one per connected
+/api/interns/events stream) gets its own bounded queue. Publishing never
+waits on a subscriber: when a slow client's queue is full its oldest event
+is dropped and the client is told to resync (refetch) instead.
+
+The bus lives in one process, so with several workers each stream only
+sees the clock events handled by its own worker.
+"""
+
+import asyncio
+import itertools
+import os
+
+from dotenv import load_dotenv
+
+from app import metrics
+
+load_dotenv()
+
+# Events buffered per subscriber before the oldest are dropped
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+# Seconds between keep-alive comments on idle streams (proxies drop silent connections)
+EVENTS_HEARTBEAT = float(os.getenv("EVENTS_HEARTBEAT", "15"))
+
+events_subscribers = metrics.registry.gauge(
+    "events_subscribers", "Connected live event streams"
+)
+events_published = metrics.registry.counter(
+    "events_published_total", "Events published to the bus", ("type",)
+)
+events_dropped = metrics.registry.counter(
+    "events_dropped_total", "Events dropped because a subscriber's queue was full"
+)
+
+
+class Subscription:
+    """One subscriber's bounded queue. `lagged` is set when events were dropped."""
+
+    def __init__(self, max_size: int):
+        self.queue = asyncio.Queue(max_size)
+        self.lagged = False
+
+    def offer(self, event: dict):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.lagged = True
+            events_dropped.inc()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float = None):
+        """Next event, or None when `timeout` passes first"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    def __init__(self, queue_size: int = EVENTS_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.subscriptions = set()
+        self._ids = itertools.count(1)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        self.subscriptions.add(subscription)
+        events_subscribers.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+            events_subscribers.dec()
+
+    def publish(self, event_type: str, data: dict) -> dict:
+        """Fan an event out to every subscriber without awaiting any of them"""
+        event = {"id": next(self._ids), "type": event_type, "data": data}
+        for subscription in self.subscriptions:
+            subscription.offer(event)
+        events_published.inc(event_type)
+        return event
+
+
+event_bus = EventBus()
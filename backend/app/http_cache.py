@@ -0,0 +1,97 @@
+"""
+Conditional GETs (ETag / If-None-Match) for the dashboard's read endpoints.
+
+Writes bump a counter in `storage.versions` for what they change: INTERNS
+for the admin lists, records_key(email) for one intern's records. A read
+fetches its counter first and tags the response with an ETag derived from
+it and the request; a client whose If-None-Match still matches gets a 304
+before the query runs. The counters live in the database, so every worker
+and replica agrees on them, and writes bump them only once stored: a read
+racing a write can at worst send a 200 it could have skipped, never a
+stale 304.
+
+A bump that still fails after a retry is logged and counted but does not
+fail the write, which is already stored: answering 500 would only make the
+client retry into "already clocked in". Until the key's next bump, clients
+holding its old ETag may get a stale 304.
+
+ETags are weak (W/), since the same JSON may go out compressed or not.
+"""
+
+import hashlib
+import logging
+
+from fastapi import HTTPException, Request, Response
+
+from app import metrics
+from app.database.storage import storage
+
+# Version key of the admin lists (/interns, /interns/active_today)
+INTERNS = "interns"
+# Clients must revalidate every time; the responses are per user
+CACHE_CONTROL = "private, no-cache"
+
+logger = logging.getLogger(__name__)
+
+bump_failures = metrics.registry.counter(
+    "http_cache_bump_failures_total", "ETag version bumps that failed after a retry"
+)
+
+conditional_requests = metrics.registry.counter(
+    "http_conditional_requests_total",
+    "ETag-validated reads by outcome (not_modified, modified)",
+    ("result",),
+)
+
+
+def records_key(intern_id: str) -> str:
+    """Version key of one intern's records (/dtr/record)"""
+    return f"records:{intern_id}"
+
+
+def make_etag(version: int, *parts) -> str:
+    """Weak ETag for a counter value and whatever else selects the response"""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).hexdigest()
+    return f'W/"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an ETag against an If-None-Match header"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
+
+
+async def check_etag(request: Request, response: Response, key: str, *parts) -> int:
+    """Answer 304 if the client already has the current response for `key`,
+    else put the ETag on `response`. Returns the counter value, so caches of
+    the result can be keyed on it."""
+    version = await storage.versions.get(key)
+    etag = make_etag(
+        version, request.url.path, sorted(request.query_params.multi_items()), *parts
+    )
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        conditional_requests.inc("not_modified")
+        raise HTTPException(status_code=304, headers=headers)
+
+    conditional_requests.inc("modified")
+    response.headers.update(headers)
+    return version
+
+
+async def bump(*keys: str):
+    """Invalidate the ETags of `keys` after a write"""
+    keys = list(dict.fromkeys(keys))
+    for attempt in range(2):
+        try:
+            return await storage.versions.bump(keys)
+        except Exception:
+            if attempt:
+                bump_failures.inc()
+                logger.exception("Bumping ETag versions %s failed", keys)
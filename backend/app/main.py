@@ -1,9 +1,45 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.auth.routes import router as auth_router
 from app.routes.protected import router as protected_router
+from app.routes.export import router as export_router
+from app.routes.events import router as events_router
+from app.routes.metrics import router as metrics_router
+from app.admission import ADMISSION_MAX_CONCURRENCY, AdmissionMiddleware
+from app.auth.hashing import shutdown_hash_pool
+from app.compression import COMPRESSION_ENABLED, CompressionMiddleware
+from app.database.batching import clock_in_batcher
+from app.database.storage import storage
+from app.metrics import METRICS_ENABLED, MetricsMiddleware
+from app.serialization import ORJSONResponse
 
-app = FastAPI(title="Intern DTR API", version="1.0", root_path="/fastapi")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Each worker opens its own database client here, after any fork
+    await storage.connect()
+    yield
+    # Finish queued clock-ins before the client goes away
+    await clock_in_batcher.drain()
+    await storage.close()
+    shutdown_hash_pool()
+
+
+app = FastAPI(
+    title="Intern DTR API",
+    version="1.0",
+    root_path="/fastapi",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+# Innermost, so compressing counts against the request's admission slot
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+if ADMISSION_MAX_CONCURRENCY:
+    app.add_middleware(AdmissionMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -11,10 +47,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
 app.include_router(protected_router, prefix="/auth")
 app.include_router(auth_router, prefix="/api")
+app.include_router(export_router, prefix="/api")
+app.include_router(events_router, prefix="/api")
 
 
 @app.get("/get_init")
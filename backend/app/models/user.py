@@ -1,6 +1,18 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, EmailStr
+from typing import Annotated, List, Optional
+from pydantic import BaseModel, BeforeValidator, ConfigDict, EmailStr, Field
+
+# Stored ids (ObjectId on Mongo, strings elsewhere) as returned by the API
+ObjectIdStr = Annotated[str, BeforeValidator(str)]
+
+
+def stored_fields(model, exclude=()) -> list:
+    """The stored document fields a response model reads, as a storage projection"""
+    return [
+        field.alias or name
+        for name, field in model.model_fields.items()
+        if name not in exclude
+    ]
 
 
 class UserRegister(BaseModel):
@@ -30,3 +42,56 @@ class DailyTimeRecord(BaseModel):
     break_end: Optional[datetime] = None
     total_work_hours: Optional[float] = 0.0
     status: str = "Active"
+
+
+class DailyTimeRecordOut(DailyTimeRecord):
+    """A stored time record as returned by the API"""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: ObjectIdStr = Field(alias="_id")
+    created_at: Optional[datetime] = None
+
+
+class UserOut(BaseModel):
+    """A stored user as returned by the API; the password hash is never included"""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: ObjectIdStr = Field(alias="_id")
+    email: str
+    name: Optional[str] = None
+    surname: Optional[str] = None
+    role: Optional[str] = None
+    approval: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class InternRecordOut(BaseModel):
+    """A time record listed under its intern on the admin views"""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: ObjectIdStr = Field(alias="_id")
+    date: str
+    clock_in: Optional[datetime] = None
+    clock_out: Optional[datetime] = None
+    total_work_hours: Optional[float] = None
+    status: Optional[str] = None
+
+
+class InternWithRecords(UserOut):
+    records: List[InternRecordOut] = []
+
+
+class Message(BaseModel):
+    message: str
+
+
+class ApprovalUpdate(BaseModel):
+    intern_id: str
+    approval: str
+
+
+class BulkApprovalUpdate(BaseModel):
+    updates: List[ApprovalUpdate] = Field(..., min_length=1, max_length=1000)
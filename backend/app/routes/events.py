@@ -0,0 +1,48 @@
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.events import EVENTS_HEARTBEAT, event_bus
+from app.serialization import dumps
+
+router = APIRouter()
+
+# Tells EventSource clients how long to wait before reconnecting (ms)
+RECONNECT_MS = 3000
+
+
+def _frame(event: dict) -> bytes:
+    # Encoded once per event and shared by every subscriber's stream
+    if "frame" not in event:
+        event["frame"] = (
+            f"id: {event['id']}\nevent: {event['type']}\ndata: ".encode()
+            + dumps(event["data"])
+            + b"\n\n"
+        )
+    return event["frame"]
+
+
+async def _stream(subscription):
+    try:
+        yield f"retry: {RECONNECT_MS}\n\n".encode()
+        while True:
+            event = await subscription.get(timeout=EVENTS_HEARTBEAT)
+            if subscription.lagged:
+                # Events were dropped for this client; it should refetch
+                subscription.lagged = False
+                yield b"event: resync\ndata: {}\n\n"
+            if event is None:
+                yield b": keep-alive\n\n"
+            else:
+                yield _frame(event)
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+@router.get("/interns/events")
+async def intern_events():
+    """Server-sent clock_in / clock_out events for the live admin dashboard"""
+    return StreamingResponse(
+        _stream(event_bus.subscribe()),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,86 @@
+import csv
+import io
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from app.database.storage import storage
+from app.serialization import dumps
+
+router = APIRouter()
+
+# Records pulled from Mongo per round trip, and rows written per chunk
+EXPORT_BATCH_SIZE = 1000
+CSV_FIELDS = [
+    "intern_id",
+    "date",
+    "clock_in",
+    "clock_out",
+    "total_work_hours",
+    "status",
+]
+
+
+async def _ndjson_rows(cursor):
+    lines = []
+    async for record in cursor:
+        lines.append(dumps(record))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+async def _csv_rows(cursor):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_FIELDS)
+    rows = 0
+    async for record in cursor:
+        writer.writerow(
+            [
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in (record.get(field) for field in CSV_FIELDS)
+            ]
+        )
+        rows += 1
+        if rows % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+@router.get("/dtr/export")
+async def export_records(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to"),
+    intern_id: Optional[str] = None,
+    status: Optional[str] = None,
+):
+    """Stream daily time records straight from a Mongo cursor.
+
+    Rows are written as they are read, so memory stays constant no matter
+    how many records match.
+    """
+    cursor = storage.records.iter_records(
+        date_from=date_from,
+        date_to=date_to,
+        intern_id=intern_id,
+        status=status,
+        batch_size=EXPORT_BATCH_SIZE,
+        # CSV has fixed columns, so only those fields are read
+        fields=CSV_FIELDS if format == "csv" else None,
+    )
+
+    if format == "csv":
+        return StreamingResponse(
+            _csv_rows(cursor),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=dtr_export.csv"},
+        )
+    return StreamingResponse(_ndjson_rows(cursor), media_type="application/x-ndjson")
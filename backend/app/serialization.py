@@ -0,0 +1,36 @@
+"""
+JSON encoding shared by API responses and exports.
+
+orjson writes datetimes, dicts and lists natively (in C), and the `default`
+hook below covers what MongoDB and DynamoDB hand back on top of that, so
+documents can be dumped as they come out of storage.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+
+
+def bson_default(value):
+    """orjson `default` for ObjectId, Decimal (DynamoDB numbers) and dates"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, default=bson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(_ORJSONResponse):
+    """FastAPI's ORJSONResponse plus the BSON types above; the app default"""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,85 @@
+"""
+Production server: several uvicorn workers behind one listening socket.
+
+    python -m app.server
+
+One worker per available CPU (the container's CPU quota when there is
+one), or WEB_CONCURRENCY. A bcrypt-heavy login then only occupies its own
+worker while the others keep serving. Workers are separate processes, so
+each opens its own Mongo client in the app lifespan after it starts, and
+in-process state (caches, rate-limit buckets, the live event bus, /metrics)
+is per worker.
+
+On SIGTERM the workers stop accepting connections, finish in-flight
+requests for up to GRACEFUL_TIMEOUT seconds (open SSE streams are cut
+then; EventSource reconnects to another pod) and run the lifespan
+shutdown, which writes queued clock-ins and closes the database client.
+"""
+
+import importlib.util
+import math
+import os
+
+import uvicorn
+from dotenv import load_dotenv
+
+load_dotenv()
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+# Seconds an idle keep-alive connection is held open. Longer than the load
+# balancer's idle timeout (60 s on ALB), so the proxy always closes first
+# and never reuses a connection the server is dropping.
+KEEP_ALIVE = int(os.getenv("KEEP_ALIVE", "75"))
+# Pending connections the kernel queues while every worker is busy
+BACKLOG = int(os.getenv("BACKLOG", "2048"))
+# Seconds to finish in-flight requests after SIGTERM; keep it below the
+# orchestrator's kill timeout (terminationGracePeriodSeconds / stopTimeout)
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", "20"))
+ACCESS_LOG = os.getenv("ACCESS_LOG", "true").lower() == "true"
+
+
+def available_cpus() -> int:
+    """CPUs this process may use: the cgroup quota if set, else its affinity"""
+    cpus = (
+        len(os.sched_getaffinity(0))
+        if hasattr(os, "sched_getaffinity")
+        else os.cpu_count()
+    )
+    try:
+        # cgroup v2: "<quota> <period>", or "max <period>" when unlimited
+        with open("/sys/fs/cgroup/cpu.max") as file:
+            quota, period = file.read().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus or 1)
+
+
+def worker_count() -> int:
+    return int(os.getenv("WEB_CONCURRENCY", "0")) or available_cpus()
+
+
+def main():
+    workers = worker_count()
+    # Split the CPUs between the workers' bcrypt pools instead of giving
+    # every worker one thread per CPU. Workers inherit the environment.
+    os.environ.setdefault("HASH_POOL_SIZE", str(max(1, available_cpus() // workers)))
+
+    uvicorn.run(
+        "app.main:app",
+        host=HOST,
+        port=PORT,
+        workers=workers,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        backlog=BACKLOG,
+        timeout_keep_alive=KEEP_ALIVE,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+        access_log=ACCESS_LOG,
+    )
+
+
+if __name__ == "__main__":
+    main()
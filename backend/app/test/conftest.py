@@ -0,0 +1,31 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+os.environ.setdefault("JWT_SECRET", "test-secret")
+# Cheapest bcrypt cost so register/login in tests stay fast
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from app.database.mongodb import create_indexes  # noqa: E402
+from app.auth import rate_limit  # noqa: E402
+from app.database.cache import profile_cache, read_cache, session_cache  # noqa: E402
+from app.database.mongo_engine import MongoEngine  # noqa: E402
+from app.database.storage import storage  # noqa: E402
+import app.test.mongomock_compat  # noqa: E402,F401
+
+
+@pytest.fixture
+def mock_db(monkeypatch):
+    """Point the storage layer at an in-memory Mongo stand-in"""
+    db = AsyncMongoMockClient()["test_db"]
+    asyncio.run(create_indexes(db))
+    monkeypatch.setattr(storage, "engine", MongoEngine(db))
+    profile_cache.backend.clear()
+    session_cache.backend.clear()
+    read_cache.invalidate()
+    rate_limit.store.clear()
+    return db
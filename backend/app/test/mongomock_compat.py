@@ -0,0 +1,25 @@
+"""
+mongomock patches shared by the test suite and the benchmarks.
+
+Importing this module applies them; it has no other side effects (no
+environment defaults), so benchmarks can use it without the test setup.
+"""
+
+import mongomock.collection
+
+
+def _drop_sort(method):
+    # pymongo >= 4.11 passes `sort` to UpdateOne/ReplaceOne bulk builders,
+    # which mongomock 4.3 does not accept yet
+    def wrapper(self, *args, sort=None, **kwargs):
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+mongomock.collection.BulkOperationBuilder.add_update = _drop_sort(
+    mongomock.collection.BulkOperationBuilder.add_update
+)
+mongomock.collection.BulkOperationBuilder.add_replace = _drop_sort(
+    mongomock.collection.BulkOperationBuilder.add_replace
+)
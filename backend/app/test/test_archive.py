@@ -0,0 +1,167 @@
+from fastapi.testclient import TestClient
+import asyncio
+from datetime import date
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from app.database.archive import archive_boundary
+from app.database.rollups import rebuild_rollups
+from app.database.storage import storage
+from app.main import app
+
+client = TestClient(app)
+
+DATES = [
+    "2025-01-30",
+    "2025-01-31",
+    "2025-02-03",
+    "2025-02-04",
+    "2025-03-03",
+    "2025-03-04",
+]
+
+
+def seed(db, email):
+    asyncio.run(
+        db["daily_time_records"].insert_many(
+            [
+                {
+                    "intern_id": email,
+                    "date": day,
+                    "status": "Completed",
+                    "total_work_hours": 8.0,
+                }
+                for day in DATES
+            ]
+        )
+    )
+
+
+def login(email):
+    client.post(
+        "/api/register",
+        json={
+            "name": "Juan",
+            "surname": "Dela Cruz",
+            "email": email,
+            "role": "Intern",
+            "password": "secret",
+            "approval": "Pending",
+        },
+    )
+    response = client.post("/api/login", json={"email": email, "password": "secret"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def archive(before="2025-03-01"):
+    return asyncio.run(storage.records.archive_before(before))
+
+
+def test_archive_moves_old_months(mock_db):
+    seed(mock_db, "a@example.com")
+
+    assert archive() == {"2025-01": 2, "2025-02": 2}
+
+    async def counts():
+        return {
+            name: await mock_db[name].count_documents({})
+            for name in await mock_db.list_collection_names()
+            if name.startswith("daily_time_records")
+        }
+
+    assert asyncio.run(counts()) == {
+        "daily_time_records": 2,
+        "daily_time_records_2025_01": 2,
+        "daily_time_records_2025_02": 2,
+    }
+    # Re-running finds nothing left to move
+    assert archive() == {}
+
+    with pytest.raises(ValueError):
+        archive("2025-03-15")
+
+
+def test_record_reads_span_archives(mock_db):
+    headers = login("pager@example.com")
+    seed(mock_db, "pager@example.com")
+    archive()
+
+    response = client.get("/api/dtr/record", headers=headers)
+    assert [record["date"] for record in response.json()] == DATES
+
+    # Pages cross from one archive month to the next and into the hot collection
+    pages, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"after": cursor} if cursor else {})}
+        response = client.get("/api/dtr/record", params=params, headers=headers)
+        pages.append([record["date"] for record in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert pages == [DATES[:3], DATES[3:]]
+
+    response = client.get(
+        "/api/dtr/record",
+        params={"from": "2025-01-31", "to": "2025-03-03"},
+        headers=headers,
+    )
+    assert [record["date"] for record in response.json()] == DATES[1:5]
+
+
+def test_hot_ranges_skip_archives(mock_db):
+    seed(mock_db, "a@example.com")
+    archive()
+
+    async def sources():
+        return [
+            collection.name
+            for collection, _ in await storage.records.sources(
+                "2025-03-01", "2025-03-31"
+            )
+        ], [
+            collection.name
+            for collection, _ in await storage.records.sources(
+                "2025-02-10", "2025-03-31"
+            )
+        ]
+
+    hot, spanning = asyncio.run(sources())
+    assert hot == ["daily_time_records"]
+    assert spanning == ["daily_time_records_2025_02", "daily_time_records"]
+
+
+def test_archived_records_in_exports_and_listings(mock_db):
+    seed(mock_db, "a@example.com")
+    asyncio.run(
+        mock_db["users"].insert_one(
+            {"email": "a@example.com", "role": "Intern", "password": "hash"}
+        )
+    )
+    archive()
+
+    interns = client.get("/api/interns").json()
+    assert [record["date"] for record in interns[0]["records"]] == DATES
+
+    record = asyncio.run(storage.records.find_for_day("a@example.com", "2025-01-31"))
+    assert record["total_work_hours"] == 8.0
+
+    # The rollup rebuild walks iter_records, so it sees archived months too
+    asyncio.run(rebuild_rollups())
+    summary = asyncio.run(
+        storage.rollups.for_intern("a@example.com", {"month": "2025-01"})
+    )
+    assert summary["month"]["days"] == 2
+    assert (
+        asyncio.run(storage.rollups.for_intern("a@example.com", {"total": "all"}))[
+            "total"
+        ]["days"]
+        == 6
+    )
+
+
+def test_archive_boundary():
+    assert archive_boundary(date(2025, 9, 15), after_days=180) == "2025-03-01"
+    assert archive_boundary(date(2025, 3, 1), after_days=0) == "2025-03-01"
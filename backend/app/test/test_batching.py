@@ -0,0 +1,79 @@
+import asyncio
+import sys
+import os
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from app.auth import routes
+from app.database.batching import WriteBatcher
+from app.database.base import RecordExists
+from app.main import app
+from app.test.test_dtr import register_and_login
+
+
+def test_batched_clock_ins_answer_each_caller(mock_db, monkeypatch):
+    monkeypatch.setattr(routes, "CLOCK_IN_BATCHING", True)
+    headers = [register_and_login(f"batch{number}@example.com") for number in range(5)]
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as http:
+            # The first intern clocks in twice within the same batch
+            return await asyncio.gather(
+                *(
+                    http.post("/api/dtr/clock_in", headers=h)
+                    for h in [*headers, headers[0]]
+                )
+            )
+
+    responses = asyncio.run(scenario())
+
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200, 200, 200, 200, 200, 400]
+    duplicate = next(response for response in responses if response.status_code == 400)
+    assert duplicate.json()["detail"] == "You have already clocked in today."
+    assert asyncio.run(mock_db["daily_time_records"].count_documents({})) == 5
+
+
+def test_batches_flush_by_size_and_window():
+    batches = []
+
+    async def flush(entries):
+        batches.append(list(entries))
+        return [
+            RecordExists() if entry == "dup" else entry.upper() for entry in entries
+        ]
+
+    async def scenario():
+        batcher = WriteBatcher("test", flush, max_size=3, window=0.01)
+        results = await asyncio.gather(
+            *(batcher.submit(entry) for entry in ["a", "b", "dup", "c"]),
+            return_exceptions=True,
+        )
+        await batcher.drain()
+        return results
+
+    results = asyncio.run(scenario())
+
+    # Three by size, then the last one once the window passed
+    assert batches == [["a", "b", "dup"], ["c"]]
+    assert results[:2] == ["A", "B"] and results[3] == "C"
+    assert isinstance(results[2], RecordExists)
+
+
+def test_failed_batch_fails_every_caller():
+    async def flush(entries):
+        raise ConnectionError("database down")
+
+    async def scenario():
+        batcher = WriteBatcher("test", flush, max_size=10, window=0.01)
+        return await asyncio.gather(
+            *(batcher.submit(entry) for entry in range(3)), return_exceptions=True
+        )
+
+    assert all(
+        isinstance(result, ConnectionError) for result in asyncio.run(scenario())
+    )
@@ -0,0 +1,119 @@
+from fastapi.testclient import TestClient
+import asyncio
+import sys
+import os
+import zlib
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from app.compression import CompressionMiddleware, choose_encoding
+from app.main import app
+
+client = TestClient(app)
+
+
+def seed(db):
+    asyncio.run(
+        db["users"].insert_many(
+            [
+                {
+                    "email": f"intern{n:03d}@example.com",
+                    "role": "Intern",
+                    "password": "hash",
+                    "approval": "Approved",
+                }
+                for n in range(100)
+            ]
+        )
+    )
+
+
+def test_large_responses_are_compressed(mock_db):
+    seed(mock_db)
+    plain = client.get("/api/interns", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    for encoding in ("gzip", "br"):
+        response = client.get("/api/interns", headers={"Accept-Encoding": encoding})
+        assert response.headers["content-encoding"] == encoding
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(plain.content)
+        # httpx decodes the body
+        assert response.content == plain.content
+
+
+def test_small_responses_are_sent_as_is():
+    response = client.get("/get_init", headers={"Accept-Encoding": "gzip, br"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"message": "Welcome to Intern DTR API"}
+
+
+def run(app, accept_encoding="gzip"):
+    """Send one request through `app`; returns the response start and bodies"""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    asyncio.run(app(scope, receive, send))
+    return messages[0], [message["body"] for message in messages[1:]]
+
+
+def streaming_app(content_type, chunks):
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", content_type)],
+            }
+        )
+        for number, chunk in enumerate(chunks):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": number < len(chunks) - 1,
+                }
+            )
+
+    return app
+
+
+def test_streamed_chunks_are_flushed():
+    chunks = [b'{"row": %d}\n' % n * 20 for n in range(3)]
+    start, bodies = run(
+        CompressionMiddleware(streaming_app(b"application/x-ndjson", chunks))
+    )
+
+    assert (b"content-encoding", b"gzip") in start["headers"]
+    assert not any(name == b"content-length" for name, _ in start["headers"])
+    # Every chunk decodes on arrival, without waiting for the end
+    decompressor = zlib.decompressobj(31)
+    for chunk, body in zip(chunks, bodies):
+        assert decompressor.decompress(body) == chunk
+
+
+def test_event_streams_are_not_compressed():
+    chunks = [b"event: ping\ndata: {}\n\n" * 100, b""]
+    start, bodies = run(
+        CompressionMiddleware(streaming_app(b"text/event-stream", chunks))
+    )
+    assert not any(name == b"content-encoding" for name, _ in start["headers"])
+    assert bodies == chunks
+
+
+def test_choose_encoding():
+    available = ["br", "gzip"]
+    assert choose_encoding("gzip, deflate, br", available) == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0.5", available) == "gzip"
+    assert choose_encoding("br;q=0, gzip", available) == "gzip"
+    assert choose_encoding("*", available) == "br"
+    assert choose_encoding("identity", available) is None
+    assert choose_encoding("", available) is None
@@ -0,0 +1,194 @@
+from fastapi.testclient import TestClient
+import asyncio
+import json
+import httpx
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from app.database.rollups import rebuild_rollups
+from app.main import app
+
+client = TestClient(app)
+
+
+def register_and_login(email="intern@example.com"):
+    client.post(
+        "/api/register",
+        json={
+            "name": "Juan",
+            "surname": "Dela Cruz",
+            "email": email,
+            "role": "Intern",
+            "password": "secret",
+            "approval": "Pending",
+        },
+    )
+    response = client.post("/api/login", json={"email": email, "password": "secret"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_clock_in_and_out(mock_db):
+    headers = register_and_login()
+
+    response = client.post("/api/dtr/clock_out", headers=headers)
+    assert response.status_code == 404
+
+    response = client.post("/api/dtr/clock_in", headers=headers)
+    assert response.status_code == 200
+
+    response = client.post("/api/dtr/clock_in", headers=headers)
+    assert response.status_code == 400
+
+    response = client.post("/api/dtr/clock_out", headers=headers)
+    assert response.status_code == 200
+
+    records = client.get("/api/dtr/record", headers=headers).json()
+    assert len(records) == 1
+    assert records[0]["status"] == "Completed"
+
+
+def test_record_pagination(mock_db):
+    headers = register_and_login("pager@example.com")
+    asyncio.run(
+        mock_db["daily_time_records"].insert_many(
+            [
+                {
+                    "intern_id": "pager@example.com",
+                    "date": f"2025-01-0{day}",
+                    "status": "Completed",
+                }
+                for day in range(1, 6)
+            ]
+        )
+    )
+
+    response = client.get(
+        "/api/dtr/record", params={"limit": 2, "from": "2025-01-02"}, headers=headers
+    )
+    assert [record["date"] for record in response.json()] == [
+        "2025-01-02",
+        "2025-01-03",
+    ]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get(
+        "/api/dtr/record",
+        params={"limit": 2, "after": cursor, "to": "2025-01-04"},
+        headers=headers,
+    )
+    assert [record["date"] for record in response.json()] == ["2025-01-04"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_export_records(mock_db):
+    asyncio.run(
+        mock_db["daily_time_records"].insert_many(
+            [
+                {
+                    "intern_id": "a@example.com",
+                    "date": "2025-01-01",
+                    "status": "Completed",
+                    "total_work_hours": 8.0,
+                },
+                {
+                    "intern_id": "a@example.com",
+                    "date": "2025-01-02",
+                    "status": "Active",
+                },
+                {
+                    "intern_id": "b@example.com",
+                    "date": "2025-01-02",
+                    "status": "Completed",
+                    "total_work_hours": 7.5,
+                },
+            ]
+        )
+    )
+
+    response = client.get("/api/dtr/export", params={"status": "Completed"})
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [(row["intern_id"], row["date"]) for row in rows] == [
+        ("a@example.com", "2025-01-01"),
+        ("b@example.com", "2025-01-02"),
+    ]
+
+    response = client.get(
+        "/api/dtr/export", params={"format": "csv", "from": "2025-01-02"}
+    )
+    lines = response.text.splitlines()
+    assert lines[0] == "intern_id,date,clock_in,clock_out,total_work_hours,status"
+    assert len(lines) == 3
+
+
+def test_parallel_clock_ins_create_one_record(mock_db):
+    headers = register_and_login("racer@example.com")
+
+    async def clock_in_many(count):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as http:
+            return await asyncio.gather(
+                *(http.post("/api/dtr/clock_in", headers=headers) for _ in range(count))
+            )
+
+    responses = asyncio.run(clock_in_many(25))
+
+    assert sorted(response.status_code for response in responses) == [200] + [400] * 24
+    assert (
+        asyncio.run(
+            mock_db["daily_time_records"].count_documents(
+                {"intern_id": "racer@example.com"}
+            )
+        )
+        == 1
+    )
+
+    response = client.post("/api/dtr/clock_out", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["total_hours"] == 0.0
+    assert client.post("/api/dtr/clock_out", headers=headers).status_code == 400
+
+
+def test_summary_from_rollups(mock_db):
+    headers = register_and_login("summary@example.com")
+    client.post("/api/dtr/clock_in", headers=headers)
+    client.post("/api/dtr/clock_out", headers=headers)
+
+    summary = client.get("/api/dtr/summary", headers=headers).json()
+    assert summary["total"] == {"key": "all", "total_hours": 0.0, "days": 1}
+    assert summary["week"]["days"] == summary["month"]["days"] == 1
+
+    asyncio.run(
+        mock_db["daily_time_records"].insert_many(
+            [
+                {
+                    "intern_id": "summary@example.com",
+                    "date": "2025-01-06",
+                    "status": "Completed",
+                    "total_work_hours": 8.0,
+                },
+                {
+                    "intern_id": "summary@example.com",
+                    "date": "2025-01-07",
+                    "status": "Completed",
+                    "total_work_hours": 7.5,
+                },
+            ]
+        )
+    )
+    asyncio.run(rebuild_rollups())
+
+    summary = client.get(
+        "/api/dtr/summary", params={"date": "2025-01-07"}, headers=headers
+    ).json()
+    assert summary["total"]["days"] == 3
+    assert summary["week"] == {"key": "2025-W02", "total_hours": 15.5, "days": 2}
+    assert summary["month"] == {"key": "2025-01", "total_hours": 15.5, "days": 2}
+
+    response = client.get(
+        "/api/dtr/summary", params={"date": "2025-13-40"}, headers=headers
+    )
+    assert response.status_code == 422
@@ -0,0 +1,130 @@
+from fastapi.testclient import TestClient
+import asyncio
+import sys
+import os
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from app.auth import routes
+from app.database.storage import storage
+from app.http_cache import etag_matches
+from app.main import app
+from app.test.test_dtr import register_and_login
+
+client = TestClient(app)
+
+
+def revalidate(url, etag, **kwargs):
+    headers = {**kwargs.pop("headers", {}), "If-None-Match": etag}
+    return client.get(url, headers=headers, **kwargs)
+
+
+def test_record_etag(mock_db, monkeypatch):
+    headers = register_and_login("etag@example.com")
+
+    response = client.get("/api/dtr/record", headers=headers)
+    etag = response.headers["ETag"]
+    assert (
+        etag.startswith('W/"')
+        and response.headers["Cache-Control"] == "private, no-cache"
+    )
+
+    # A match is answered before the query runs
+    async def fail(*args, **kwargs):
+        raise AssertionError("queried")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(storage.records, "list_for_intern", fail)
+        response = revalidate("/api/dtr/record", etag, headers=headers)
+    assert response.status_code == 304
+    assert response.content == b"" and response.headers["ETag"] == etag
+
+    # Other parameters or another intern get their own tag
+    assert (
+        revalidate(
+            "/api/dtr/record", etag, headers=headers, params={"limit": 5}
+        ).status_code
+        == 200
+    )
+    other = register_and_login("other@example.com")
+    assert revalidate("/api/dtr/record", etag, headers=other).status_code == 200
+
+    client.post("/api/dtr/clock_in", headers=headers)
+    response = revalidate("/api/dtr/record", etag, headers=headers)
+    assert response.status_code == 200 and len(response.json()) == 1
+    assert response.headers["ETag"] != etag
+
+    # The other intern's clock-in leaves this history's tag alone
+    etag = response.headers["ETag"]
+    client.post("/api/dtr/clock_in", headers=other)
+    assert revalidate("/api/dtr/record", etag, headers=headers).status_code == 304
+    client.post("/api/dtr/clock_out", headers=headers)
+    assert revalidate("/api/dtr/record", etag, headers=headers).status_code == 200
+
+
+def test_admin_list_etags(mock_db):
+    register_and_login("intern@example.com")
+
+    interns = client.get("/api/interns")
+    active = client.get("/api/interns/active_today")
+    assert revalidate("/api/interns", interns.headers["ETag"]).status_code == 304
+    assert (
+        revalidate("/api/interns/active_today", active.headers["ETag"]).status_code
+        == 304
+    )
+    assert interns.headers["ETag"] != active.headers["ETag"]
+
+    client.patch(
+        "/api/interns/update_approval",
+        json={"intern_id": "intern@example.com", "approval": "Approved"},
+    )
+    response = revalidate("/api/interns", interns.headers["ETag"])
+    assert response.status_code == 200 and response.json()[0]["approval"] == "Approved"
+    assert (
+        revalidate("/api/interns/active_today", active.headers["ETag"]).status_code
+        == 200
+    )
+
+
+def test_batched_clock_ins_bump_versions(mock_db, monkeypatch):
+    monkeypatch.setattr(routes, "CLOCK_IN_BATCHING", True)
+    headers = [register_and_login(f"batch{number}@example.com") for number in range(3)]
+    etag = client.get("/api/dtr/record", headers=headers[0]).headers["ETag"]
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as http:
+            await asyncio.gather(
+                *(http.post("/api/dtr/clock_in", headers=h) for h in headers)
+            )
+
+    asyncio.run(scenario())
+
+    assert asyncio.run(storage.versions.get("records:batch1@example.com")) == 1
+    assert revalidate("/api/dtr/record", etag, headers=headers[0]).status_code == 200
+
+
+def test_failed_bump_does_not_fail_the_write(mock_db, monkeypatch):
+    headers = register_and_login("flaky@example.com")
+    attempts = []
+
+    async def failing(keys):
+        attempts.append(keys)
+        raise RuntimeError("versions table throttled")
+
+    monkeypatch.setattr(storage.versions, "bump", failing)
+    assert client.post("/api/dtr/clock_in", headers=headers).status_code == 200
+    # Retried once, then left for the next write to invalidate
+    assert len(attempts) == 2
+    assert client.get("/api/dtr/record", headers=headers).json()[0]["status"]
+
+
+def test_etag_matches():
+    assert etag_matches('W/"1-ab"', 'W/"1-ab"')
+    assert etag_matches('"0-cd", "1-ab"', 'W/"1-ab"')
+    assert etag_matches("*", 'W/"1-ab"')
+    assert not etag_matches('W/"2-ab"', 'W/"1-ab"')
+    assert not etag_matches(None, 'W/"1-ab"')
@@ -0,0 +1,62 @@
+from fastapi.testclient import TestClient
+import asyncio
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from app.events import EventBus, event_bus
+from app.main import app
+from app.routes import events as events_route
+from app.test.test_dtr import register_and_login
+
+client = TestClient(app)
+
+
+def test_clock_in_and_out_are_published(mock_db):
+    headers = register_and_login("live@example.com")
+    subscription = event_bus.subscribe()
+    try:
+        client.post("/api/dtr/clock_in", headers=headers)
+        client.post("/api/dtr/clock_out", headers=headers)
+        first, second = subscription.queue.get_nowait(), subscription.queue.get_nowait()
+    finally:
+        event_bus.unsubscribe(subscription)
+
+    assert (first["type"], first["data"]["intern_id"]) == (
+        "clock_in",
+        "live@example.com",
+    )
+    assert second["type"] == "clock_out" and "total_hours" in second["data"]
+
+
+def test_slow_subscriber_drops_oldest_and_resyncs():
+    bus = EventBus(queue_size=2)
+    slow, fast = bus.subscribe(), bus.subscribe()
+    for number in range(3):
+        bus.publish("clock_in", {"n": number})
+        fast.queue.get_nowait()
+
+    assert [slow.queue.get_nowait()["data"]["n"] for _ in range(2)] == [1, 2]
+    assert slow.lagged and not fast.lagged
+
+
+def test_stream_frames(monkeypatch):
+    bus = EventBus()
+    monkeypatch.setattr(events_route, "event_bus", bus)
+
+    async def scenario():
+        subscription = bus.subscribe()
+        stream = events_route._stream(subscription)
+        assert await stream.__anext__() == b"retry: 3000\n\n"
+        bus.publish("clock_in", {"intern_id": "a@example.com"})
+        frame = await stream.__anext__()
+        await stream.aclose()
+        return frame
+
+    frame = asyncio.run(scenario())
+    head, data = frame.decode().split("data: ")
+    assert head == "id: 1\nevent: clock_in\n"
+    assert json.loads(data) == {"intern_id": "a@example.com"}
+    # Closing the stream unsubscribes it
+    assert bus.subscriptions == set()
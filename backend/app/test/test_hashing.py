@@ -0,0 +1,54 @@
+from fastapi.testclient import TestClient
+import asyncio
+import sys
+import os
+
+from passlib.context import CryptContext
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from app.auth import hashing
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_login_rehashes_outdated_cost(mock_db):
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=5).hash("secret")
+    asyncio.run(
+        mock_db["users"].insert_one(
+            {
+                "email": "old@example.com",
+                "password": old_hash,
+                "role": "Intern",
+                "approval": "Approved",
+            }
+        )
+    )
+
+    response = client.post(
+        "/api/login", json={"email": "old@example.com", "password": "secret"}
+    )
+    assert response.status_code == 200
+
+    stored = asyncio.run(mock_db["users"].find_one({"email": "old@example.com"}))
+    assert stored["password"].startswith(f"$2b${hashing.BCRYPT_ROUNDS:02d}$")
+    assert hashing.verify_password("secret", stored["password"])
+
+
+def test_login_returns_503_when_pool_saturated(mock_db, monkeypatch):
+    asyncio.run(
+        mock_db["users"].insert_one(
+            {
+                "email": "busy@example.com",
+                "password": hashing.hash_password("secret"),
+                "role": "Intern",
+            }
+        )
+    )
+    monkeypatch.setattr(hashing, "_admission", asyncio.Semaphore(0))
+
+    response = client.post(
+        "/api/login", json={"email": "busy@example.com", "password": "secret"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(hashing.HASH_RETRY_AFTER)
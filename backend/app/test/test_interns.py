@@ -0,0 +1,119 @@
+from fastapi.testclient import TestClient
+import asyncio
+from datetime import datetime
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from app.main import app
+
+client = TestClient(app)
+
+
+def seed(db):
+    async def insert():
+        await db["users"].insert_many(
+            [
+                {
+                    "email": "a@example.com",
+                    "role": "Intern",
+                    "password": "hash",
+                    "approval": "Approved",
+                },
+                {
+                    "email": "b@example.com",
+                    "role": "Intern",
+                    "password": "hash",
+                    "approval": "Pending",
+                },
+                {
+                    "email": "admin@example.com",
+                    "role": "Admin",
+                    "password": "hash",
+                    "approval": "Approved",
+                },
+            ]
+        )
+        await db["daily_time_records"].insert_many(
+            [
+                {
+                    "intern_id": "a@example.com",
+                    "date": "2025-01-02",
+                    "status": "Completed",
+                },
+                {
+                    "intern_id": "a@example.com",
+                    "date": "2025-01-03",
+                    "status": "Completed",
+                },
+            ]
+        )
+
+    asyncio.run(insert())
+
+
+def test_get_all_interns(mock_db):
+    seed(mock_db)
+
+    interns = {intern["email"]: intern for intern in client.get("/api/interns").json()}
+
+    assert set(interns) == {"a@example.com", "b@example.com"}
+    assert all("password" not in intern for intern in interns.values())
+    assert len(interns["a@example.com"]["records"]) == 2
+    # Only the fields the view reads, with the ObjectId as a string
+    record = interns["a@example.com"]["records"][0]
+    assert set(record) == {"_id", "date", "status"}
+    assert isinstance(record["_id"], str)
+    assert interns["b@example.com"]["records"] == []
+
+
+def test_get_active_interns_today(mock_db):
+    seed(mock_db)
+    today = datetime.now().strftime("%Y-%m-%d")
+    asyncio.run(
+        mock_db["daily_time_records"].insert_many(
+            [
+                {"intern_id": "a@example.com", "date": today, "status": "Active"},
+                {"intern_id": "b@example.com", "date": today, "status": "Completed"},
+            ]
+        )
+    )
+
+    interns = client.get("/api/interns/active_today").json()
+
+    assert [intern["email"] for intern in interns] == ["a@example.com"]
+    assert "password" not in interns[0]
+    assert interns[0]["records"][0]["date"] == today
+
+
+def test_bulk_update_approval(mock_db):
+    seed(mock_db)
+
+    response = client.patch(
+        "/api/interns/update_approval/bulk",
+        json={
+            "updates": [
+                {"intern_id": "a@example.com", "approval": "Approved"},
+                {"intern_id": "b@example.com", "approval": "Rejected"},
+                {"intern_id": "ghost@example.com", "approval": "Approved"},
+            ]
+        },
+    )
+    body = response.json()
+
+    assert response.status_code == 200
+    assert (body["matched"], body["not_found"]) == (2, 1)
+    assert [item["status"] for item in body["results"]] == [
+        "updated",
+        "updated",
+        "not_found",
+    ]
+    stored = asyncio.run(mock_db["users"].find_one({"email": "b@example.com"}))
+    assert stored["approval"] == "Rejected"
+
+    assert (
+        client.patch(
+            "/api/interns/update_approval/bulk", json={"updates": []}
+        ).status_code
+        == 422
+    )
@@ -0,0 +1,90 @@
+from fastapi.testclient import TestClient
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from app.auth.jwt_handler import create_access_token, token_cache
+from app.database.cache import session_cache
+from app.database.storage import storage
+from app.main import app
+from app.test.test_dtr import register_and_login
+
+client = TestClient(app)
+
+
+def test_token_cache_hits_and_logout(mock_db):
+    token_cache.clear()
+    headers = {
+        "Authorization": f"Bearer {create_access_token({'sub': 'cached@example.com'})}"
+    }
+
+    for _ in range(3):
+        assert client.get("/auth/protected", headers=headers).status_code == 200
+    stats = token_cache.stats()
+    assert (stats["misses"], stats["size"]) == (1, 1)
+    assert stats["hits"] >= 2
+
+    assert client.post("/api/logout", headers=headers).status_code == 200
+    response = client.get("/auth/protected", headers=headers)
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Token revoked"}
+
+
+def test_token_cache_never_serves_expired_claims(mock_db):
+    token_cache.clear()
+    token = create_access_token({"sub": "stale@example.com"})
+    token_cache.put(token, {"sub": "stale@example.com", "exp": time.time() - 1})
+
+    response = client.get(
+        "/auth/protected", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    assert token_cache.get(token)["exp"] > time.time()
+
+
+def login():
+    response = client.post(
+        "/api/login", json={"email": "sessions@example.com", "password": "secret"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_logout_reaches_every_process(mock_db):
+    first = register_and_login("sessions@example.com")
+    second = login()
+    assert client.get("/auth/protected", headers=first).status_code == 200
+
+    assert client.post("/api/logout", headers=first).status_code == 200
+    # As if served by another worker, whose token cache still has the claims
+    token_cache.put(
+        first["Authorization"].split()[1],
+        {"sub": "sessions@example.com", "exp": time.time() + 60},
+    )
+    assert client.get("/auth/protected", headers=first).status_code == 401
+    assert client.get("/auth/protected", headers=second).status_code == 401
+
+    # Logging in again starts a new session
+    third = login()
+    assert client.get("/auth/protected", headers=third).status_code == 200
+
+
+def test_session_check_skips_storage_on_the_hot_path(mock_db, monkeypatch):
+    headers = register_and_login("hotpath@example.com")
+    reads = []
+    version_get = storage.versions.get
+
+    async def counting_get(key):
+        reads.append(key)
+        return await version_get(key)
+
+    monkeypatch.setattr(storage.engine.versions, "get", counting_get)
+    for _ in range(5):
+        assert client.get("/auth/protected", headers=headers).status_code == 200
+    assert reads == []
+
+    # Once the entry ages out, one request reloads it from storage
+    session_cache.backend.clear()
+    for _ in range(3):
+        assert client.get("/auth/protected", headers=headers).status_code == 200
+    assert reads == ["sessions:hotpath@example.com"]
@@ -0,0 +1,95 @@
+from fastapi.testclient import TestClient
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from app.metrics import Registry
+from app.main import app
+
+client = TestClient(app)
+
+
+def sample(text: str, prefix: str) -> float:
+    """Value of the first exposition line starting with `prefix`"""
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"no sample {prefix!r} in metrics output")
+
+
+def test_requests_are_counted_per_route_template(mock_db):
+    before = client.get("/metrics").text
+    seen = 0
+    if 'route="/get_init",status="200"' in before:
+        seen = sample(
+            before, 'http_requests_total{method="GET",route="/get_init",status="200"}'
+        )
+
+    client.get("/get_init")
+    client.get("/get_init")
+    client.get("/no/such/path")
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert (
+        sample(text, 'http_requests_total{method="GET",route="/get_init",status="200"}')
+        == seen + 2
+    )
+    assert (
+        sample(text, 'http_requests_total{method="GET",route="unmatched",status="404"}')
+        >= 1
+    )
+    assert (
+        sample(
+            text,
+            'http_request_duration_seconds_bucket{method="GET",route="/get_init",le="+Inf"}',
+        )
+        >= 2
+    )
+    # The scrape itself is the only request in flight
+    assert sample(text, 'http_requests_in_flight{method="GET",route="/metrics"}') == 1
+
+
+def test_bcrypt_and_jwt_timings_are_exposed(mock_db):
+    client.post(
+        "/api/register",
+        json={
+            "name": "Juan",
+            "surname": "Dela Cruz",
+            "email": "metrics@example.com",
+            "role": "Intern",
+            "password": "secret123",
+            "approval": "Pending",
+        },
+    )
+    token = client.post(
+        "/api/login", json={"email": "metrics@example.com", "password": "secret123"}
+    ).json()["access_token"]
+    client.get("/api/user", headers={"Authorization": f"Bearer {token}"})
+
+    text = client.get("/metrics").text
+    assert sample(text, 'bcrypt_duration_seconds_count{operation="hash"}') >= 1
+    assert sample(text, 'bcrypt_duration_seconds_count{operation="verify"}') >= 1
+    assert sample(text, "jwt_decode_duration_seconds_count") >= 1
+    assert "# TYPE mongodb_command_duration_seconds histogram" in text
+
+
+def test_histogram_exposition_format():
+    registry = Registry()
+    latency = registry.histogram(
+        "op_seconds", "Op latency", ("op",), buckets=(0.1, 1.0)
+    )
+    latency.observe(0.05, "read")
+    latency.observe(0.5, "read")
+    latency.observe(5, "read")
+
+    assert registry.render().splitlines() == [
+        "# HELP op_seconds Op latency",
+        "# TYPE op_seconds histogram",
+        'op_seconds_bucket{op="read",le="0.1"} 1',
+        'op_seconds_bucket{op="read",le="1.0"} 2',
+        'op_seconds_bucket{op="read",le="+Inf"} 3',
+        'op_seconds_sum{op="read"} 5.55',
+        'op_seconds_count{op="read"} 3',
+    ]
@@ -0,0 +1,138 @@
+from fastapi.testclient import TestClient
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from app.auth.jwt_handler import create_access_token
+from app.database.cache import (
+    LocalCacheBackend,
+    ProfileCache,
+    RedisCacheBackend,
+    profile_cache,
+)
+from app.main import app
+from app.test.test_dtr import register_and_login
+
+client = TestClient(app)
+
+
+def test_user_details_are_cached_and_invalidated(mock_db):
+    asyncio.run(
+        mock_db["users"].insert_one(
+            {
+                "email": "cache@example.com",
+                "password": "hash",
+                "role": "Intern",
+                "approval": "Pending",
+            }
+        )
+    )
+    headers = {
+        "Authorization": f"Bearer {create_access_token({'sub': 'cache@example.com'})}"
+    }
+    profile_cache.use_backend(LocalCacheBackend())
+
+    assert client.get("/api/user", headers=headers).json()["approval"] == "Pending"
+    assert client.get("/api/user", headers=headers).json()["approval"] == "Pending"
+    stats = asyncio.run(profile_cache.stats())
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+    client.patch(
+        "/api/interns/update_approval",
+        json={"intern_id": "cache@example.com", "approval": "Approved"},
+    )
+    assert client.get("/api/user", headers=headers).json()["approval"] == "Approved"
+
+    text = client.get("/metrics").text
+    assert 'profile_cache_lookups{result="hit"} 1' in text
+    assert "profile_cache_hit_ratio 0.3333" in text
+    assert "profile_cache_size 1" in text
+
+
+def test_login_reads_the_current_approval_and_no_hash_is_cached(mock_db):
+    register_and_login("approved@example.com")
+    profile_cache.use_backend(LocalCacheBackend())
+    headers = {
+        "Authorization": f"Bearer {create_access_token({'sub': 'approved@example.com'})}"
+    }
+    client.get("/api/user", headers=headers)
+
+    # Approved elsewhere (another replica) without invalidating this cache
+    asyncio.run(
+        mock_db["users"].update_one(
+            {"email": "approved@example.com"}, {"$set": {"approval": "Approved"}}
+        )
+    )
+    response = client.post(
+        "/api/login", json={"email": "approved@example.com", "password": "secret"}
+    )
+    assert response.json()["approval"] == "Approved"
+
+    cached = asyncio.run(
+        profile_cache.backend.get(ProfileCache.key("approved@example.com"))
+    )
+    assert "password" not in cached
+
+
+def test_replicas_sharing_a_backend_stay_coherent():
+    shared = LocalCacheBackend()
+    replica_a, replica_b = ProfileCache(shared), ProfileCache(shared)
+    store = {
+        "shared@example.com": {"email": "shared@example.com", "approval": "Pending"}
+    }
+
+    async def load(email):
+        return dict(store[email])
+
+    async def scenario():
+        await replica_a.get("shared@example.com", load)
+        store["shared@example.com"]["approval"] = "Approved"
+        await replica_b.invalidate("shared@example.com")
+        return await replica_a.get("shared@example.com", load)
+
+    assert asyncio.run(scenario())["approval"] == "Approved"
+
+
+class StandInRedis:
+    """The slice of redis.asyncio.Redis that RedisCacheBackend uses"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, px):
+        self.values[key] = value
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+    async def dbsize(self):
+        return len(self.values)
+
+
+def test_redis_backend_round_trips_profiles():
+    from bson import ObjectId
+
+    backend = RedisCacheBackend(StandInRedis())
+    user = {
+        "_id": ObjectId(),
+        "email": "r@example.com",
+        "password": "hash",
+        "role": "Intern",
+    }
+
+    async def scenario():
+        cache = ProfileCache(backend)
+
+        async def load(email):
+            return dict(user)
+
+        await cache.get("r@example.com", load)
+        return await cache.get("r@example.com", load), await backend.size()
+
+    cached, size = asyncio.run(scenario())
+    assert cached == {"_id": user["_id"], "email": "r@example.com", "role": "Intern"}
+    assert size == 1
@@ -0,0 +1,196 @@
+from fastapi.testclient import TestClient
+import asyncio
+import sys
+import os
+
+from starlette.requests import Request
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from app.admission import AdmissionMiddleware
+from app.auth import rate_limit
+from app.auth import routes
+from app.auth.rate_limit import LocalRateLimitStore
+from app.main import app
+from app.test.test_dtr import register_and_login
+
+client = TestClient(app)
+
+
+def test_login_attempts_are_limited_per_email_before_bcrypt(mock_db, monkeypatch):
+    register_and_login("target@example.com")
+    verifications = []
+    verify = routes.verify_password_async
+
+    async def counting(*args):
+        verifications.append(args)
+        return await verify(*args)
+
+    monkeypatch.setattr(routes, "verify_password_async", counting)
+    attempt = {"email": "target@example.com", "password": "wrong"}
+
+    # register + login used 2 of the 5 tokens
+    statuses = [client.post("/api/login", json=attempt).status_code for _ in range(4)]
+    assert statuses == [400, 400, 400, 429]
+    assert len(verifications) == 3
+
+    rejected = client.post("/api/login", json=attempt)
+    assert rejected.status_code == 429
+    assert int(rejected.headers["Retry-After"]) >= 1
+    assert len(verifications) == 3
+
+
+def test_registrations_are_limited_per_ip(mock_db, monkeypatch):
+    monkeypatch.setattr(rate_limit.ip_limiter, "burst", 2)
+    payload = {
+        "name": "A",
+        "surname": "B",
+        "role": "Intern",
+        "password": "secret",
+        "approval": "Pending",
+    }
+
+    statuses = [
+        client.post(
+            "/api/register", json={**payload, "email": f"ip{n}@example.com"}
+        ).status_code
+        for n in range(3)
+    ]
+    assert statuses == [200, 200, 429]
+
+
+def test_buckets_refill_over_time():
+    store = LocalRateLimitStore()
+
+    async def scenario():
+        taken = [await store.take("k", 2, 1.0, now=0.0) for _ in range(3)]
+        return taken, await store.take("k", 2, 1.0, now=1.0)
+
+    taken, refilled = asyncio.run(scenario())
+    assert taken[:2] == [0, 0] and taken[2] == 1.0
+    assert refilled == 0
+
+
+def test_client_ip_behind_trusted_proxy(monkeypatch):
+    request = Request(
+        {
+            "type": "http",
+            "headers": [(b"x-forwarded-for", b"203.0.113.9, 10.0.0.2")],
+            "client": ("10.0.0.3", 4321),
+        }
+    )
+    assert rate_limit.client_ip(request) == "10.0.0.3"
+    monkeypatch.setattr(rate_limit, "TRUSTED_PROXY_HOPS", 2)
+    assert rate_limit.client_ip(request) == "203.0.113.9"
+
+
+def test_admission_sheds_beyond_concurrency_and_queue():
+    release = asyncio.Event()
+
+    async def slow_app(scope, receive, send):
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def request(middleware):
+        statuses = []
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        await middleware({"type": "http", "path": "/api/interns"}, receive, send)
+        return statuses[0]
+
+    async def scenario():
+        middleware = AdmissionMiddleware(
+            slow_app, max_concurrency=1, max_queue=1, queue_timeout=5
+        )
+        tasks = [asyncio.create_task(request(middleware)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        # One running, one queued, the third was shed at once
+        shed = [task.result() for task in tasks if task.done()]
+        release.set()
+        return shed, await asyncio.gather(*tasks), middleware.active
+
+    shed, statuses, active = asyncio.run(scenario())
+    assert shed == [503]
+    assert sorted(statuses) == [200, 200, 503]
+    assert active == 0
+
+
+def test_admission_queue_times_out():
+    async def stuck_app(scope, receive, send):
+        await asyncio.sleep(1)
+
+    async def scenario():
+        middleware = AdmissionMiddleware(
+            stuck_app, max_concurrency=1, max_queue=5, queue_timeout=0.01
+        )
+        running = asyncio.create_task(
+            middleware({"type": "http", "path": "/"}, None, None)
+        )
+        await asyncio.sleep(0)
+        statuses = []
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+
+        await middleware({"type": "http", "path": "/"}, None, send)
+        running.cancel()
+        return statuses
+
+    assert asyncio.run(scenario()) == [503]
+
+
+def test_login_buckets_per_browser_behind_proxy(mock_db, monkeypatch):
+    # As behind the Next.js routes: the socket peer is the proxy for every
+    # browser, and the proxy appends each browser's address
+    monkeypatch.setattr(rate_limit, "TRUSTED_PROXY_HOPS", 1)
+    monkeypatch.setattr(rate_limit.ip_limiter, "burst", 2)
+
+    def attempt(address, forged=""):
+        return client.post(
+            "/api/login",
+            json={"email": f"{address}@example.com", "password": "wrong"},
+            headers={"X-Forwarded-For": f"{forged}{address}"},
+        ).status_code
+
+    assert [attempt("203.0.113.9") for _ in range(3)] == [400, 400, 429]
+    # A forged entry in front of the proxy's does not pick another bucket
+    assert attempt("203.0.113.9", forged="198.51.100.1, ") == 429
+    assert attempt("198.51.100.7") == 400
+
+
+def test_direct_path_cannot_forge_the_proxied_chain(mock_db, monkeypatch):
+    # As on ECS: Next.js logins arrive browser -> ALB -> Next.js -> ALB with
+    # the shared secret, while /fastapi/* reaches the API through the ALB alone
+    monkeypatch.setattr(rate_limit, "TRUSTED_PROXY_HOPS", 3)
+    monkeypatch.setattr(rate_limit, "DIRECT_PROXY_HOPS", 1)
+    monkeypatch.setattr(rate_limit, "PROXY_SECRET", "proxy-secret")
+    monkeypatch.setattr(rate_limit.ip_limiter, "burst", 2)
+
+    def attempt(forwarded, secret=None):
+        headers = {"X-Forwarded-For": forwarded}
+        if secret:
+            headers["X-Proxy-Secret"] = secret
+        return client.post(
+            "/api/login",
+            json={"email": "direct@example.com", "password": "wrong"},
+            headers=headers,
+        ).status_code
+
+    # The caller at 203.0.113.9 rotates the forged entries; the ALB appends
+    # the real address last, so every attempt lands in the same bucket
+    statuses = [
+        attempt(f"198.51.100.{n}, 192.0.2.{n}, 203.0.113.9", secret)
+        for n, secret in enumerate([None, "guess", None])
+    ]
+    assert statuses == [400, 400, 429]
+
+    # With the secret, the browser is three entries from the end
+    proxied = "198.51.100.7, 10.0.1.5, 10.0.2.6"
+    assert attempt(proxied, "proxy-secret") == 400
@@ -0,0 +1,104 @@
+from fastapi.testclient import TestClient
+import asyncio
+import sys
+import os
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from app.database.cache import ReadCoalescer
+from app.database.storage import storage
+from app.main import app
+from app.test.test_dtr import register_and_login
+
+client = TestClient(app)
+
+
+def test_concurrent_reads_share_one_query(mock_db, monkeypatch):
+    calls = []
+    list_with_records = storage.users.list_with_records
+
+    async def counting(*args, **kwargs):
+        calls.append(kwargs)
+        # Keep the query in flight while the other requests arrive
+        await asyncio.sleep(0.05)
+        return await list_with_records(*args, **kwargs)
+
+    monkeypatch.setattr(storage.users, "list_with_records", counting)
+    register_and_login("shared@example.com")
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as http:
+            responses = await asyncio.gather(
+                *(http.get("/api/interns") for _ in range(20))
+            )
+            # Within the micro-cache window a later read is served from memory
+            responses.append(await http.get("/api/interns"))
+        return responses
+
+    responses = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert all(response.status_code == 200 for response in responses)
+    assert len({response.content for response in responses}) == 1
+
+
+def test_writes_invalidate_cached_lists(mock_db):
+    headers = register_and_login("fresh@example.com")
+    assert client.get("/api/interns/active_today").json() == []
+
+    client.post("/api/dtr/clock_in", headers=headers)
+    active = client.get("/api/interns/active_today").json()
+    assert [intern["email"] for intern in active] == ["fresh@example.com"]
+
+    client.patch(
+        "/api/interns/update_approval",
+        json={"intern_id": "fresh@example.com", "approval": "Approved"},
+    )
+    assert client.get("/api/interns").json()[0]["approval"] == "Approved"
+
+
+def test_failed_load_is_shared_and_not_cached():
+    cache = ReadCoalescer(ttl=60)
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database down")
+
+    async def scenario():
+        results = await asyncio.gather(
+            *(cache.get(("key",), failing) for _ in range(5)), return_exceptions=True
+        )
+        await asyncio.gather(cache.get(("key",), failing), return_exceptions=True)
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    # Errors are not cached: the next read tries again
+    assert len(calls) == 2
+
+
+def test_cached_results_are_bounded():
+    cache = ReadCoalescer(ttl=60, max_size=2)
+    loads = []
+
+    async def load(key):
+        async def loader():
+            loads.append(key)
+            return key
+
+        return await cache.get((key,), loader)
+
+    async def scenario():
+        for key in ["a", "b", "a", "c", "a", "b"]:
+            await load(key)
+
+    asyncio.run(scenario())
+    # "b" was the least recently used when "c" came in
+    assert loads == ["a", "b", "c", "b"]
+    assert len(cache._entries) == 2
@@ -0,0 +1,47 @@
+import sys
+import os
+from datetime import datetime
+from decimal import Decimal
+
+import orjson
+from bson import ObjectId
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from app.models.user import DailyTimeRecordOut
+from app.serialization import dumps
+
+
+def test_dumps_handles_storage_types():
+    record_id = ObjectId()
+    encoded = dumps(
+        {
+            "_id": record_id,
+            "clock_in": datetime(2025, 3, 3, 8, 0, 0, 123000),
+            "total_work_hours": Decimal("8.25"),
+        }
+    )
+
+    assert orjson.loads(encoded) == {
+        "_id": str(record_id),
+        "clock_in": "2025-03-03T08:00:00.123000",
+        "total_work_hours": 8.25,
+    }
+
+
+def test_record_model_matches_the_stored_shape():
+    record_id = ObjectId()
+    record = DailyTimeRecordOut.model_validate(
+        {
+            "_id": record_id,
+            "intern_id": "a@example.com",
+            "date": "2025-03-03",
+            "status": "Active",
+        }
+    )
+
+    assert record.model_dump(mode="json", by_alias=True, exclude_unset=True) == {
+        "_id": str(record_id),
+        "intern_id": "a@example.com",
+        "date": "2025-03-03",
+        "status": "Active",
+    }
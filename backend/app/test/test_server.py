@@ -0,0 +1,46 @@
+import builtins
+import io
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from app import server
+
+
+def test_cpu_quota_limits_workers(monkeypatch):
+    monkeypatch.setattr(
+        os, "sched_getaffinity", lambda pid: set(range(16)), raising=False
+    )
+    real_open = builtins.open
+
+    def fake_open(path, *args, **kwargs):
+        if path == "/sys/fs/cgroup/cpu.max":
+            return io.StringIO("250000 100000\n")
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", fake_open)
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+
+    # 2.5 CPUs of quota round up to 3 workers, not one per host CPU
+    assert server.worker_count() == 3
+    monkeypatch.setenv("WEB_CONCURRENCY", "5")
+    assert server.worker_count() == 5
+
+
+def test_workers_split_the_bcrypt_threads(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        server.uvicorn, "run", lambda app, **options: calls.append(options)
+    )
+    monkeypatch.setattr(server, "available_cpus", lambda: 8)
+    # main() sets HASH_POOL_SIZE for the workers; keep it out of the real environment
+    environ = {
+        key: value for key, value in os.environ.items() if key != "HASH_POOL_SIZE"
+    }
+    monkeypatch.setattr(os, "environ", {**environ, "WEB_CONCURRENCY": "4"})
+
+    server.main()
+
+    assert calls[0]["workers"] == 4
+    assert os.environ["HASH_POOL_SIZE"] == "2"
+    assert calls[0]["timeout_graceful_shutdown"] == server.GRACEFUL_TIMEOUT
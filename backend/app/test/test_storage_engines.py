@@ -0,0 +1,257 @@
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+import boto3
+import pytest
+from moto import mock_aws
+from mongomock_motor import AsyncMongoMockClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from app.database.base import RecordExists, rollup_keys
+from app.database.dynamo_engine import DynamoEngine
+from app.database.dynamodb import AWS_REGION, create_tables
+from app.database.memory_engine import MemoryEngine
+from app.database.mongo_engine import MongoEngine
+from app.database.mongodb import create_indexes
+from app.database.storage import create_engine
+
+
+@pytest.fixture(params=["memory", "mongodb", "dynamodb"])
+def engine(request, monkeypatch):
+    """Every engine must pass the same behaviour checks"""
+    if request.param == "memory":
+        yield MemoryEngine()
+    elif request.param == "mongodb":
+        db = AsyncMongoMockClient()["test_db"]
+        asyncio.run(create_indexes(db))
+        yield MongoEngine(db)
+    else:
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        with mock_aws():
+            resource = boto3.resource("dynamodb", region_name=AWS_REGION)
+            create_tables(resource)
+            yield DynamoEngine(resource)
+
+
+def intern(email):
+    return {
+        "email": email,
+        "name": "Test",
+        "surname": "Intern",
+        "role": "Intern",
+        "password": "hash",
+        "approval": "Pending",
+        "created_at": datetime(2025, 3, 1, 8, 0),
+    }
+
+
+def test_users(engine):
+    async def scenario():
+        for email in ("b@example.com", "a@example.com", "c@example.com"):
+            await engine.users.insert(intern(email))
+        await engine.users.insert({**intern("admin@example.com"), "role": "Admin"})
+
+        user = await engine.users.find_by_email("a@example.com")
+        assert user["password"] == "hash" and user["role"] == "Intern"
+        assert await engine.users.find_by_email("missing@example.com") is None
+
+        await engine.users.set_password("a@example.com", "rehashed")
+        assert (await engine.users.find_by_email("a@example.com"))[
+            "password"
+        ] == "rehashed"
+
+        assert await engine.users.set_approval("a@example.com", "Approved")
+        assert not await engine.users.set_approval("missing@example.com", "Approved")
+        found = await engine.users.set_approvals(
+            {"b@example.com": "Approved", "missing@example.com": "Approved"}
+        )
+        assert found == {"b@example.com"}
+
+        users = await engine.users.list_by_emails(
+            ["a@example.com", "admin@example.com", "missing@example.com"], role="Intern"
+        )
+        assert [(u["email"], u["approval"]) for u in users] == [
+            ("a@example.com", "Approved")
+        ]
+        assert "password" not in users[0]
+
+        assert await engine.users.exists("a@example.com")
+        assert not await engine.users.exists("missing@example.com")
+        users = await engine.users.list_by_emails(
+            ["a@example.com", "admin@example.com"], role="Intern", fields=["approval"]
+        )
+        assert [(u["approval"], "name" in u) for u in users] == [("Approved", False)]
+
+    asyncio.run(scenario())
+
+
+def test_records_and_pagination(engine):
+    async def scenario():
+        for email in ("a@example.com", "b@example.com", "c@example.com"):
+            await engine.users.insert(intern(email))
+        clock_in = datetime(2025, 3, 3, 8, 0)
+        record = await engine.records.start_day("a@example.com", "2025-03-03", clock_in)
+        assert record["status"] == "Active" and record["clock_in"] == clock_in
+        with pytest.raises(RecordExists):
+            await engine.records.start_day("a@example.com", "2025-03-03", clock_in)
+        await engine.records.start_day("b@example.com", "2025-03-03", clock_in)
+
+        active = await engine.records.list_active_for_day("2025-03-03")
+        assert sorted(r["intern_id"] for r in active) == [
+            "a@example.com",
+            "b@example.com",
+        ]
+
+        record = await engine.records.finish_day(
+            "a@example.com", "2025-03-03", datetime(2025, 3, 3, 16, 20)
+        )
+        assert record["status"] == "Completed" and record["total_work_hours"] == 8.33
+        assert (
+            await engine.records.finish_day(
+                "a@example.com", "2025-03-03", datetime(2025, 3, 3, 17, 0)
+            )
+            is None
+        )
+        assert (
+            await engine.records.finish_day(
+                "c@example.com", "2025-03-03", datetime(2025, 3, 3, 17, 0)
+            )
+            is None
+        )
+        assert (await engine.records.find_for_day("a@example.com", "2025-03-03"))[
+            "clock_out"
+        ]
+
+        await engine.records.start_day("a@example.com", "2025-03-04", clock_in)
+        dates = [
+            r["date"]
+            for r in await engine.records.list_for_intern(
+                "a@example.com", after="2025-03-03"
+            )
+        ]
+        assert dates == ["2025-03-04"]
+
+        page = await engine.users.list_with_records("Intern", limit=2)
+        assert [u["email"] for u in page] == ["a@example.com", "b@example.com"]
+        assert [r["date"] for r in page[0]["records"]] == ["2025-03-03", "2025-03-04"]
+        page = await engine.users.list_with_records("Intern", after="a@example.com")
+        assert [u["email"] for u in page] == ["b@example.com", "c@example.com"]
+        if engine.name != "mongodb":
+            # mongomock cannot run the $lookup pipeline used for date ranges
+            page = await engine.users.list_with_records(
+                "Intern", date_from="2025-03-04"
+            )
+            assert [r["date"] for r in page[0]["records"]] == ["2025-03-04"]
+
+        page = await engine.users.list_with_records(
+            "Intern", limit=1, fields=["name"], record_fields=["status"]
+        )
+        assert page[0]["name"] == "Test" and "approval" not in page[0]
+        assert [(r["status"], "clock_in" in r) for r in page[0]["records"]] == [
+            ("Completed", False),
+            ("Active", False),
+        ]
+        record = await engine.records.find_for_day(
+            "a@example.com", "2025-03-03", fields=["clock_out"]
+        )
+        assert record["clock_out"] and "status" not in record and record["_id"]
+        active = await engine.records.list_active_for_day(
+            "2025-03-04", fields=["status"]
+        )
+        assert [(r["status"], "clock_in" in r) for r in active] == [("Active", False)]
+
+        exported = [r async for r in engine.records.iter_records(status="Completed")]
+        assert [(r["intern_id"], r["date"]) for r in exported] == [
+            ("a@example.com", "2025-03-03")
+        ]
+        exported = [
+            r
+            async for r in engine.records.iter_records(
+                intern_id="a@example.com", batch_size=1
+            )
+        ]
+        assert sorted(r["date"] for r in exported) == ["2025-03-03", "2025-03-04"]
+        exported = [
+            r
+            async for r in engine.records.iter_records(
+                intern_id="a@example.com", status="Active", fields=["clock_in"]
+            )
+        ]
+        assert [("clock_out" in r, r["clock_in"]) for r in exported] == [
+            (False, clock_in)
+        ]
+
+    asyncio.run(scenario())
+
+
+def test_start_days_reports_each_entry(engine):
+    clock_in = datetime(2025, 3, 3, 8, 0)
+
+    async def scenario():
+        await engine.records.start_day("a@example.com", "2025-03-03", clock_in)
+        return await engine.records.start_days(
+            [
+                ("b@example.com", "2025-03-03", clock_in),
+                ("a@example.com", "2025-03-03", clock_in),
+                ("c@example.com", "2025-03-03", clock_in),
+                ("b@example.com", "2025-03-03", clock_in),
+            ]
+        )
+
+    opened, existing, other, repeated = asyncio.run(scenario())
+    assert (opened["intern_id"], opened["status"]) == ("b@example.com", "Active")
+    assert opened["_id"] is not None and other["intern_id"] == "c@example.com"
+    assert isinstance(existing, RecordExists) and isinstance(repeated, RecordExists)
+
+
+def test_rollups(engine):
+    async def scenario():
+        keys = rollup_keys("2025-03-03")
+        await engine.rollups.add_day("a@example.com", "2025-03-03", 8.0)
+        await engine.rollups.add_day("a@example.com", "2025-03-04", 4.5)
+        rollups = await engine.rollups.for_intern("a@example.com", keys)
+        assert {p: (r["total_hours"], r["days"]) for p, r in rollups.items()} == {
+            "total": (12.5, 2),
+            "week": (12.5, 2),
+            "month": (12.5, 2),
+        }
+        assert await engine.rollups.for_intern("b@example.com", keys) == {}
+
+        await engine.rollups.replace_all(
+            [
+                {
+                    "intern_id": "b@example.com",
+                    "period": "total",
+                    "key": "all",
+                    "total_hours": 1.0,
+                    "days": 1,
+                    "updated_at": datetime(2025, 3, 5),
+                }
+            ]
+        )
+        assert await engine.rollups.for_intern("a@example.com", keys) == {}
+        assert (await engine.rollups.for_intern("b@example.com", keys))["total"][
+            "days"
+        ] == 1
+
+    asyncio.run(scenario())
+
+
+def test_versions(engine):
+    async def scenario():
+        assert await engine.versions.get("interns") == 0
+        await engine.versions.bump(["interns", "records:a@example.com"])
+        await engine.versions.bump(["interns"])
+        assert await engine.versions.get("interns") == 2
+        assert await engine.versions.get("records:a@example.com") == 1
+        assert await engine.versions.get("records:b@example.com") == 0
+
+    asyncio.run(scenario())
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        create_engine("sqlite")
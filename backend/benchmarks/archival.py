@@ -0,0 +1,151 @@
+"""
+Hot working set and read latency before and after archiving old records.
+
+Seeds --interns x --days of history (benchmarks/datagen.py), times the
+common reads (an intern's last month of records, a year-long history, the
+day lookup behind clock-out and, with --real, the admin's current-week
+listing), then archives everything older than --keep-days and times them
+again. The hot collection's size is the record count plus its BSON bytes
+(collStats' size and index sizes with --real). Recent-range reads should
+get cheaper or stay flat; only reads reaching back past the boundary pay
+for the extra archive queries.
+
+Uses mongomock-motor by default; --real --database NAME runs against that
+throwaway database at MONGODB_URL instead (never the app's DATABASE_NAME;
+it must be empty, or add --drop).
+
+    python -m benchmarks.archival --interns 200 --days 500 --keep-days 90
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+import bson
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+import app.test.mongomock_compat  # noqa: E402,F401
+from app.database.archive import archive_boundary  # noqa: E402
+from app.database.mongo_engine import MongoEngine  # noqa: E402
+from app.database.mongodb import COLLECTION_RECORDS  # noqa: E402
+from app.database.storage import storage  # noqa: E402
+from benchmarks.datagen import (  # noqa: E402
+    add_database_arguments,
+    intern_email,
+    open_database,
+    seed,
+)
+
+
+async def hot_size(db, real: bool) -> dict:
+    if real:
+        stats = await db.command("collStats", COLLECTION_RECORDS)
+        return {
+            "records": stats["count"],
+            "data MB": stats["size"] / 2**20,
+            "storage MB": stats["storageSize"] / 2**20,
+            "index MB": stats["totalIndexSize"] / 2**20,
+        }
+    size = 0
+    async for record in db[COLLECTION_RECORDS].find():
+        size += len(bson.encode(record))
+    return {
+        "records": await db[COLLECTION_RECORDS].count_documents({}),
+        "data MB": size / 2**20,
+    }
+
+
+async def time_reads(interns: int, repeat: int, real: bool) -> dict:
+    today = date.today()
+    month_ago = (today - timedelta(days=30)).isoformat()
+    week_start = (today - timedelta(days=today.weekday())).isoformat()
+    year_ago = (today - timedelta(days=365)).isoformat()
+    yesterday = (today - timedelta(days=1)).isoformat()
+    reads = {
+        "intern, last 30 days": lambda n: storage.records.list_for_intern(
+            intern_email(n), date_from=month_ago
+        ),
+        "intern, last year": lambda n: storage.records.list_for_intern(
+            intern_email(n), date_from=year_ago
+        ),
+        "intern, 100 newest": lambda n: storage.records.list_for_intern(
+            intern_email(n), date_from=month_ago, limit=100
+        ),
+        "day lookup": lambda n: storage.records.find_for_day(
+            intern_email(n), yesterday
+        ),
+    }
+    if real:
+        # mongomock cannot run the date-filtered $lookup
+        reads["interns page, this week"] = lambda n: storage.users.list_with_records(
+            "Intern", date_from=week_start, limit=50, record_fields=["date", "status"]
+        )
+    timings = {}
+    for name, read in reads.items():
+        samples = []
+        for n in range(repeat):
+            started = time.perf_counter()
+            await read(n % interns)
+            samples.append(time.perf_counter() - started)
+        timings[name] = statistics.median(samples) * 1000
+    return timings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--interns", type=int, default=200)
+    parser.add_argument("--days", type=int, default=500, help="working days of history")
+    parser.add_argument(
+        "--keep-days", type=int, default=90, help="calendar days kept hot"
+    )
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument(
+        "--real", action="store_true", help="use MONGODB_URL instead of mongomock-motor"
+    )
+    add_database_arguments(parser, required=False)
+    args = parser.parse_args()
+    if args.real and not args.database:
+        parser.error("--real needs --database")
+
+    if args.real:
+        db = await open_database(args.database, args.drop)
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+
+        db = AsyncMongoMockClient()["benchmark"]
+    storage.use(MongoEngine(db))
+    seeded = await seed(db, args.interns, args.days)
+    print(f"seeded {seeded['records']} records for {args.interns} interns")
+
+    before_size = await hot_size(db, args.real)
+    before_reads = await time_reads(args.interns, args.repeat, args.real)
+
+    before = archive_boundary(date.today(), args.keep_days)
+    started = time.perf_counter()
+    moved = await storage.records.archive_before(
+        before, compressor="zstd" if args.real else None
+    )
+    print(
+        f"archived {sum(moved.values())} records before {before} into {len(moved)} "
+        f"monthly collections in {time.perf_counter() - started:.1f}s"
+    )
+
+    after_size = await hot_size(db, args.real)
+    after_reads = await time_reads(args.interns, args.repeat, args.real)
+
+    print(f"\n{'hot collection':<26}{'before':>10}{'after':>10}")
+    for key in before_size:
+        print(f"{key:<26}{before_size[key]:>10.1f}{after_size[key]:>10.1f}")
+    print(f"\n{'median ms':<26}{'before':>10}{'after':>10}")
+    for name in before_reads:
+        print(f"{name:<26}{before_reads[name]:>10.2f}{after_reads[name]:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,143 @@
+"""
+Load benchmark: blocking PyMongo handlers vs the Motor-backed async handlers.
+
+Runs both apps in-process through httpx's ASGI transport against --database
+NAME, a throwaway database at MONGODB_URL (never the app's DATABASE_NAME; it
+must be empty, or add --drop), and prints requests/sec and latency
+percentiles for the DTR read endpoints.
+
+    python -m benchmarks.async_vs_sync --database dtr_bench --requests 2000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+
+from app.auth.jwt_handler import create_access_token, get_current_user  # noqa: E402
+from app.database.mongo_engine import MongoEngine  # noqa: E402
+from app.database.mongodb import (  # noqa: E402
+    COLLECTION_RECORDS,
+    create_indexes,
+    get_sync_database,
+)
+from app.database.storage import storage  # noqa: E402
+from app.main import app as async_app  # noqa: E402
+from benchmarks.datagen import add_database_arguments, open_database  # noqa: E402
+
+INTERN_ID = "benchmark.intern@example.com"
+
+
+def build_sync_app(records_collection):
+    """The pre-Motor handlers: sync `def` routes calling blocking PyMongo"""
+    sync_app = FastAPI()
+
+    @sync_app.post("/api/dtr/check_clock_in&out")
+    def check_clock_in(intern_id: str = Depends(get_current_user)):
+        date = datetime.now().strftime("%Y-%m-%d")
+        record = records_collection.find_one({"intern_id": intern_id, "date": date})
+        if record:
+            record["_id"] = str(record["_id"])
+            return record
+        return {"message": "You can clock in."}
+
+    @sync_app.get("/api/dtr/record")
+    def get_dtr(intern_id: str = Depends(get_current_user)):
+        records = list(records_collection.find({"intern_id": intern_id}))
+        for record in records:
+            record["_id"] = str(record["_id"])
+        return records
+
+    return sync_app
+
+
+def seed(records_collection, days: int):
+    today = datetime.utcnow()
+    records_collection.insert_many(
+        [
+            {
+                "intern_id": INTERN_ID,
+                "date": (today - timedelta(days=offset)).strftime("%Y-%m-%d"),
+                "clock_in": today - timedelta(days=offset, hours=8),
+                "clock_out": today - timedelta(days=offset),
+                "total_work_hours": 8.0,
+                "status": "Completed",
+                "created_at": today,
+            }
+            for offset in range(days)
+        ]
+    )
+
+
+async def drive(app, method, path, headers, total, concurrency):
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                start = time.perf_counter()
+                response = await http.request(method, path, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": latencies[int(len(latencies) * 0.50)] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument(
+        "--days", type=int, default=30, help="records seeded for the intern"
+    )
+    add_database_arguments(parser)
+    args = parser.parse_args()
+
+    db = await open_database(args.database, args.drop)
+    storage.use(MongoEngine(db))
+    await create_indexes(db)
+    records_collection = get_sync_database(args.database)[COLLECTION_RECORDS]
+    seed(records_collection, args.days)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': INTERN_ID})}"}
+    endpoints = [("POST", "/api/dtr/check_clock_in&out"), ("GET", "/api/dtr/record")]
+
+    print(f"{'endpoint':<32}{'mode':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for method, path in endpoints:
+        for mode, app in (
+            ("sync", build_sync_app(records_collection)),
+            ("async", async_app),
+        ):
+            result = await drive(
+                app, method, path, headers, args.requests, args.concurrency
+            )
+            print(
+                f"{path:<32}{mode:<8}{result['rps']:>10.1f}"
+                f"{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""
+Shift-start burst: per-request clock-in writes vs write-behind batches.
+
+Fires --interns concurrent clock-ins (as the 08:00 rush does) twice, once
+with a start_day write per request and once through the clock-in
+WriteBatcher, and reports throughput and the time until each caller is acknowledged. Each round
+also repeats --duplicates clock-ins so the per-entry RecordExists path is
+exercised.
+
+Uses mongomock-motor by default, which has no network round trip, so it
+understates the gain; --real --database NAME --drop runs against that
+throwaway database at MONGODB_URL instead (it is dropped before each
+round, so never the app's DATABASE_NAME).
+
+    python -m benchmarks.clock_in_batching --interns 500 --batch-size 100
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+import app.test.mongomock_compat  # noqa: E402,F401
+from app.database.base import RecordExists  # noqa: E402
+from app.database.batching import WriteBatcher  # noqa: E402
+from app.database.mongo_engine import MongoEngine  # noqa: E402
+from app.database.mongodb import create_indexes  # noqa: E402
+from benchmarks.datagen import add_database_arguments, open_database  # noqa: E402
+
+DATE = "2025-01-06"
+
+
+async def burst(clock_in, interns: int, duplicates: int):
+    """Run every clock-in concurrently; returns the elapsed time, each
+    caller's time to acknowledgement and how many were rejected"""
+    entries = [f"intern{number:05d}@example.com" for number in range(interns)]
+    entries += entries[:duplicates]
+
+    # Everyone arrives at once, so latency counts from the start of the burst
+    started = time.perf_counter()
+
+    async def one(intern_id):
+        try:
+            await clock_in(intern_id, DATE, datetime.utcnow())
+            rejected = False
+        except RecordExists:
+            rejected = True
+        return time.perf_counter() - started, rejected
+
+    results = await asyncio.gather(*(one(intern_id) for intern_id in entries))
+    elapsed = time.perf_counter() - started
+    return (
+        elapsed,
+        [latency for latency, _ in results],
+        sum(rejected for _, rejected in results),
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--interns", type=int, default=500)
+    parser.add_argument("--duplicates", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--window", type=float, default=0.01, help="seconds")
+    parser.add_argument(
+        "--real", action="store_true", help="use MONGODB_URL instead of mongomock-motor"
+    )
+    add_database_arguments(parser, required=False)
+    args = parser.parse_args()
+    if args.real and not (args.database and args.drop):
+        parser.error("--real needs --database and --drop (each round drops it)")
+
+    if args.real:
+        db = await open_database(args.database, args.drop)
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+
+        db = AsyncMongoMockClient()["benchmark"]
+    engine = MongoEngine(db)
+    batcher = WriteBatcher(
+        "benchmark", engine.records.start_days, args.batch_size, args.window
+    )
+
+    print(
+        f"{args.interns} clock-ins + {args.duplicates} repeats, "
+        f"batches of {args.batch_size} / {args.window * 1000:.0f} ms"
+    )
+    print(f"{'mode':<12}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'rejected':>10}")
+    modes = (
+        ("per-request", engine.records.start_day),
+        ("batched", lambda *entry: batcher.submit(entry)),
+    )
+    for name, clock_in in modes:
+        await db.client.drop_database(db.name)
+        await create_indexes(db)
+        elapsed, latencies, rejected = await burst(
+            clock_in, args.interns, args.duplicates
+        )
+        latencies.sort()
+        print(
+            f"{name:<12}{len(latencies) / elapsed:>10.0f}"
+            f"{statistics.median(latencies) * 1000:>10.1f}"
+            f"{latencies[int(len(latencies) * 0.99) - 1] * 1000:>10.1f}{rejected:>10}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+"""
+Worker cold-start time: fresh interpreter -> app imported -> lifespan
+startup complete, measured in subprocesses so nothing is cached between
+runs. Run it on two revisions to compare.
+
+    python -m benchmarks.cold_start --runs 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+PROBE = """
+import asyncio, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def startup():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+ready = asyncio.run(startup())
+print(imported - started, ready - started)
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    imports, readies = [], []
+    for _ in range(args.runs):
+        try:
+            result = subprocess.run(
+                [sys.executable, "-c", PROBE],
+                cwd=BACKEND_DIR,
+                capture_output=True,
+                text=True,
+                timeout=args.timeout,
+            )
+        except subprocess.TimeoutExpired:
+            print(f"worker did not start within {args.timeout}s")
+            return
+        if result.returncode != 0:
+            print(result.stderr.strip().splitlines()[-1])
+            return
+        imported, ready = map(float, result.stdout.split())
+        imports.append(imported)
+        readies.append(ready)
+
+    print(f"runs={args.runs}")
+    print(
+        f"import          median {statistics.median(imports) * 1000:8.1f} ms  max {max(imports) * 1000:8.1f} ms"
+    )
+    print(
+        f"import+startup  median {statistics.median(readies) * 1000:8.1f} ms  max {max(readies) * 1000:8.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Bytes on the wire and latency of /api/interns with and without compression.
+
+Seeds --interns x --days of records (benchmarks/datagen.py) into
+mongomock-motor, then serves the app over a real local socket (uvicorn, in
+process) once per variant: uncompressed, gzip at each --gzip-levels and
+brotli at each --brotli-qualities (with COMPRESSION_ENABLED off, so only the
+variant's middleware compresses). For each it reports the downloaded bytes
+and the median request latency on loopback, plus that latency with the
+transfer over a --mbps link added, which is where the byte savings show.
+The list is served from the read cache after the first request, so the
+numbers are serialization, compression and transfer, not the query.
+
+    python -m benchmarks.compression --interns 500 --days 40
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+os.environ["COMPRESSION_ENABLED"] = "false"
+# Keep the joined list cached for the whole run
+os.environ["READ_CACHE_TTL"] = "3600"
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+import app.test.mongomock_compat  # noqa: E402,F401
+from app.compression import CompressionMiddleware  # noqa: E402
+from app.database.mongo_engine import MongoEngine  # noqa: E402
+from app.database.storage import storage  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.datagen import seed  # noqa: E402
+from benchmarks.workers import free_port  # noqa: E402
+
+URL = "/api/interns"
+
+
+async def measure(asgi_app, accept_encoding: str, requests: int) -> dict:
+    port = free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(
+            asgi_app, host="127.0.0.1", port=port, lifespan="off", log_level="warning"
+        )
+    )
+    serving = asyncio.ensure_future(server.serve())
+    try:
+        while not server.started:
+            await asyncio.sleep(0.01)
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", timeout=120
+        ) as http:
+            headers = {"Accept-Encoding": accept_encoding}
+            response = await http.get(URL, headers=headers)  # warm the read cache
+            latencies = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = await http.get(URL, headers=headers)
+                latencies.append(time.perf_counter() - started)
+        return {
+            "wire": response.num_bytes_downloaded,
+            "body": len(response.content),
+            "encoding": response.headers.get("content-encoding", "identity"),
+            "latency": statistics.median(latencies),
+        }
+    finally:
+        server.should_exit = True
+        await serving
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--interns", type=int, default=500)
+    parser.add_argument("--days", type=int, default=40)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--gzip-levels", type=int, nargs="*", default=[1, 6, 9])
+    parser.add_argument("--brotli-qualities", type=int, nargs="*", default=[1, 5, 9])
+    parser.add_argument(
+        "--mbps", type=float, default=50, help="link speed for the estimate"
+    )
+    args = parser.parse_args()
+
+    from mongomock_motor import AsyncMongoMockClient
+
+    db = AsyncMongoMockClient()["benchmark"]
+    storage.use(MongoEngine(db))
+    seeded = await seed(db, args.interns, args.days)
+    print(f"seeded {seeded['records']} records for {args.interns} interns; GET {URL}")
+
+    variants = [("identity", "identity", app)]
+    variants += [
+        (f"gzip {level}", "gzip", CompressionMiddleware(app, gzip_level=level))
+        for level in args.gzip_levels
+    ]
+    variants += [
+        (f"br {quality}", "br", CompressionMiddleware(app, brotli_quality=quality))
+        for quality in args.brotli_qualities
+    ]
+
+    print(
+        f"{'variant':<12}{'wire KB':>10}{'ratio':>8}{'loopback ms':>13}"
+        f"{f'@{args.mbps:g} Mbit/s ms':>18}"
+    )
+    baseline = None
+    for name, accept_encoding, asgi_app in variants:
+        result = await measure(asgi_app, accept_encoding, args.requests)
+        assert result["encoding"] == accept_encoding, result
+        baseline = baseline or result["wire"]
+        transfer = result["wire"] * 8 / (args.mbps * 1e6)
+        print(
+            f"{name:<12}{result['wire'] / 1024:>10.1f}{baseline / result['wire']:>8.1f}"
+            f"{result['latency'] * 1000:>13.1f}{(result['latency'] + transfer) * 1000:>18.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,226 @@
+"""
+Synthetic DTR data: N interns x M working days of daily_time_records.
+
+Deterministic for a given --seed, so two runs (or two revisions) load the
+same data. Interns clock in between 07:30 and 09:30 and work 6-10 hours;
+weekends are skipped and about 5% of working days are absences. Every
+intern's password is PASSWORD, hashed once at the app's bcrypt cost so
+login costs what it does in production. A few admins are added, and
+--pending interns still await approval.
+
+The records end the day before `end` (default today), so clock-ins made
+by a load test never collide with seeded ones. Rollups are rebuilt after
+seeding, as `python -m app.database.rollups` would.
+
+Importable by the other benchmarks (`seed`), or run on its own to fill a
+throwaway database at MONGODB_URL. The database must be named explicitly,
+can never be the app's DATABASE_NAME, and must be empty unless --drop is
+given:
+
+    python -m benchmarks.datagen --database dtr_bench --drop --interns 1000 --days 60
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.auth.hashing import hash_password  # noqa: E402
+from app.database import dynamodb, mongodb  # noqa: E402
+from app.database.mongo_engine import MongoEngine  # noqa: E402
+from app.database.mongodb import (  # noqa: E402
+    COLLECTION_RECORDS,
+    COLLECTION_USERS,
+    create_indexes,
+)
+from app.database.rollups import rebuild_rollups  # noqa: E402
+from app.database.storage import storage  # noqa: E402
+
+PASSWORD = "benchmark-password"
+ADMINS = 3
+
+
+def intern_email(number: int) -> str:
+    return f"intern{number:05d}@example.com"
+
+
+def working_days(days: int, end: date) -> list:
+    """The last `days` weekdays before `end`, oldest first"""
+    found, day = [], end
+    while len(found) < days:
+        day -= timedelta(days=1)
+        if day.weekday() < 5:
+            found.append(day)
+    return found[::-1]
+
+
+def generate_users(
+    interns: int, pending: int, password_hash: str, created_at: datetime
+):
+    users = [
+        {
+            "email": intern_email(number),
+            "name": f"Intern{number}",
+            "surname": "Synthetic",
+            "role": "Intern",
+            "password": password_hash,
+            "approval": "Pending" if number >= interns - pending else "Approved",
+            "created_at": created_at,
+        }
+        for number in range(interns)
+    ]
+    users += [
+        {
+            "email": f"admin{number}@example.com",
+            "name": f"Admin{number}",
+            "surname": "Synthetic",
+            "role": "Admin",
+            "password": password_hash,
+            "approval": "Approved",
+            "created_at": created_at,
+        }
+        for number in range(ADMINS)
+    ]
+    return users
+
+
+def generate_records(interns: int, days: list, rng: random.Random):
+    """Completed records for every intern and working day, minus absences"""
+    for number in range(interns):
+        intern_id = intern_email(number)
+        for day in days:
+            if rng.random() < 0.05:
+                continue
+            clock_in = datetime(day.year, day.month, day.day, 7, 30) + timedelta(
+                minutes=rng.randrange(120)
+            )
+            hours = round(rng.uniform(6, 10), 2)
+            yield {
+                "intern_id": intern_id,
+                "date": day.strftime("%Y-%m-%d"),
+                "clock_in": clock_in,
+                "clock_out": clock_in + timedelta(hours=hours),
+                "total_work_hours": hours,
+                "status": "Completed",
+                "created_at": clock_in,
+            }
+
+
+async def seed(
+    db,
+    interns: int,
+    days: int,
+    pending: int = 0,
+    random_seed: int = 42,
+    end: date = None,
+    password: str = PASSWORD,
+    batch_size: int = 10000,
+) -> dict:
+    """Fill an empty database; storage must already point at `db` for the
+    rollup rebuild. Returns counts for the report."""
+    rng = random.Random(random_seed)
+    days = working_days(days, end or date.today())
+
+    users = generate_users(
+        interns, pending, hash_password(password), datetime(2025, 1, 1)
+    )
+    await db[COLLECTION_USERS].insert_many(users)
+
+    records, batch = 0, []
+    for record in generate_records(interns, days, rng):
+        batch.append(record)
+        if len(batch) == batch_size:
+            await db[COLLECTION_RECORDS].insert_many(batch)
+            records, batch = records + len(batch), []
+    if batch:
+        await db[COLLECTION_RECORDS].insert_many(batch)
+        records += len(batch)
+    # Indexes are built once over the loaded data rather than per insert
+    await create_indexes(db)
+
+    rollups = await rebuild_rollups()
+    return {"users": len(users), "records": records, "rollups": rollups}
+
+
+def add_database_arguments(parser, required: bool = True):
+    """--database / --drop, for scripts that write to a real MongoDB"""
+    parser.add_argument(
+        "--database",
+        required=required,
+        help="throwaway database at MONGODB_URL (never the app's DATABASE_NAME)",
+    )
+    parser.add_argument("--drop", action="store_true", help="drop --database first")
+
+
+async def open_database(name: str, drop: bool):
+    """The named scratch database at MONGODB_URL, dropped first with `drop`.
+
+    Refuses the application's own database, and a non-empty one unless it
+    may be dropped, so a benchmark can never wipe or pollute real data.
+    """
+    if not name or name == mongodb.DATABASE_NAME:
+        raise SystemExit(
+            f"Refusing to use the application database {mongodb.DATABASE_NAME!r}; "
+            "pass a throwaway --database"
+        )
+    db = mongodb.get_client()[name]
+    if drop:
+        await db.client.drop_database(name)
+    elif await db.list_collection_names():
+        raise SystemExit(f"Database {name!r} is not empty; pass --drop to replace it")
+    return db
+
+
+def open_dynamodb_local(drop: bool):
+    """Fresh tables in DynamoDB Local (DYNAMODB_ENDPOINT_URL).
+
+    The table names are the production ones, so real AWS is refused; tables
+    left by an earlier run are deleted with `drop`, refused otherwise.
+    """
+    if not dynamodb.DYNAMODB_ENDPOINT_URL:
+        raise SystemExit(
+            "Refusing to write to AWS DynamoDB (the app's own tables); point "
+            "DYNAMODB_ENDPOINT_URL at DynamoDB Local"
+        )
+    resource = dynamodb.get_resource()
+    tables = {
+        dynamodb.DYNAMODB_TABLE_Main,
+        dynamodb.DYNAMODB_TABLE_Record,
+        dynamodb.DYNAMODB_TABLE_Rollup,
+        dynamodb.DYNAMODB_TABLE_Version,
+    }
+    existing = tables & set(resource.meta.client.list_tables()["TableNames"])
+    if existing and not drop:
+        raise SystemExit(
+            f"Tables {sorted(existing)} exist; pass --drop to replace them"
+        )
+    for name in existing:
+        resource.Table(name).delete()
+        resource.Table(name).wait_until_not_exists()
+    dynamodb.create_tables(resource)
+    return resource
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--interns", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--pending", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=42)
+    add_database_arguments(parser)
+    args = parser.parse_args()
+
+    db = await open_database(args.database, args.drop)
+    storage.use(MongoEngine(db))
+    started = time.perf_counter()
+    counts = await seed(db, args.interns, args.days, args.pending, args.seed)
+    print(f"seeded {counts} into {db.name} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,124 @@
+"""
+Live event fan-out: 1k dashboard streams connected to /api/interns/events.
+
+Opens the SSE endpoint as plain ASGI calls (one task per client, as a
+server would run them), publishes a burst of clock events and measures how
+long each event takes to reach every client, plus events dropped for
+clients whose queue overflowed. No database is needed.
+
+    python -m benchmarks.event_fanout --clients 1000 --events 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+from app.events import event_bus, events_dropped  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+class Client:
+    """One EventSource connection; records when each event id arrives"""
+
+    def __init__(self):
+        self.arrivals = {}
+        self.disconnected = asyncio.Event()
+        self.request_sent = False
+
+    async def receive(self):
+        if not self.request_sent:
+            self.request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] != "http.response.body":
+            return
+        now = time.perf_counter()
+        for frame in message.get("body", b"").split(b"\n\n"):
+            if frame.startswith(b"id: "):
+                self.arrivals[int(frame[4 : frame.index(b"\n")])] = now
+
+    async def run(self):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/api/interns/events",
+            "raw_path": b"/api/interns/events",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"accept", b"text/event-stream")],
+            "server": ("bench", 80),
+            "client": ("bench", 1234),
+        }
+        await app(scope, self.receive, self.send)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.01,
+        help="seconds between published events (0 = one burst)",
+    )
+    args = parser.parse_args()
+
+    clients = [Client() for _ in range(args.clients)]
+    tasks = [asyncio.create_task(client.run()) for client in clients]
+    while len(event_bus.subscriptions) < args.clients:
+        await asyncio.sleep(0.01)
+
+    published = {}
+    started = time.perf_counter()
+    for number in range(args.events):
+        event = event_bus.publish(
+            "clock_in",
+            {"intern_id": f"intern{number:04d}@example.com", "date": "2025-01-06"},
+        )
+        published[event["id"]] = time.perf_counter()
+        await asyncio.sleep(args.interval)
+
+    # Let every stream drain
+    deadline = time.perf_counter() + 30
+    while time.perf_counter() < deadline and any(
+        len(client.arrivals) < args.events for client in clients
+    ):
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+
+    for client in clients:
+        client.disconnected.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Time from publish until the last client had the event
+    fan_out = [
+        max(client.arrivals.get(event_id, float("nan")) for client in clients) - sent
+        for event_id, sent in published.items()
+    ]
+    delivered = sum(len(client.arrivals) for client in clients)
+    print(
+        f"{args.clients} clients, {args.events} events, interval {args.interval * 1000:.0f} ms"
+    )
+    print(f"delivered        {delivered} / {args.clients * args.events}")
+    print(f"dropped          {events_dropped.value():.0f}")
+    print(f"deliveries/s     {delivered / elapsed:.0f}")
+    print(f"fan-out p50 ms   {statistics.median(fan_out) * 1000:.1f}")
+    print(f"fan-out max ms   {max(fan_out) * 1000:.1f}")
+    print(f"subscribers left {len(event_bus.subscriptions)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
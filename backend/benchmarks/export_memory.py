@@ -0,0 +1,144 @@
+"""
+Memory benchmark for the streaming /api/dtr/export endpoint.
+
+Seeds increasing numbers of daily time records into --database NAME, a
+throwaway database at MONGODB_URL (never the app's DATABASE_NAME; it must be
+empty, or add --drop), then streams the export and,
+for comparison, loads the same rows into one list the way /api/interns
+does. Peak Python heap (tracemalloc) and process RSS are reported per run;
+the export column should stay flat as the row count grows.
+
+    python -m benchmarks.export_memory --database dtr_bench --rows 10000 50000 200000
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.database.mongo_engine import MongoEngine  # noqa: E402
+from app.database.mongodb import (  # noqa: E402
+    COLLECTION_RECORDS,
+    create_indexes,
+    get_sync_database,
+)
+from app.database.storage import storage  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.datagen import add_database_arguments, open_database  # noqa: E402
+
+INTERN_PREFIX = "export.benchmark."
+
+
+def seed(records_collection, rows: int):
+    records_collection.delete_many({})
+    start = datetime(2020, 1, 1)
+    batch = []
+    for index in range(rows):
+        clock_in = start + timedelta(days=index // 100, hours=8)
+        batch.append(
+            {
+                "intern_id": f"{INTERN_PREFIX}{index % 100}@example.com",
+                "date": clock_in.strftime("%Y-%m-%d"),
+                "clock_in": clock_in,
+                "clock_out": clock_in + timedelta(hours=8),
+                "total_work_hours": 8.0,
+                "status": "Completed",
+                "created_at": clock_in,
+            }
+        )
+        if len(batch) == 10000:
+            records_collection.insert_many(batch)
+            batch = []
+    if batch:
+        records_collection.insert_many(batch)
+
+
+async def stream_export(query_string: bytes) -> int:
+    """Run the endpoint as a plain ASGI call, discarding chunks as they arrive"""
+    received = 0
+    request_sent = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Like a real server, only report a disconnect once the client goes away
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal received
+        if message["type"] == "http.response.body":
+            received += len(message.get("body", b""))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/dtr/export",
+        "raw_path": b"/api/dtr/export",
+        "root_path": "",
+        "query_string": query_string,
+        "headers": [],
+        "server": ("bench", 80),
+        "client": ("bench", 1234),
+    }
+    await app(scope, receive, send)
+    return received
+
+
+async def load_all() -> int:
+    records = [record async for record in storage.records.iter_records()]
+    return len(records)
+
+
+async def measure(label, coroutine):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = await coroutine
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return label, result, peak / 2**20, max_rss_mb, elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000, 200000])
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    add_database_arguments(parser)
+    args = parser.parse_args()
+
+    db = await open_database(args.database, args.drop)
+    storage.use(MongoEngine(db))
+    await create_indexes(db)
+    records_collection = get_sync_database(args.database)[COLLECTION_RECORDS]
+
+    print(
+        f"{'rows':>8}  {'path':<12}{'peak heap MB':>14}{'max RSS MB':>12}{'seconds':>10}"
+    )
+    for rows in args.rows:
+        seed(records_collection, rows)
+        runs = [
+            await measure("export", stream_export(f"format={args.format}".encode())),
+            await measure("to_list", load_all()),
+        ]
+        for label, _, peak_mb, max_rss_mb, elapsed in runs:
+            print(
+                f"{rows:>8}  {label:<12}{peak_mb:>14.1f}{max_rss_mb:>12.1f}{elapsed:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
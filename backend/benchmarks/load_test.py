@@ -0,0 +1,312 @@
+"""
+Load test for every route in app/auth/routes.py, with a JSON report.
+
+Seeds --interns x --days of synthetic records (benchmarks/datagen.py), then
+drives the in-process app through httpx's ASGI transport, one route at a
+time in a realistic order (register, login, clock in, ..., logout), with
+--requests requests per route and --concurrency in flight. For each route
+the report has throughput, p50/p95/p99/max latency and status counts, plus
+the run's configuration and git revision, so runs can be diffed to catch
+regressions:
+
+    python -m benchmarks.load_test --output before.json
+    git checkout <change> && python -m benchmarks.load_test --output after.json
+
+Uses mongomock-motor by default; --real --database NAME runs against that
+throwaway database at MONGODB_URL instead (never the app's DATABASE_NAME;
+it must be empty, or add --drop).
+All requests come from one address, so the login/register rate limits are
+switched off. Login and register cost whatever BCRYPT_ROUNDS is set to
+(12 by default); set it lower to focus on everything else. 503s there mean
+the bcrypt pool's admission limit (HASH_MAX_PENDING) shed the excess.
+Keep --requests at or below --interns, or clock_in repeats for an intern
+and gets 400s.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+import httpx  # noqa: E402
+
+import app.test.mongomock_compat  # noqa: E402,F401
+from app.auth import hashing, rate_limit  # noqa: E402
+from app.auth.jwt_handler import create_access_token  # noqa: E402
+from app.database.mongo_engine import MongoEngine  # noqa: E402
+from app.database.storage import storage  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.datagen import (  # noqa: E402
+    PASSWORD,
+    add_database_arguments,
+    intern_email,
+    open_database,
+    seed,
+)
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    return ordered[max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))]
+
+
+class Scenario:
+    """The request each route gets for its n-th call. Interns are taken in
+    turn, so writes like clock_in never repeat for the same intern."""
+
+    def __init__(self, interns: int):
+        self.interns = interns
+        self.tokens = {}
+
+    def intern(self, n: int) -> str:
+        return intern_email(n % self.interns)
+
+    def auth(self, n: int) -> dict:
+        email = self.intern(n)
+        if email not in self.tokens:
+            self.tokens[email] = create_access_token({"sub": email})
+        return {"Authorization": f"Bearer {self.tokens[email]}"}
+
+    def routes(self) -> list:
+        """(route, method, request(n) -> (url, kwargs)) in the order they run"""
+        return [
+            (
+                "POST /api/register",
+                "POST",
+                lambda n: (
+                    "/api/register",
+                    {
+                        "json": {
+                            "email": f"loadtest{n:06d}@example.com",
+                            "name": "Load",
+                            "surname": "Test",
+                            "role": "Intern",
+                            "password": PASSWORD,
+                            "approval": "Pending",
+                        }
+                    },
+                ),
+            ),
+            (
+                "POST /api/login",
+                "POST",
+                lambda n: (
+                    "/api/login",
+                    {
+                        "json": {
+                            "email": self.intern(n),
+                            "password": PASSWORD,
+                        }
+                    },
+                ),
+            ),
+            (
+                "GET /api/user",
+                "GET",
+                lambda n: ("/api/user", {"headers": self.auth(n)}),
+            ),
+            (
+                "POST /api/dtr/check_clock_in&out",
+                "POST",
+                lambda n: ("/api/dtr/check_clock_in&out", {"headers": self.auth(n)}),
+            ),
+            (
+                "POST /api/dtr/clock_in",
+                "POST",
+                lambda n: ("/api/dtr/clock_in", {"headers": self.auth(n)}),
+            ),
+            (
+                "POST /api/dtr/clock_out",
+                "POST",
+                lambda n: ("/api/dtr/clock_out", {"headers": self.auth(n)}),
+            ),
+            (
+                "GET /api/dtr/summary",
+                "GET",
+                lambda n: ("/api/dtr/summary", {"headers": self.auth(n)}),
+            ),
+            (
+                "GET /api/dtr/record",
+                "GET",
+                lambda n: ("/api/dtr/record?limit=50", {"headers": self.auth(n)}),
+            ),
+            ("GET /api/interns", "GET", lambda n: ("/api/interns?limit=100", {})),
+            (
+                "GET /api/interns/active_today",
+                "GET",
+                lambda n: ("/api/interns/active_today", {}),
+            ),
+            (
+                "PATCH /api/interns/update_approval",
+                "PATCH",
+                lambda n: (
+                    "/api/interns/update_approval",
+                    {
+                        "json": {
+                            "intern_id": self.intern(n),
+                            "approval": "Approved",
+                        }
+                    },
+                ),
+            ),
+            (
+                "PATCH /api/interns/update_approval/bulk",
+                "PATCH",
+                lambda n: (
+                    "/api/interns/update_approval/bulk",
+                    {
+                        "json": {
+                            "updates": [
+                                {
+                                    "intern_id": self.intern(n * 50 + i),
+                                    "approval": "Approved",
+                                }
+                                for i in range(50)
+                            ]
+                        }
+                    },
+                ),
+            ),
+            (
+                "POST /api/logout",
+                "POST",
+                lambda n: (
+                    "/api/logout",
+                    {
+                        "headers": {
+                            "Authorization": f"Bearer {create_access_token({'sub': self.intern(n)})}",
+                        }
+                    },
+                ),
+            ),
+        ]
+
+
+async def drive(http, method: str, request, requests: int, concurrency: int) -> dict:
+    """Send `requests` requests with `concurrency` in flight; returns the route's stats"""
+    latencies, statuses = [], Counter()
+    numbers = iter(range(requests))
+
+    async def worker():
+        for n in numbers:
+            url, kwargs = request(n)
+            started = time.perf_counter()
+            response = await http.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": sum(count for status, count in statuses.items() if status >= 400),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(requests / elapsed, 1),
+        "latency_ms": {
+            name: round(percentile(latencies, fraction) * 1000, 3)
+            for name, fraction in (
+                ("p50", 0.5),
+                ("p95", 0.95),
+                ("p99", 0.99),
+                ("max", 1.0),
+            )
+        },
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--interns", type=int, default=200)
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200, help="per route")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--routes", nargs="*", help="only routes containing these strings"
+    )
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument(
+        "--real", action="store_true", help="use MONGODB_URL instead of mongomock-motor"
+    )
+    add_database_arguments(parser, required=False)
+    args = parser.parse_args()
+    if args.real and not args.database:
+        parser.error("--real needs --database")
+
+    if args.real:
+        db = await open_database(args.database, args.drop)
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+
+        db = AsyncMongoMockClient()["benchmark"]
+    storage.use(MongoEngine(db))
+    rate_limit.RATE_LIMIT_ENABLED = False
+
+    started = time.perf_counter()
+    seeded = await seed(db, args.interns, args.days, random_seed=args.seed)
+    seed_seconds = time.perf_counter() - started
+
+    report = {
+        "revision": git_revision(),
+        "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": platform.python_version(),
+        "config": {
+            **{key: value for key, value in vars(args).items() if key != "output"},
+            "storage": "mongodb" if args.real else "mongomock",
+            "bcrypt_rounds": hashing.BCRYPT_ROUNDS,
+            "hash_pool_size": hashing.HASH_POOL_SIZE,
+        },
+        "seeded": {**seeded, "seconds": round(seed_seconds, 2)},
+        "routes": {},
+    }
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://loadtest"
+    ) as http:
+        for route, method, request in Scenario(args.interns).routes():
+            if args.routes and not any(part in route for part in args.routes):
+                continue
+            report["routes"][route] = await drive(
+                http, method, request, args.requests, args.concurrency
+            )
+            print(
+                f"{route:<42}{report['routes'][route]['throughput_rps']:>10} req/s",
+                file=sys.stderr,
+            )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
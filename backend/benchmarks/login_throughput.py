@@ -0,0 +1,84 @@
+"""
+Login throughput versus bcrypt pool size.
+
+Fires a burst of concurrent password verifications through the bcrypt
+pool in app/auth/hashing.py for each pool size, and reports verified
+logins/sec, rejections (the requests that would get a 503) and how late a
+10 ms event-loop timer fires meanwhile, i.e. how much the burst delays
+every other request on the worker. No database is needed.
+
+    python -m benchmarks.login_throughput --logins 200 --pool-sizes 1 2 4 8
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.auth import hashing  # noqa: E402
+
+
+async def loop_lag(stop: asyncio.Event, interval: float = 0.01):
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def burst(logins: int, password_hash: str):
+    async def login():
+        try:
+            valid, _ = await hashing.verify_password_async("benchmark", password_hash)
+            return valid
+        except hashing.HashingPoolBusy:
+            return None
+
+    stop = asyncio.Event()
+    lag = asyncio.create_task(loop_lag(stop))
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return results, elapsed, await lag
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--kind", choices=["thread", "process"], default="thread")
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=None,
+        help="admission limit (default: admit the whole burst)",
+    )
+    args = parser.parse_args()
+
+    password_hash = hashing.hash_password("benchmark")
+    print(f"bcrypt rounds={hashing.BCRYPT_ROUNDS} kind={args.kind} burst={args.logins}")
+    print(f"{'pool':>5}{'logins/s':>12}{'rejected':>10}{'max loop lag ms':>18}")
+    for pool_size in args.pool_sizes:
+        hashing.configure_hash_pool(
+            pool_size=pool_size,
+            kind=args.kind,
+            max_pending=(
+                args.max_pending if args.max_pending is not None else args.logins
+            ),
+        )
+        results, elapsed, lag = await burst(args.logins, password_hash)
+        accepted = sum(1 for result in results if result)
+        rejected = sum(1 for result in results if result is None)
+        print(
+            f"{pool_size:>5}{accepted / elapsed:>12.1f}{rejected:>10}{lag * 1000:>18.1f}"
+        )
+    hashing.shutdown_hash_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,160 @@
+"""
+Field projections: what the list views fetch with and without them.
+
+Seeds interns with a few weeks of records each, then runs the storage calls
+behind /api/interns, /api/interns/active_today and /api/dtr/record twice:
+fetching whole documents (fields=None, the old behaviour) and with the
+per-view projections from app/auth/routes.py. For each it reports the BSON
+bytes returned (what crosses the wire) and the time the driver needs to
+decode them.
+
+Uses mongomock-motor by default; --real --database NAME runs against that
+throwaway database at MONGODB_URL instead (never the app's DATABASE_NAME;
+it must be empty, or add --drop).
+
+    python -m benchmarks.projections --interns 200 --days 30
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+import bson  # noqa: E402
+
+from app.auth.routes import (
+    INTERN_FIELDS,
+    INTERN_RECORD_FIELDS,
+    RECORD_FIELDS,
+)  # noqa: E402
+from app.database.mongo_engine import MongoEngine  # noqa: E402
+from app.database.mongodb import (  # noqa: E402
+    COLLECTION_RECORDS,
+    COLLECTION_USERS,
+    create_indexes,
+)
+from benchmarks.datagen import add_database_arguments, open_database  # noqa: E402
+
+START = datetime(2025, 1, 6, 8, 0)
+
+
+async def seed(db, interns: int, days: int):
+    users, records = [], []
+    for number in range(interns):
+        email = f"intern{number:04d}@example.com"
+        users.append(
+            {
+                "email": email,
+                "name": "Bench",
+                "surname": "Intern",
+                "role": "Intern",
+                # A real bcrypt hash is 60 characters
+                "password": "$2b$12$" + "x" * 53,
+                "approval": "Approved",
+                "created_at": START,
+            }
+        )
+        for day in range(days):
+            clock_in = START + timedelta(days=day)
+            last = day == days - 1
+            records.append(
+                {
+                    "intern_id": email,
+                    "date": clock_in.strftime("%Y-%m-%d"),
+                    "clock_in": clock_in,
+                    "created_at": clock_in,
+                    **(
+                        {"status": "Active"}
+                        if last
+                        else {
+                            "clock_out": clock_in + timedelta(hours=8),
+                            "total_work_hours": 8.0,
+                            "status": "Completed",
+                        }
+                    ),
+                }
+            )
+    await db[COLLECTION_USERS].insert_many(users)
+    await db[COLLECTION_RECORDS].insert_many(records)
+
+
+def measure(documents: list):
+    """BSON bytes of a result and the time to decode them again"""
+    encoded = [bson.encode(document) for document in documents]
+    started = time.perf_counter()
+    for payload in encoded:
+        bson.decode(payload)
+    return sum(map(len, encoded)), time.perf_counter() - started
+
+
+async def views(engine, projected: bool, last_date: str):
+    """The documents each view's storage calls return"""
+    pick = (lambda fields: fields) if projected else (lambda fields: None)
+    interns = await engine.users.list_with_records(
+        "Intern", fields=pick(INTERN_FIELDS), record_fields=pick(INTERN_RECORD_FIELDS)
+    )
+    active = await engine.records.list_active_for_day(
+        last_date, fields=pick(["intern_id", *INTERN_RECORD_FIELDS])
+    )
+    active_users = await engine.users.list_by_emails(
+        [record["intern_id"] for record in active],
+        role="Intern",
+        fields=pick(INTERN_FIELDS),
+    )
+    records = await engine.records.list_for_intern(
+        "intern0000@example.com", fields=pick(RECORD_FIELDS)
+    )
+    return {
+        "/api/interns": interns,
+        "/api/interns/active_today": active + active_users,
+        "/api/dtr/record": records,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--interns", type=int, default=200)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument(
+        "--real", action="store_true", help="use MONGODB_URL instead of mongomock-motor"
+    )
+    add_database_arguments(parser, required=False)
+    args = parser.parse_args()
+    if args.real and not args.database:
+        parser.error("--real needs --database")
+
+    if args.real:
+        db = await open_database(args.database, args.drop)
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+
+        db = AsyncMongoMockClient()["benchmark"]
+    await create_indexes(db)
+    await seed(db, args.interns, args.days)
+    engine = MongoEngine(db)
+    last_date = (START + timedelta(days=args.days - 1)).strftime("%Y-%m-%d")
+
+    full = await views(engine, False, last_date)
+    projected = await views(engine, True, last_date)
+
+    print(f"{args.interns} interns x {args.days} days")
+    print(
+        f"{'view':<28}{'full KB':>10}{'proj KB':>10}{'saved':>8}{'full ms':>10}{'proj ms':>10}"
+    )
+    for view in full:
+        full_bytes, full_decode = measure(full[view])
+        proj_bytes, proj_decode = measure(projected[view])
+        print(
+            f"{view:<28}{full_bytes / 1024:>10.1f}{proj_bytes / 1024:>10.1f}"
+            f"{1 - proj_bytes / full_bytes:>8.0%}"
+            f"{full_decode * 1000:>10.2f}{proj_decode * 1000:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
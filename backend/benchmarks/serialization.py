@@ -0,0 +1,121 @@
+"""
+Response serialization: the old hand-patched dicts vs typed models + orjson.
+
+Builds an /api/interns-shaped payload of 10k records (ObjectIds and
+datetimes, as they come out of Motor) and times turning it into response
+bytes three ways:
+
+- before: str() every _id in a loop, jsonable_encoder, stdlib JSONResponse
+  (what the handlers did before)
+- models: response_model validation + serialization, as FastAPI does it,
+  rendered by the app's orjson response class (what they do now)
+- orjson only: the raw documents through the shared BSON-aware encoder,
+  for reference (no validation)
+
+No database is needed.
+
+    python -m benchmarks.serialization --records 10000 --interns 100
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bson import ObjectId  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.models.user import InternWithRecords  # noqa: E402
+from app.serialization import ORJSONResponse, dumps  # noqa: E402
+
+interns_adapter = TypeAdapter(List[InternWithRecords])
+
+
+def build_payload(records: int, interns: int) -> list:
+    start = datetime(2025, 1, 6, 8, 0, 0, 123000)
+    payload = []
+    for number in range(interns):
+        email = f"intern{number:04d}@example.com"
+        payload.append(
+            {
+                "_id": ObjectId(),
+                "email": email,
+                "name": "Bench",
+                "surname": "Intern",
+                "role": "Intern",
+                "approval": "Approved",
+                "created_at": start,
+                "records": [
+                    {
+                        "_id": ObjectId(),
+                        "intern_id": email,
+                        "date": (start + timedelta(days=day)).strftime("%Y-%m-%d"),
+                        "clock_in": start + timedelta(days=day),
+                        "clock_out": start + timedelta(days=day, hours=8),
+                        "total_work_hours": 8.0,
+                        "status": "Completed",
+                        "created_at": start + timedelta(days=day),
+                    }
+                    for day in range(records // interns)
+                ],
+            }
+        )
+    return payload
+
+
+def before(payload: list) -> bytes:
+    for intern in payload:
+        intern["_id"] = str(intern["_id"])
+        for record in intern["records"]:
+            record["_id"] = str(record["_id"])
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def models(payload: list) -> bytes:
+    validated = interns_adapter.validate_python(payload)
+    content = interns_adapter.dump_python(
+        validated, mode="json", by_alias=True, exclude_unset=True
+    )
+    return ORJSONResponse(content).body
+
+
+def orjson_only(payload: list) -> bytes:
+    return dumps(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--interns", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{args.records} records across {args.interns} interns, best of {args.repeat}"
+    )
+    print(f"{'path':<14}{'ms':>10}{'speedup':>10}{'bytes':>12}")
+    baseline = None
+    for name, encode in (
+        ("before", before),
+        ("models", models),
+        ("orjson only", orjson_only),
+    ):
+        best = float("inf")
+        for _ in range(args.repeat):
+            # Fresh documents each time; `before` mutates them in place
+            payload = build_payload(args.records, args.interns)
+            started = time.perf_counter()
+            body = encode(payload)
+            best = min(best, time.perf_counter() - started)
+        baseline = baseline or best
+        print(f"{name:<14}{best * 1000:>10.1f}{baseline / best:>9.1f}x{len(body):>12}")
+
+
+if __name__ == "__main__":
+    main()
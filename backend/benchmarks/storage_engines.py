@@ -0,0 +1,185 @@
+"""
+Storage engine comparison: the same DTR operation mix on every engine.
+
+Each intern registers, clocks in and out for a number of days (rollups
+included), then the read paths run: today's record, the dashboard page of
+interns with their records, the hours summary and a full export. Prints the
+mean and p95 latency per operation and engine.
+
+By default MongoDB and DynamoDB run on their in-process stand-ins
+(mongomock-motor and moto), which shows how many round trips each engine
+needs but not real network latency. With --real they use real services
+instead: MongoDB through --database NAME, a throwaway database at
+MONGODB_URL (never the app's DATABASE_NAME; it must be empty, or add
+--drop), and DynamoDB only through DynamoDB Local (DYNAMODB_ENDPOINT_URL),
+since the tables carry the production names; existing ones need --drop.
+
+    python -m benchmarks.storage_engines --interns 50 --days 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.database.base import rollup_keys  # noqa: E402
+from app.database.dynamo_engine import DynamoEngine  # noqa: E402
+from app.database.dynamodb import AWS_REGION, create_tables  # noqa: E402
+from app.database.memory_engine import MemoryEngine  # noqa: E402
+from app.database.mongo_engine import MongoEngine  # noqa: E402
+from app.database.mongodb import create_indexes  # noqa: E402
+from benchmarks.datagen import (  # noqa: E402
+    add_database_arguments,
+    open_database,
+    open_dynamodb_local,
+)
+
+INTERN_PREFIX = "storage.benchmark."
+START = datetime(2025, 1, 6, 8, 0)
+
+
+async def open_engine(name: str, args, stack: ExitStack):
+    if name == "memory":
+        return MemoryEngine()
+    if name == "mongodb":
+        if args.real:
+            return MongoEngine(await open_database(args.database, args.drop))
+        from mongomock_motor import AsyncMongoMockClient
+
+        import app.test.mongomock_compat  # noqa: F401
+
+        return MongoEngine(AsyncMongoMockClient()["benchmark"])
+    if args.real:
+        return DynamoEngine(open_dynamodb_local(args.drop))
+
+    import boto3
+    from moto import mock_aws
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+    stack.enter_context(mock_aws())
+    resource = boto3.resource("dynamodb", region_name=AWS_REGION)
+    create_tables(resource)
+    return DynamoEngine(resource)
+
+
+async def timed(timings: dict, operation: str, call):
+    started = time.perf_counter()
+    result = await call
+    timings[operation].append(time.perf_counter() - started)
+    return result
+
+
+async def run(engine, interns: int, days: int) -> dict:
+    timings = defaultdict(list)
+    if isinstance(engine, MongoEngine):
+        await create_indexes(engine.database)
+
+    emails = [f"{INTERN_PREFIX}{number:04d}@example.com" for number in range(interns)]
+    for email in emails:
+        await timed(
+            timings,
+            "register",
+            engine.users.insert(
+                {
+                    "email": email,
+                    "name": "Bench",
+                    "surname": "Intern",
+                    "role": "Intern",
+                    "password": "hash",
+                    "approval": "Approved",
+                    "created_at": START,
+                }
+            ),
+        )
+
+    for day in range(days):
+        clock_in = START + timedelta(days=day)
+        date = clock_in.strftime("%Y-%m-%d")
+        for email in emails:
+            await timed(
+                timings, "clock_in", engine.records.start_day(email, date, clock_in)
+            )
+            record = await timed(
+                timings,
+                "clock_out",
+                engine.records.finish_day(email, date, clock_in + timedelta(hours=8)),
+            )
+            await timed(
+                timings,
+                "rollup",
+                engine.rollups.add_day(email, date, record["total_work_hours"]),
+            )
+
+    last_date = (START + timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    for email in emails:
+        await timed(timings, "today", engine.records.find_for_day(email, last_date))
+        await timed(
+            timings, "summary", engine.rollups.for_intern(email, rollup_keys(last_date))
+        )
+    after = None
+    while True:
+        page = await timed(
+            timings,
+            "interns_page",
+            engine.users.list_with_records("Intern", after=after, limit=20),
+        )
+        if len(page) < 20:
+            break
+        after = page[-1]["email"]
+
+    async def export():
+        return [record async for record in engine.records.iter_records()]
+
+    exported = await timed(timings, "export", export())
+    assert len(exported) >= interns * days
+    return timings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--interns", type=int, default=50)
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        default=["memory", "mongodb", "dynamodb"],
+        choices=["memory", "mongodb", "dynamodb"],
+    )
+    parser.add_argument(
+        "--real",
+        action="store_true",
+        help="use MongoDB/DynamoDB Local instead of stand-ins",
+    )
+    add_database_arguments(parser, required=False)
+    args = parser.parse_args()
+    if args.real and "mongodb" in args.engines and not args.database:
+        parser.error("--real needs --database for mongodb")
+
+    print(
+        f"{args.interns} interns x {args.days} days, {'real services' if args.real else 'stand-ins'}"
+    )
+    print(f"{'engine':<10}{'operation':<14}{'count':>7}{'mean ms':>10}{'p95 ms':>10}")
+    for name in args.engines:
+        with ExitStack() as stack:
+            engine = await open_engine(name, args, stack)
+            timings = await run(engine, args.interns, args.days)
+            await engine.close()
+        for operation, samples in timings.items():
+            samples.sort()
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            print(
+                f"{name:<10}{operation:<14}{len(samples):>7}"
+                f"{statistics.mean(samples) * 1000:>10.2f}{p95 * 1000:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,154 @@
+"""
+Single- vs multi-worker server throughput under a bcrypt-heavy mix.
+
+Starts `python -m app.server` for each --workers value (real sockets,
+uvloop/httptools when installed) on the in-memory storage engine, then for
+--seconds runs --hashers clients registering new users (one bcrypt hash
+each, at the production cost unless BCRYPT_ROUNDS is set) next to
+--readers clients hitting a cheap endpoint. Reports both request rates and
+the cheap endpoint's latency, i.e. how much the hashing stalls everyone
+else. Compare on a machine with several cores; with one core extra
+workers can only add overhead.
+
+    python -m benchmarks.workers --workers 1 4 --seconds 10
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "STORAGE_ENGINE": "memory",
+        "JWT_SECRET": os.environ.get("JWT_SECRET", "benchmark-secret"),
+        # Every request comes from this one address
+        "RATE_LIMIT_ENABLED": "false",
+        "ACCESS_LOG": "false",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "app.server"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(http: httpx.AsyncClient, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await http.get("/get_init")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def run_load(
+    http: httpx.AsyncClient, hashers: int, readers: int, seconds: float
+) -> dict:
+    deadline = time.monotonic() + seconds
+    registered, read_latencies, errors = [0], [], [0]
+
+    async def hasher(number: int):
+        sequence = 0
+        while time.monotonic() < deadline:
+            sequence += 1
+            response = await http.post(
+                "/api/register",
+                json={
+                    "email": f"worker{number}.{sequence}.{time.monotonic_ns()}@example.com",
+                    "name": "Bench",
+                    "surname": "Worker",
+                    "role": "Intern",
+                    "password": "benchmark-password",
+                    "approval": "Pending",
+                },
+            )
+            if response.status_code == 200:
+                registered[0] += 1
+            else:
+                errors[0] += 1
+
+    async def reader():
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            response = await http.get("/get_init")
+            read_latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors[0] += 1
+
+    await asyncio.gather(
+        *(hasher(number) for number in range(hashers)),
+        *(reader() for _ in range(readers)),
+    )
+    read_latencies.sort()
+    return {
+        "registers/s": registered[0] / seconds,
+        "reads/s": len(read_latencies) / seconds,
+        "read p50 ms": read_latencies[len(read_latencies) // 2] * 1000,
+        "read p99 ms": read_latencies[int(len(read_latencies) * 0.99)] * 1000,
+        "errors": errors[0],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1]
+    )
+    parser.add_argument("--hashers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    print(
+        f"{os.cpu_count()} CPUs, {args.hashers} registering + {args.readers} reading clients, "
+        f"{args.seconds:.0f} s each"
+    )
+    print(
+        f"{'workers':<9}{'registers/s':>12}{'reads/s':>10}{'read p50 ms':>13}"
+        f"{'read p99 ms':>13}{'errors':>8}"
+    )
+    for workers in dict.fromkeys(args.workers):
+        port = free_port()
+        server = start_server(workers, port)
+        limits = httpx.Limits(max_connections=args.hashers + args.readers)
+        try:
+            async with httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30
+            ) as http:
+                await wait_ready(http)
+                result = await run_load(http, args.hashers, args.readers, args.seconds)
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+        print(
+            f"{workers:<9}{result['registers/s']:>12.1f}{result['reads/s']:>10.0f}"
+            f"{result['read p50 ms']:>13.1f}{result['read p99 ms']:>13.1f}{result['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -11,6 +11,11 @@ import Link from "next/link"
 import { Input } from "@/components/ui/input"
 import router from "next/router"
 
+// Fallback refresh of the active list, for clock-ins the event stream misses
+const ACTIVE_REFRESH_MS = 2000
+// Refresh of the approved/pending lists, for signups and other admins' changes
+const INTERNS_REFRESH_MS = 5000
+
 export default function AdminDash() {
 interface User {
     name: string;
@@ -28,6 +33,32 @@ interface User {
     const [activeCnt, setActiveCnt] = useState<{ role: string; surname: string; name: string; intern_id: string; approval: string; records: { clock_in: string; clock_out: string; status: string; }[]; }[] | null>(null)
     const [user, setUser] = useState<User | null>(null)
 
+  // Splits /api/get_all into the approved and pending lists
+  const showInterns = (dtrInternRecord: {
+      role: string;
+      surname: string;
+      name: string;
+      intern_id: string;
+      approval: string;
+      records: { clock_in: string; clock_out: string; status: string; }[]; }[]) => {
+      setInternCnt(dtrInternRecord.filter((intern) => intern.approval === "Approved"));
+      setPendingCnt(dtrInternRecord.filter((intern) => intern.approval === "Pending"));
+  };
+
+  const refreshInterns = () => {
+      const token = localStorage.getItem("access_token");
+      return fetch("/api/get_all", {
+        method: "GET",
+        headers: { Authorization: `Bearer ${token}` },
+      }).then(async (res) => {
+        const data = await res.json();
+        if (!res.ok) throw new Error(data.message);
+        setDtrStatus(data);
+        showInterns(data);
+      })
+      .catch((err) => setError(err.message));
+  };
+
   useEffect(() => {
       const delay = 2000;
     
@@ -98,39 +129,7 @@ interface User {
             setUser(userData);
             setDtrStatus(dtrInternRecord);
             setActiveCnt(dtrActiveIntern)
-            const initialInternRecord: { 
-                role: string; 
-                surname: string; 
-                name: string; 
-                intern_id: string;
-                approval: string 
-                records: { clock_in: string; clock_out: string; status: string; }[]; }[] = []
-            dtrInternRecord.forEach((entry: { 
-                role: string; 
-                surname: string; 
-                name: string; 
-                intern_id: string; 
-                approval: string;
-                records: { clock_in: string; clock_out: string; status: string; }[]; }) => {
-                initialInternRecord.push({
-                    role: entry.role,
-                    surname: entry.surname,
-                    name: entry.name,
-                    intern_id: entry.intern_id,
-                    approval: entry.approval,
-                    records: entry.records,
-                });
-            });
-
-            const approvedInterns = initialInternRecord.filter(
-                (intern) => intern.approval === "Approved"
-              );
-            setInternCnt(approvedInterns)
-
-            const pendingInterns = initialInternRecord.filter(
-                (intern) => intern.approval === "Pending"
-              );
-            setPendingCnt(pendingInterns)
+            showInterns(dtrInternRecord);
         })  
         .catch((err) => setError(err.message));
     
@@ -144,7 +143,45 @@ interface User {
       }, delay);
     
       return () => clearTimeout(timer);
-    }, [dtrStatus]);
+    }, []);
+
+  useEffect(() => {
+      // Refresh the active list as soon as an intern clocks in or out
+      const events = new EventSource("/api/active_events");
+      const refreshActive = () => {
+        const token = localStorage.getItem("access_token");
+        fetch("/api/get_active", {
+          method: "GET",
+          headers: { Authorization: `Bearer ${token}` },
+        }).then(async (res) => {
+          const data = await res.json();
+          if (!res.ok) throw new Error(data.message);
+          setActiveCnt(data);
+        })
+        .catch((err) => setError(err.message));
+      };
+
+      events.addEventListener("clock_in", refreshActive);
+      events.addEventListener("clock_out", refreshActive);
+      // Sent when this client fell behind and missed events
+      events.addEventListener("resync", refreshActive);
+      // The event stream only carries clock-ins handled by the API worker it
+      // is connected to, so still poll for the others. The browser sends the
+      // ETag back, so an unchanged list costs a bodiless 304.
+      const poll = setInterval(refreshActive, ACTIVE_REFRESH_MS);
+
+      return () => {
+        clearInterval(poll);
+        events.close();
+      };
+    }, []);
+
+  useEffect(() => {
+      // Signups and approvals are not on the event stream. Revalidated with
+      // the ETag, so an unchanged list costs a bodiless 304.
+      const poll = setInterval(refreshInterns, INTERNS_REFRESH_MS);
+      return () => clearInterval(poll);
+    }, []);
 
   const filteredInterns = activeCnt?.filter(
     (intern) =>
@@ -164,7 +201,9 @@ interface User {
           throw new Error((await response.json()).detail || "Failed to update approval");
         }
     
-        return await response.json();
+        const result = await response.json();
+        await refreshInterns();
+        return result;
       } catch (error) {
         console.error("Error updating approval:", error);
         throw error;
@@ -183,7 +222,9 @@ interface User {
           throw new Error((await response.json()).detail || "Failed to update approval");
         }
     
-        return await response.json();
+        const result = await response.json();
+        await refreshInterns();
+        return result;
       } catch (error) {
         console.error("Error updating approval:", error);
         throw error;
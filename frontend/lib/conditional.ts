@@ -0,0 +1,28 @@
+import type { NextApiRequest, NextApiResponse } from "next";
+
+// Validators relayed between the browser and the backend, so an unchanged
+// dashboard read is answered 304 end to end instead of being re-sent
+const RELAYED_HEADERS = ["ETag", "Cache-Control", "X-Next-Cursor"];
+
+export function conditionalHeaders(req: NextApiRequest): Record<string, string> {
+  const ifNoneMatch = req.headers["if-none-match"];
+  return ifNoneMatch ? { "If-None-Match": ifNoneMatch } : {};
+}
+
+// Relays the backend's validators, then a 304 as is or a 200's JSON body
+// untouched (not parsed and re-serialized). Returns false for other statuses.
+export async function relayCached(response: Response, res: NextApiResponse): Promise<boolean> {
+  if (response.status !== 200 && response.status !== 304) return false;
+
+  for (const name of RELAYED_HEADERS) {
+    const value = response.headers.get(name);
+    if (value) res.setHeader(name, value);
+  }
+  if (response.status === 304) {
+    res.status(304).end();
+    return true;
+  }
+  res.setHeader("Content-Type", "application/json");
+  res.status(200).end(await response.text());
+  return true;
+}
@@ -0,0 +1,16 @@
+import type { NextApiRequest } from "next";
+
+// The backend rate-limits /login and /register per client address. Behind
+// this proxy its socket peer is always the Next.js server, so pass the
+// browser's address on the way proxies do: append it to X-Forwarded-For.
+// PROXY_SECRET (server-side only) tells the backend this chain came through
+// here, where the API is also reachable without this proxy.
+export function forwardedFor(req: NextApiRequest): Record<string, string> {
+  const incoming = req.headers["x-forwarded-for"];
+  const chain = [...(Array.isArray(incoming) ? incoming : incoming ? [incoming] : [])];
+  if (req.socket.remoteAddress) chain.push(req.socket.remoteAddress);
+  const headers: Record<string, string> = {};
+  if (chain.length) headers["X-Forwarded-For"] = chain.join(", ");
+  if (process.env.PROXY_SECRET) headers["X-Proxy-Secret"] = process.env.PROXY_SECRET;
+  return headers;
+}
@@ -0,0 +1,52 @@
+import { NextApiRequest, NextApiResponse } from "next";
+
+const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL;
+
+// Streams the backend's clock-in/out events through to the browser's EventSource
+export default async function handler(req: NextApiRequest, res: NextApiResponse) {
+  if (req.method !== "GET") {
+    return res.status(405).json({ message: "Method not allowed" });
+  }
+
+  const controller = new AbortController();
+  req.on("close", () => controller.abort());
+
+  try {
+    const response = await fetch(`${API_BASE_URL}/api/interns/events`, {
+      method: "GET",
+      headers: { Accept: "text/event-stream" },
+      signal: controller.signal,
+    });
+
+    if (!response.ok || !response.body) {
+      return res.status(response.status).json({ message: "Event stream unavailable" });
+    }
+
+    res.writeHead(200, {
+      "Content-Type": "text/event-stream",
+      "Cache-Control": "no-cache",
+      Connection: "keep-alive",
+      "X-Accel-Buffering": "no",
+    });
+
+    const reader = response.body.getReader();
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      res.write(value);
+    }
+    res.end();
+  } catch (error) {
+    if (controller.signal.aborted) {
+      return res.end();
+    }
+    if (!res.headersSent) {
+      return res.status(500).json({ message: "Internal server error" });
+    }
+    res.end();
+  }
+}
+
+export const config = {
+  api: { responseLimit: false },
+};
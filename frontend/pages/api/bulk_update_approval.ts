@@ -0,0 +1,33 @@
+import { NextApiRequest, NextApiResponse } from "next";
+
+const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL;
+
+export default async function handler(req: NextApiRequest, res: NextApiResponse) {
+  if (req.method !== "PATCH") {
+    return res.status(405).json({ message: "Method not allowed" });
+  }
+
+  const { updates } = req.body;
+
+  if (!Array.isArray(updates) || updates.length === 0) {
+    return res.status(400).json({ message: "A non-empty list of approval updates is required" });
+  }
+
+  try {
+    const response = await fetch(`${API_BASE_URL}/api/interns/update_approval/bulk`, {
+      method: "PATCH",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ updates }),
+    });
+
+    const result = await response.json();
+
+    if (!response.ok) {
+      return res.status(response.status).json({ message: result.detail || "Failed to update approvals" });
+    }
+
+    res.status(200).json(result);
+  } catch (error) {
+    res.status(500).json({ message: "Internal server error" });
+  }
+}
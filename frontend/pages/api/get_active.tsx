@@ -1,4 +1,5 @@
 import { NextApiRequest, NextApiResponse } from "next";
+import { conditionalHeaders, relayCached } from "@/lib/conditional";
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL;
 
@@ -10,15 +11,12 @@ export default async function handler(req: NextApiRequest, res: NextApiResponse)
   try {
     const response = await fetch(`${API_BASE_URL}/api/interns/active_today`, {
       method: "GET",
-      headers: { "Content-Type": "application/json" },
+      headers: { "Content-Type": "application/json", ...conditionalHeaders(req) },
     });
+    if (await relayCached(response, res)) return;
 
     const result = await response.json();
-    
-    if (!response.ok) {
-      return res.status(response.status).json({ message: result.detail || "Login failed" });
-    }
-    res.status(200).json(result);
+    return res.status(response.status).json({ message: result.detail || "Login failed" });
   } catch (error) {
     res.status(500).json({ message: "Internal server error" });
   }
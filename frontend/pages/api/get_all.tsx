@@ -1,6 +1,8 @@
 import { NextApiRequest, NextApiResponse } from "next";
+import { conditionalHeaders, relayCached } from "@/lib/conditional";
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL;
+const PAGE_PARAMS = ["limit", "after", "from", "to"];
 
 export default async function handler(req: NextApiRequest, res: NextApiResponse) {
   if (req.method !== "GET") {
@@ -8,17 +10,21 @@ export default async function handler(req: NextApiRequest, res: NextApiResponse)
   }
 
   try {
-    const response = await fetch(`${API_BASE_URL}/api/interns`, {
+    const params = new URLSearchParams();
+    for (const key of PAGE_PARAMS) {
+      const value = req.query[key];
+      if (typeof value === "string") params.set(key, value);
+    }
+    const query = params.toString();
+
+    const response = await fetch(`${API_BASE_URL}/api/interns${query ? `?${query}` : ""}`, {
       method: "GET",
-      headers: { "Content-Type": "application/json" },
+      headers: { "Content-Type": "application/json", ...conditionalHeaders(req) },
     });
+    if (await relayCached(response, res)) return;
 
     const result = await response.json();
-    
-    if (!response.ok) {
-      return res.status(response.status).json({ message: result.detail || "Login failed" });
-    }
-    res.status(200).json(result);
+    return res.status(response.status).json({ message: result.detail || "Login failed" });
   } catch (error) {
     res.status(500).json({ message: "Internal server error" });
   }
@@ -1,6 +1,8 @@
 import { NextApiRequest, NextApiResponse } from "next";
+import { conditionalHeaders, relayCached } from "@/lib/conditional";
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL;
+const PAGE_PARAMS = ["limit", "after", "from", "to"];
 
 export default async function handler(req: NextApiRequest, res: NextApiResponse) {
   const authHeader = req.headers.authorization;
@@ -10,23 +12,21 @@ export default async function handler(req: NextApiRequest, res: NextApiResponse)
   }
 
   try {
-    const response = await fetch(`${API_BASE_URL}/api/dtr/record`, {
+    const params = new URLSearchParams();
+    for (const key of PAGE_PARAMS) {
+      const value = req.query[key];
+      if (typeof value === "string") params.set(key, value);
+    }
+    const query = params.toString();
+
+    const response = await fetch(`${API_BASE_URL}/api/dtr/record${query ? `?${query}` : ""}`, {
       method: "GET",
-      headers: { Authorization: authHeader },
+      headers: { Authorization: authHeader, ...conditionalHeaders(req) },
     });
-    if (!response.ok) {
-      const errorData = await response.json();
-      return res.status(response.status).json({ message: errorData.detail || "Failed to fetch user data" });
-    }
+    if (await relayCached(response, res)) return;
 
-    const records = await response.text();
-    try {
-        const jsonData = JSON.parse(records);
-        return res.status(response.status).json(jsonData);
-      } catch (error) {
-        console.error("Error parsing JSON:", error);
-        return res.status(500).json({ message: "Invalid JSON response from API" });
-      }
+    const errorData = await response.json();
+    return res.status(response.status).json({ message: errorData.detail || "Failed to fetch user data" });
   } catch (error) {
     res.status(500).json({ message: "Internal server error" });
   }
@@ -1,4 +1,5 @@
 import { NextApiRequest, NextApiResponse } from "next";
+import { forwardedFor } from "@/lib/forwarded";
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL;
 
@@ -15,7 +16,7 @@ export default async function handler(req: NextApiRequest, res: NextApiResponse)
   try {
     const response = await fetch(`${API_BASE_URL}/api/login`, {
       method: "POST",
-      headers: { "Content-Type": "application/json" },
+      headers: { "Content-Type": "application/json", ...forwardedFor(req) },
       body: JSON.stringify(requestBody),
     });
 
@@ -15,6 +15,8 @@ module "Table" {
   project_name = var.project_name
   table_name1  = var.table_name1
   table_name2  = var.table_name2
+  table_name3  = var.table_name3
+  table_name4  = var.table_name4
 }
 
 module "ECS" {
@@ -30,11 +32,14 @@ module "ECS" {
   AWS_ACCESS_KEY_ID     = var.AWS_ACCESS_KEY_ID
   AWS_SECRET_ACCESS_KEY = var.AWS_SECRET_ACCESS_KEY
   JWT_SECRET            = var.JWT_SECRET
+  PROXY_SECRET          = var.PROXY_SECRET
   alb_dns_name          = module.ALB.alb_dns_name
 
   dynamodb_table_arns = [
     module.Table.table_name1_arn,
-    module.Table.table_name2_arn
+    module.Table.table_name2_arn,
+    module.Table.table_name3_arn,
+    module.Table.table_name4_arn
   ]
 
   alb_sg_id        = module.ALB.alb_sg_id
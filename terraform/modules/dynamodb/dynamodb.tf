@@ -7,8 +7,21 @@ resource "aws_dynamodb_table" "interns" {
     type = "S"
   }
 
+  attribute {
+    name = "role"
+    type = "S"
+  }
+
   hash_key = "intern_id"
 
+  # Lists interns by role without a Scan
+  global_secondary_index {
+    name            = "role-index"
+    hash_key        = "role"
+    range_key       = "intern_id"
+    projection_type = "ALL"
+  }
+
   tags = {
     Name        = "${var.project_name}-interns"
   }
@@ -28,10 +41,63 @@ resource "aws_dynamodb_table" "daily_time_records" {
     type = "S"
   }
 
+  attribute {
+    name = "status"
+    type = "S"
+  }
+
   hash_key  = "intern_id"
   range_key = "date"
 
+  # Active records for a given day
+  global_secondary_index {
+    name            = "date-status-index"
+    hash_key        = "date"
+    range_key       = "status"
+    projection_type = "ALL"
+  }
+
   tags = {
     Name        = "${var.project_name}-daily_time_records"
   }
+}
+
+# Per-intern hour totals, bucket = "<period>#<key>" (e.g. "week#2025-W10")
+resource "aws_dynamodb_table" "dtr_rollups" {
+  name         = var.table_name3
+  billing_mode = "PAY_PER_REQUEST"
+
+  attribute {
+    name = "intern_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "bucket"
+    type = "S"
+  }
+
+  hash_key  = "intern_id"
+  range_key = "bucket"
+
+  tags = {
+    Name        = "${var.project_name}-dtr_rollups"
+  }
+}
+
+# Change counters behind the API's ETags, one item per version_key
+resource "aws_dynamodb_table" "dtr_versions" {
+  name         = var.table_name4
+  billing_mode = "PAY_PER_REQUEST"
+
+  attribute {
+    name = "version_key"
+    type = "S"
+  }
+
+  hash_key = "version_key"
+
+  tags = {
+    Name        = "${var.project_name}-dtr_versions"
+  }
 }
\ No newline at end of file
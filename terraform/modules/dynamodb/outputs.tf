@@ -6,4 +6,14 @@ output "table_name1_arn" {
 output "table_name2_arn" {
   description = "Name of the second DynamoDB table"
   value       = aws_dynamodb_table.daily_time_records.arn
+}
+
+output "table_name3_arn" {
+  description = "Name of the rollups DynamoDB table"
+  value       = aws_dynamodb_table.dtr_rollups.arn
+}
+
+output "table_name4_arn" {
+  description = "Name of the versions DynamoDB table"
+  value       = aws_dynamodb_table.dtr_versions.arn
 }
\ No newline at end of file
@@ -7,4 +7,10 @@ variable "table_name1" {
 }
 variable "table_name2" {
   type        = string
+}
+variable "table_name3" {
+  type        = string
+}
+variable "table_name4" {
+  type        = string
 }
\ No newline at end of file
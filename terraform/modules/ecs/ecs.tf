@@ -52,10 +52,18 @@ resource "aws_iam_policy" "dynamodb_access" {
         "dynamodb:GetItem",
         "dynamodb:PutItem",
         "dynamodb:UpdateItem",
+        "dynamodb:DeleteItem",
+        "dynamodb:BatchGetItem",
+        "dynamodb:BatchWriteItem",
+        "dynamodb:TransactWriteItems",
+        "dynamodb:ConditionCheckItem",
         "dynamodb:Query",
         "dynamodb:Scan"
       ],
-      Resource = var.dynamodb_table_arns
+      Resource = concat(
+        var.dynamodb_table_arns,
+        [for arn in var.dynamodb_table_arns : "${arn}/index/*"]
+      )
     }]
   })
 }
@@ -108,6 +116,26 @@ resource "aws_ecs_task_definition" "fastapi" {
           name  = "AWS_REGION"
           value = var.aws_region
         },
+        {
+          name  = "STORAGE_ENGINE"
+          value = "dynamodb"
+        },
+        {
+          # Logins reach the API browser -> ALB -> Next.js -> ALB, and each
+          # appends its peer to X-Forwarded-For: the browser is 3 from the end
+          name  = "TRUSTED_PROXY_HOPS"
+          value = "3"
+        },
+        {
+          # ...but only on requests carrying the Next.js secret; /fastapi/*
+          # is public, and there the ALB's own entry is the caller
+          name  = "PROXY_SECRET"
+          value = var.PROXY_SECRET
+        },
+        {
+          name  = "DIRECT_PROXY_HOPS"
+          value = "1"
+        },
       ]
     }
   ])
@@ -143,6 +171,10 @@ resource "aws_ecs_task_definition" "nextjs" {
         {
           name  = "NEXT_PUBLIC_API_BASE_URL"
           value = "http://${var.alb_dns_name}/fastapi"
+        },
+        {
+          name  = "PROXY_SECRET"
+          value = var.PROXY_SECRET
         }
       ]
     }
@@ -36,6 +36,11 @@ variable "JWT_SECRET" {
   type = string
 }
 
+variable "PROXY_SECRET" {
+  description = "Shared by Next.js and FastAPI to vouch for X-Forwarded-For"
+  type        = string
+}
+
 variable "AWS_ACCESS_KEY_ID" {
   type = string
 }
@@ -20,6 +20,14 @@ output "table_name2_arn" {
   value = module.Table.table_name2_arn
 }
 
+output "table_name3_arn" {
+  value = module.Table.table_name3_arn
+}
+
+output "table_name4_arn" {
+  value = module.Table.table_name4_arn
+}
+
 output "alb_dns_name" {
   value = module.ALB.alb_dns_name
 }
\ No newline at end of file
@@ -31,6 +31,12 @@ variable "table_name1" {
 variable "table_name2" {
   type = string
 }
+variable "table_name3" {
+  type = string
+}
+variable "table_name4" {
+  type = string
+}
 variable "fastapi_image_url" {}
 variable "nextjs_image_url" {}
 
@@ -38,6 +44,10 @@ variable "JWT_SECRET" {
   type = string
 }
 
+variable "PROXY_SECRET" {
+  type = string
+}
+
 variable "AWS_ACCESS_KEY_ID" {
   type = string
 }